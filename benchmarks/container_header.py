@@ -0,0 +1,47 @@
+"""
+Compare reading video duration from the container header with mediainfo/ffprobe
+
+Usage: python3 benchmarks/container_header.py VIDEO_FILE [VIDEO_FILE ...]
+"""
+
+import json
+import sys
+import time
+
+from upsies import errors
+from upsies.utils import container, subproc, video
+
+
+def container_header(path):
+    return container.duration(path)
+
+def mediainfo(path):
+    output = subproc.run((video._mediainfo_executable, '--Output=JSON', path))
+    return json.loads(output)['media']['track'][0]['Duration']
+
+def ffprobe(path):
+    return subproc.run(
+        (video._ffprobe_executable, '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', path),
+        ignore_errors=True,
+    ).strip()
+
+def measure(func, paths, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [func(path) for path in paths]
+    return (time.perf_counter() - start) / rounds, results
+
+
+if __name__ == '__main__':
+    paths = sys.argv[1:]
+    if not paths:
+        sys.exit(__doc__.strip())
+
+    for func, rounds in ((container_header, 100), (mediainfo, 3), (ffprobe, 3)):
+        try:
+            seconds, results = measure(func, paths, rounds)
+        except (errors.DependencyError, errors.ContentError) as e:
+            print(f'{func.__name__:>16}: {e}')
+        else:
+            print(f'{func.__name__:>16}: {seconds * 1000 / len(paths):9.3f} ms per file: {results}')
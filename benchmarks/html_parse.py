@@ -0,0 +1,56 @@
+"""
+Compare HTML parsers and restricted parsing on saved IMDb and TMDb pages
+
+Usage: python3 benchmarks/html_parse.py [ROUNDS]
+
+Pages are read from tests/data/webdbs. Each page is parsed ROUNDS times
+(default: 5) with every installed parser, once completely and once only
+building the tree for <a> tags.
+"""
+
+import glob
+import importlib.util
+import os
+import sys
+import time
+
+from upsies.utils import html
+
+data_dir = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'data', 'webdbs')
+parsers = [
+    parser
+    for parser, module in (('html.parser', 'html'), ('lxml', 'lxml'), ('html5lib', 'html5lib'))
+    if importlib.util.find_spec(module) is not None
+]
+
+
+def read_pages():
+    pages = []
+    for pattern in ('*imdb.com_title_*', '*imdb.com_search_*', '*themoviedb.org_*'):
+        for filepath in sorted(glob.glob(os.path.join(data_dir, pattern))):
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+    return pages
+
+
+def measure(name, pages, rounds, **kwargs):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            html.parse(page, **kwargs)
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f'{name:>24}: {elapsed:6.2f} seconds ({elapsed / len(pages) * 1000:5.1f} ms per page)')
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    pages = read_pages()
+    size = sum(len(page) for page in pages)
+    print(f'{len(pages)} pages, {size / 1048576:.1f} MiB, default parser: {html.default_parser()}')
+    for parser in parsers:
+        measure(parser, pages, rounds, parser=parser)
+        measure(f'{parser} (only <a>)', pages, rounds, parser=parser, only='a')
+
+
+if __name__ == '__main__':
+    main()
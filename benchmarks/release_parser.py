@@ -0,0 +1,108 @@
+"""
+Compare the fast release name parser with guessit
+
+Every name in the corpus that is handled by the fast parser must produce the
+same ReleaseInfo as guessit.
+
+Usage: python3 benchmarks/release_parser.py [RELEASE_NAME_FILE]
+
+RELEASE_NAME_FILE contains one release name or path per line. By default, a
+generated corpus is used.
+"""
+
+import itertools
+import sys
+import time
+
+from upsies.utils import release
+
+titles = (
+    'The.Foo', 'Foo', 'The.Foo.and.the.Bar', 'Ghosts', 'Something.Completely.Different',
+    'Star.Trek.Picard', 'Dune', 'Shetland', 'Wolf.Like.Me', 'Xena', 'The.Collector', 'xXx',
+)
+anchors = (
+    '1985', '2010', '2021', 'S01', 'S02E03', 'S10E01E02', '2019.S03E04',
+)
+editions = ('', 'Extended', 'Uncut', 'Remastered', 'IMAX', 'PROPER', 'REPACK', 'Extended.REPACK')
+resolutions = ('', '2160p', '1080p', '1080i', '720p', '576p', '480p')
+sources = (
+    'BluRay', 'Blu-ray', 'BDRip', 'BluRay.REMUX', 'WEB-DL', 'WEBDL', 'WEBRip', 'AMZN.WEB-DL',
+    'NF.WEBRip', 'DSNP.WEB-DL', 'HMAX.WEB-DL', 'ATVP.WEB-DL', 'HULU.WEB-DL', 'PCOK.WEB-DL',
+    'PMTP.WEB-DL', 'HDTV', 'DVDRip',
+)
+hdrs = ('', 'HDR', 'HDR10', 'HDR10+', 'DV', 'DV.HDR')
+audios = (
+    '', 'DD5.1', 'DDP5.1', 'DDP2.0', 'DDP5.1.Atmos', 'AAC', 'AAC2.0', 'FLAC', 'FLAC2.0',
+    'DTS', 'DTS-HD.MA.5.1', 'DTS-HD.MA.7.1', 'TrueHD.7.1', 'TrueHD.7.1.Atmos',
+)
+videos = ('', 'x264', 'x265', 'H.264', 'H264', 'H.265')
+groups = ('ASDF', 'NTb', 'FLUX', 'd3g')
+extensions = ('', '.mkv')
+
+
+def generated_corpus():
+    for title, anchor, edition, resolution, source, hdr, audio, video, group, ext, _ in zip(
+        itertools.cycle(titles),
+        itertools.cycle(anchors),
+        itertools.cycle(editions),
+        itertools.cycle(resolutions),
+        itertools.cycle(sources),
+        itertools.cycle(hdrs),
+        itertools.cycle(audios),
+        itertools.cycle(videos),
+        itertools.cycle(groups),
+        itertools.cycle(extensions),
+        range(5000),
+    ):
+        parts = (title, anchor, edition, resolution, source, hdr, audio, video)
+        yield '.'.join(part for part in parts if part) + f'-{group}' + ext
+
+
+def parse(names, fast):
+    release._guess_cache.clear()
+    fast_guess = release._fast_guess
+    if not fast:
+        release._fast_guess = lambda path: None
+    try:
+        start = time.perf_counter()
+        results = []
+        for name in names:
+            info = release.ReleaseInfo(name)
+            try:
+                results.append((dict(info), info.parser))
+            except Exception as e:
+                results.append(({'exception': repr(e)}, 'error'))
+        return results, time.perf_counter() - start
+    finally:
+        release._fast_guess = fast_guess
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r') as f:
+            names = [line.strip() for line in f if line.strip()]
+    else:
+        names = list(generated_corpus())
+
+    # Warm up guessit
+    release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')['title']
+
+    guessit_results, guessit_time = parse(names, fast=False)
+    fast_results, fast_time = parse(names, fast=True)
+
+    fast_count = 0
+    mismatches = 0
+    for name, (guessit_info, _), (fast_info, parser) in zip(names, guessit_results, fast_results):
+        if parser == 'fast':
+            fast_count += 1
+            if fast_info != guessit_info:
+                mismatches += 1
+                print(f'MISMATCH: {name}')
+                for key in guessit_info:
+                    if guessit_info[key] != fast_info[key]:
+                        print(f'  {key}: guessit={guessit_info[key]!r} fast={fast_info[key]!r}')
+
+    print(f'{len(names)} names, {fast_count} parsed by fast path, {mismatches} mismatches')
+    print(f'guessit only: {guessit_time:.2f} seconds')
+    print(f'fast path:    {fast_time:.2f} seconds')
+    sys.exit(1 if mismatches else 0)
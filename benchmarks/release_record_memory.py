@@ -0,0 +1,70 @@
+"""
+Compare memory usage of ReleaseInfo, dictionaries and ReleaseRecord
+
+Usage: python3 benchmarks/release_record_memory.py [COUNT]
+
+COUNT release names (default: 20000) are generated from a few titles and
+parameters, which is typical for scene dumps and libraries.
+"""
+
+import gc
+import itertools
+import sys
+import time
+import tracemalloc
+
+from upsies.utils import release
+
+titles = ('The.Foo', 'Bar', 'Something.Completely.Different', 'Star.Trek.Picard', 'Dune')
+resolutions = ('2160p', '1080p', '720p')
+sources = ('BluRay', 'AMZN.WEB-DL', 'NF.WEBRip', 'HDTV')
+audios = ('DDP5.1', 'DTS-HD.MA.5.1', 'AAC2.0')
+videos = ('x264', 'H.265')
+groups = ('ASDF', 'NTb', 'FLUX', 'd3g')
+
+
+def generate_names(count):
+    combinations = itertools.cycle(itertools.product(titles, resolutions, sources, audios, videos, groups))
+    for i, (title, resolution, source, audio, video, group) in zip(range(count), combinations):
+        # Make every name unique
+        season, episode = divmod(i, 100)
+        yield f'{title}.S{season % 100:02d}E{episode:02d}.{resolution}.{source}.{audio}.{video}-{group}'
+
+
+def measure(name, create):
+    gc.collect()
+    tracemalloc.start()
+    start = time.monotonic()
+    objects = create()
+    elapsed = time.monotonic() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:>16}: {size / 1048576:7.2f} MiB ({size / len(objects):6.0f} bytes each), {elapsed:.2f} seconds')
+    return objects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    names = list(generate_names(count))
+
+    # Parse everything once so guessit and the parser cache don't distort the
+    # measurements
+    release._guess_cache = release.LRUCache(maxsize=count)
+    for name in names:
+        dict(release.ReleaseInfo(name))
+    print(f'{count} release names')
+
+    def release_info(name):
+        info = release.ReleaseInfo(name)
+        dict(info)
+        return info
+
+    measure('ReleaseInfo', lambda: [release_info(name) for name in names])
+    measure('dict', lambda: [dict(release.ReleaseInfo(name)) for name in names])
+    measure('ReleaseRecord', lambda: [release.ReleaseRecord.from_release_info(release.ReleaseInfo(name))
+                                      for name in names])
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,7 @@ import os
 
 import pytest
 
-from upsies.utils import http
+from upsies.utils import http, video, webdbs
 
 
 @pytest.fixture(scope='module')
@@ -17,6 +17,21 @@ def strict_filename_sanitization(module_mocker):
     module_mocker.patch('upsies.utils.fs.sanitize_filename', sanitize_filename)
 
 
+# Don't put cached video information in the user's cache directory.
+@pytest.fixture(autouse=True)
+def video_cache_directory(tmp_path_factory, mocker):
+    cache_directory = tmp_path_factory.mktemp('video_info')
+    mocker.patch.object(video, 'cache_directory', str(cache_directory))
+    return cache_directory
+
+
+# Don't let IDs learned by one test leak into other tests.
+@pytest.fixture(autouse=True)
+def webdb_idmap(mocker):
+    mocker.patch.object(webdbs.idmap, 'filepath', None)
+    mocker.patch.object(webdbs.idmap, '_ids', None)
+
+
 @pytest.fixture(scope='session')
 def data_dir():
     segments = __file__.split(os.sep)
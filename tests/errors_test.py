@@ -82,6 +82,18 @@ def test_SceneFileSizeError(mocker):
     assert e.existing_size == 124
 
 
+def test_SceneFileChecksumError(mocker):
+    e = errors.SceneFileChecksumError(
+        filename='foo',
+        original_checksum='DEADBEEF',
+        existing_checksum='C0FFEE00',
+    )
+    assert str(e) == 'foo should have CRC32 DEADBEEF, not C0FFEE00'
+    assert e.filename == 'foo'
+    assert e.original_checksum == 'DEADBEEF'
+    assert e.existing_checksum == 'C0FFEE00'
+
+
 def test_SceneMissingInfoError(mocker):
     e = errors.SceneMissingInfoError('foo.mkv')
     assert str(e) == 'Missing information: foo.mkv'
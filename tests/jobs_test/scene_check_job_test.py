@@ -9,9 +9,10 @@ from upsies.utils.types import SceneCheckResult
 
 @pytest.fixture
 def make_SceneCheckJob(tmp_path):
-    def make_SceneCheckJob(force=None, content_path=tmp_path, ignore_cache=False):
+    def make_SceneCheckJob(force=None, content_path=tmp_path, ignore_cache=False, deep=False):
         return SceneCheckJob(
             force=force,
+            deep=deep,
             home_directory=tmp_path,
             cache_directory=tmp_path,
             ignore_cache=ignore_cache,
@@ -34,6 +35,8 @@ def test_cache_id(make_SceneCheckJob):
         ({'force': 'false'}, {'_predetermined_result': True}),
         ({'force': False}, {'_predetermined_result': False}),
         ({'force': 0}, {'_predetermined_result': False}),
+        ({}, {'_deep': False}),
+        ({'deep': 1}, {'_deep': True}),
     ),
     ids=lambda v: str(v),
 )
@@ -285,6 +288,36 @@ async def test_verify_release(make_SceneCheckJob, mocker):
     ]
 
 
+@pytest.mark.asyncio
+async def test_verify_release_with_deep_verification(make_SceneCheckJob, mocker):
+    verify_release_mock = mocker.patch('upsies.utils.scene.verify_release', AsyncMock(
+        return_value=(SceneCheckResult.true, ()),
+    ))
+    mocker.patch('upsies.jobs.scene.SceneCheckJob._handle_scene_check_result')
+
+    job = make_SceneCheckJob(deep=True)
+    await job._verify_release('mock.release.name')
+
+    assert verify_release_mock.call_args_list == [
+        call(job._content_path, 'mock.release.name', deep=True, progress_callback=job._handle_checksum_progress),
+    ]
+    assert job._handle_scene_check_result.call_args_list == [
+        call(SceneCheckResult.true, ()),
+    ]
+
+
+def test_handle_checksum_progress(make_SceneCheckJob):
+    job = make_SceneCheckJob(deep=True)
+    cb = Mock()
+    job.signal.register('checksum_progress', cb)
+    job._handle_checksum_progress('a.mkv', 0, 300)
+    job._handle_checksum_progress('b.mkv', 50, 100)
+    job._handle_checksum_progress('a.mkv', 150, 300)
+    job._handle_checksum_progress('b.mkv', 100, 100)
+    job._handle_checksum_progress('a.mkv', 300, 300)
+    assert cb.call_args_list == [call(0.0), call(12.5), call(50.0), call(62.5), call(100.0)]
+
+
 def test_handle_scene_check_result_handles_SceneErrors(make_SceneCheckJob, mocker):
     mocker.patch('upsies.jobs.scene.SceneCheckJob.finalize')
     ask_is_scene_release = Mock()
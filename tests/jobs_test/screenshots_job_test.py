@@ -192,6 +192,7 @@ def test_screenshots_process_is_cancelled_after_first_screenshot(tmp_path, scree
             screenshot_file='path/to/destination/bar.mkv.0:10:00.png',
             timestamp='0:10:00',
             overwrite=False,
+            snap_to_keyframes='off',
         ),
         call.output_queue.put((MsgType.info, ('screenshot', screenshots_process_patches.screenshot.return_value))),
         call.shall_terminate(screenshots_process_patches.input_queue),
@@ -229,6 +230,7 @@ def test_screenshots_process_fails_to_create_second_screenshot(tmp_path, screens
             screenshot_file='path/to/destination/bar.mkv.0:10:00.png',
             timestamp='0:10:00',
             overwrite=False,
+            snap_to_keyframes='off',
         ),
         call.output_queue.put((MsgType.info, ('screenshot', 'path/to/destination/bar.mkv.0:10:00.png'))),
         call.shall_terminate(screenshots_process_patches.input_queue),
@@ -237,6 +239,7 @@ def test_screenshots_process_fails_to_create_second_screenshot(tmp_path, screens
             screenshot_file='path/to/destination/bar.mkv.0:20:00.png',
             timestamp='0:20:00',
             overwrite=False,
+            snap_to_keyframes='off',
         ),
         call.output_queue.put((MsgType.error, 'No space left')),
     ]
@@ -273,6 +276,7 @@ def test_screenshots_process_succeeds(tmp_path, screenshots_process_patches):
             screenshot_file='path/to/destination/bar.mkv.0:10:00.png',
             timestamp='0:10:00',
             overwrite=False,
+            snap_to_keyframes='off',
         ),
         call.output_queue.put((MsgType.info, ('screenshot', 'path/to/destination/one.png'))),
         call.shall_terminate(screenshots_process_patches.input_queue),
@@ -281,6 +285,7 @@ def test_screenshots_process_succeeds(tmp_path, screenshots_process_patches):
             screenshot_file='path/to/destination/bar.mkv.0:20:00.png',
             timestamp='0:20:00',
             overwrite=False,
+            snap_to_keyframes='off',
         ),
         call.output_queue.put((MsgType.info, ('screenshot', 'path/to/destination/two.png'))),
     ]
@@ -344,11 +349,12 @@ def test_ScreenshotsJob_initialize(DaemonProcess_mock, tmp_path):
         name=job.name,
         target=_screenshots_process,
         kwargs={
-            'content_path' : 'some/path',
-            'timestamps'   : (120,),
-            'count'        : 2,
-            'output_dir'   : job.home_directory,
-            'overwrite'    : job.ignore_cache,
+            'content_path'      : 'some/path',
+            'timestamps'        : (120,),
+            'count'             : 2,
+            'output_dir'        : job.home_directory,
+            'overwrite'         : job.ignore_cache,
+            'snap_to_keyframes' : 'off',
         },
         info_callback=job._handle_info,
         error_callback=job._handle_error,
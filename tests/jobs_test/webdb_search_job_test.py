@@ -131,6 +131,7 @@ async def test_WebDbSearchJob_initialize_creates_searcher(tmp_path, mocker, food
     assert job._searcher is Searcher_mock.return_value
     assert Searcher_mock.call_args_list == [call(
         search_coro=foodb.search,
+        refine_results=foodb.refine_search_results,
         results_callback=job._handle_search_results,
         error_callback=job.warn,
         exception_callback=job.exception,
@@ -274,6 +275,7 @@ def test_WebDbSearchJob_search_results(job):
     job.signal.register('search_results', cb)
     job._handle_search_results(results)
     assert job._info_updater.set_result.call_args_list == [call(results[0])]
+    assert job._info_updater.prefetch.call_args_list == [call(results)]
     assert cb.call_args_list == [call(results)]
 
 def test_WebDbSearchJob_no_search_results(job):
@@ -282,6 +284,7 @@ def test_WebDbSearchJob_no_search_results(job):
     job.signal.register('search_results', cb)
     job._handle_search_results(results)
     assert job._info_updater.set_result.call_args_list == [call(None)]
+    assert job._info_updater.prefetch.call_args_list == [call(results)]
     assert cb.call_args_list == [call(results)]
 
 
@@ -482,15 +485,18 @@ async def test_Searcher__search_reports_results(searcher, mocker):
     }
     mocks = Mock(**mock_methods)
     mocker.patch.multiple(searcher, **mock_methods)
-    await searcher._search('mock query')
+    query = Query('The Foo')
+    await searcher._search(query)
     assert mocks.mock_calls == [
         call._results_callback(()),
         call._searching_callback(True),
         call._delay(),
-        call._search_coro('mock query'),
+        call._search_coro(query),
         call._searching_callback(False),
         call._results_callback(('mock result 1', 'mock result 2')),
     ]
+    # Query was copied
+    assert mocks._search_coro.call_args_list[0][0][0] is not query
 
 @pytest.mark.asyncio
 async def test_Searcher__search_reports_error(searcher, mocker):
@@ -503,16 +509,92 @@ async def test_Searcher__search_reports_error(searcher, mocker):
     }
     mocks = Mock(**mock_methods)
     mocker.patch.multiple(searcher, **mock_methods)
-    await searcher._search('mock query')
+    query = Query('The Foo')
+    await searcher._search(query)
     assert mocks.mock_calls == [
         call._results_callback(()),
         call._searching_callback(True),
         call._delay(),
-        call._search_coro('mock query'),
+        call._search_coro(query),
         call._error_callback(errors.RequestError('internet is down')),
         call._searching_callback(False),
         call._results_callback(()),
     ]
+    assert searcher._cache == {}
+    assert list(searcher.latencies) == []
+
+@pytest.mark.asyncio
+async def test_Searcher__search_reports_cached_results(searcher, mocker):
+    mock_methods = {
+        '_results_callback': Mock(),
+        '_searching_callback': Mock(),
+        '_delay': AsyncMock(),
+        '_search_coro': AsyncMock(return_value=('mock result 1', 'mock result 2')),
+        '_error_callback': Mock(),
+    }
+    mocks = Mock(**mock_methods)
+    mocker.patch.multiple(searcher, **mock_methods)
+    await searcher._search(Query('The Foo', year=2010))
+    await searcher._search(Query('the  foo', year=2010))
+    assert mocks.mock_calls == [
+        call._results_callback(()),
+        call._searching_callback(True),
+        call._delay(),
+        call._search_coro(Query('The Foo', year=2010)),
+        call._searching_callback(False),
+        call._results_callback(('mock result 1', 'mock result 2')),
+        call._results_callback(()),
+        call._searching_callback(True),
+        call._searching_callback(False),
+        call._results_callback(('mock result 1', 'mock result 2')),
+    ]
+
+@pytest.mark.asyncio
+async def test_Searcher__search_reports_refined_results(searcher, mocker):
+    mock_methods = {
+        '_results_callback': Mock(),
+        '_searching_callback': Mock(),
+        '_delay': AsyncMock(),
+        '_search_coro': AsyncMock(return_value=('mock result 1', 'mock result 2')),
+        '_error_callback': Mock(),
+        '_refine_results': Mock(side_effect=(None, ('mock result 2',))),
+    }
+    mocks = Mock(**mock_methods)
+    mocker.patch.multiple(searcher, **mock_methods)
+    searcher._search_started = 0
+    await searcher._search(Query('The Foo'))
+    await searcher._search(Query('The Bar'))
+    await searcher._search(Query('The Foo', year=2010))
+    assert mocks._search_coro.call_args_list == [call(Query('The Foo')), call(Query('The Bar'))]
+    # Most recent query is tried first
+    assert mocks._refine_results.call_args_list == [
+        call(Query('The Bar'), Query('The Foo'), ('mock result 1', 'mock result 2')),
+        call(Query('The Foo', year=2010), Query('The Bar'), ('mock result 1', 'mock result 2')),
+    ]
+    assert mocks._results_callback.call_args_list[-1] == call(('mock result 2',))
+    assert [source for _, _, source in searcher.latencies] == ['request', 'request', 'refined']
+
+@pytest.mark.asyncio
+async def test_Searcher__search_limits_number_of_cached_queries(searcher, mocker):
+    mocker.patch.object(searcher, '_delay', AsyncMock())
+    mocker.patch.object(searcher, '_max_cached_queries', 2)
+    for title in ('a', 'b', 'a', 'c'):
+        await searcher._search(Query(title))
+    assert [query.title for query, _ in searcher._cache.values()] == ['a', 'c']
+    assert searcher._search_coro.call_args_list == [call(Query('a')), call(Query('b')), call(Query('c'))]
+
+@pytest.mark.asyncio
+async def test_Searcher_records_latency(searcher, mocker):
+    mocker.patch('upsies.jobs.webdb.time_monotonic', Mock(side_effect=(100, 101.5, 200, 200.25)))
+    mocker.patch.object(searcher, '_delay', AsyncMock())
+    searcher.search(Query('The Foo'))
+    await searcher.wait()
+    searcher.search(Query('The Foo'))
+    await searcher.wait()
+    assert list(searcher.latencies) == [
+        ('The Foo', 1.5, 'request'),
+        ('The Foo', 0.25, 'cache'),
+    ]
 
 
 @pytest.mark.asyncio
@@ -561,6 +643,17 @@ async def test_InfoUpdater_cancel_while_updating(info_updater):
     assert info_updater._update_task.cancelled()
 
 
+@pytest.mark.asyncio
+async def test_InfoUpdater_cancel_cancels_prefetching_and_fetching(info_updater):
+    info_updater._prefetch_task = asyncio.ensure_future(asyncio.sleep(10))
+    fetch_task = info_updater._fetch_tasks[('id', 'key')] = asyncio.ensure_future(asyncio.sleep(10))
+    info_updater.cancel()
+    await info_updater.wait()
+    assert info_updater._prefetch_task.cancelled()
+    await asyncio.sleep(0)
+    assert fetch_task.cancelled()
+
+
 @pytest.mark.asyncio
 async def test_InfoUpdater_wait_while_not_updating(info_updater):
     info_updater._update_task = None
@@ -596,6 +689,16 @@ async def test_InfoUpdater_set_result_does_not_cancel_previous_update_task(info_
     info_updater.set_result('mock result')
     assert isinstance(info_updater._update_task, asyncio.Task)
 
+@pytest.mark.asyncio
+async def test_InfoUpdater_set_result_does_not_cancel_fetch_tasks(info_updater, mocker):
+    prefetch_task = info_updater._prefetch_task = asyncio.ensure_future(asyncio.sleep(10))
+    fetch_task = info_updater._fetch_tasks[('id', 'key')] = asyncio.ensure_future(asyncio.sleep(10))
+    info_updater.set_result('mock result')
+    await asyncio.sleep(0)
+    assert not prefetch_task.cancelled()
+    assert not fetch_task.cancelled()
+    info_updater.cancel()
+
 @pytest.mark.asyncio
 async def test_InfoUpdater_set_result_sets_result(info_updater, mocker):
     info_updater.set_result('mock result 1')
@@ -756,6 +859,111 @@ async def test_UpdateInfoThread_call_callback_handles_RequestError(info_updater,
     assert info_updater._cache == {}
 
 
+@pytest.mark.asyncio
+async def test_UpdateInfoThread_call_callback_does_not_sleep_if_value_is_being_fetched(info_updater, mocker):
+    mocks = Mock(
+        value_getter=AsyncMock(return_value='The Value'),
+        callback=Mock(),
+        sleep_mock=AsyncMock(),
+    )
+    info_updater._cache.clear()
+    info_updater._fetch_tasks[('id', 'key')] = asyncio.ensure_future(
+        info_updater._fetch_value(mocks.value_getter, ('id', 'key')),
+    )
+    mocker.patch('asyncio.sleep', mocks.sleep_mock)
+    await info_updater._call_callback(
+        callback=mocks.callback,
+        value_getter=Mock(side_effect=RuntimeError('should not be called')),
+        cache_key=('id', 'key'),
+    )
+    assert mocks.mock_calls == [
+        call.callback(Ellipsis),
+        call.value_getter(),
+        call.callback('The Value'),
+    ]
+    assert info_updater._cache[('id', 'key')] == 'The Value'
+
+
+@pytest.mark.asyncio
+async def test_InfoUpdater_fetch_shares_task_and_survives_cancellation(info_updater):
+    info_updater._cache.clear()
+    calls = []
+
+    async def value_getter():
+        calls.append(call())
+        await asyncio.sleep(0.1)
+        return ('foo', 'bar')
+
+    fetch1 = asyncio.ensure_future(info_updater._fetch(value_getter, ('id', 'key')))
+    fetch2 = asyncio.ensure_future(info_updater._fetch(value_getter, ('id', 'key')))
+    await asyncio.sleep(0.01)
+    fetch1.cancel()
+    assert await fetch2 == 'foo, bar'
+    assert fetch1.cancelled()
+    assert calls == [call()]
+    assert info_updater._cache[('id', 'key')] == 'foo, bar'
+    assert info_updater._fetch_tasks == {}
+
+    # Cached value is returned without calling value_getter
+    assert await info_updater._fetch(value_getter, ('id', 'key')) == 'foo, bar'
+    assert calls == [call()]
+
+@pytest.mark.asyncio
+async def test_InfoUpdater_fetch_raises_exception(info_updater):
+    info_updater._cache.clear()
+    value_getter = AsyncMock(side_effect=errors.RequestError('Nah'))
+    with pytest.raises(errors.RequestError, match=r'^Nah$'):
+        await info_updater._fetch(value_getter, ('id', 'key'))
+    assert info_updater._cache == {}
+    assert info_updater._fetch_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_InfoUpdater_prefetch_without_results(info_updater, mocker):
+    old_prefetch_task = info_updater._prefetch_task = asyncio.ensure_future(asyncio.sleep(10))
+    info_updater.prefetch(())
+    await asyncio.sleep(0)
+    assert old_prefetch_task.cancelled()
+    assert info_updater._prefetch_task is None
+
+@pytest.mark.asyncio
+async def test_InfoUpdater_prefetch_with_results(info_updater, mocker):
+    mocker.patch.object(info_updater, '_prefetch_count', 2)
+    prefetch_mock = mocker.patch.object(info_updater, '_prefetch', AsyncMock())
+    old_prefetch_task = info_updater._prefetch_task = asyncio.ensure_future(asyncio.sleep(10))
+    info_updater.prefetch(['a', 'b', 'c'])
+    await info_updater._prefetch_task
+    assert old_prefetch_task.cancelled()
+    assert prefetch_mock.call_args_list == [call(['a', 'b'])]
+
+@pytest.mark.asyncio
+async def test_InfoUpdater_prefetch_reports_exception(info_updater, mocker):
+    mocker.patch.object(info_updater, '_prefetch', AsyncMock(side_effect=TypeError('your code sucks')))
+    info_updater.prefetch(['a'])
+    await asyncio.sleep(0.1)
+    assert isinstance(info_updater._exception_callback.call_args_list[0][0][0], TypeError)
+
+@pytest.mark.asyncio
+async def test_InfoUpdater_prefetch_fetches_callable_attributes(info_updater, mocker):
+    sleep_mock = mocker.patch('asyncio.sleep', AsyncMock())
+    fetch_mock = mocker.patch.object(info_updater, '_fetch', AsyncMock(
+        side_effect=(None, errors.RequestError('Nah'), None),
+    ))
+    info_updater._targets = {'title': Mock(), 'genre': Mock(), 'summary': Mock()}
+    results = (
+        Mock(id='1', title='Foo', genre='foo genre', summary='foo summary'),
+        Mock(id='2', title='Bar', genre=AsyncMock(), summary=AsyncMock()),
+        Mock(id='3', title=AsyncMock(), genre='baz genre', summary='baz summary'),
+    )
+    await info_updater._prefetch(results)
+    assert sleep_mock.call_args_list == [call(info_updater._delay_between_updates)]
+    assert fetch_mock.call_args_list == [
+        call(results[1].genre, ('2', 'genre')),
+        call(results[1].summary, ('2', 'summary')),
+        call(results[2].title, ('3', 'title')),
+    ]
+
+
 def test_value_as_string_with_string(info_updater):
     assert info_updater._value_as_string('foo bar baz') == 'foo bar baz'
 
@@ -6,6 +6,7 @@ import pytest
 from upsies import __homepage__, __project_name__, __version__, errors, utils
 from upsies.trackers import TrackerConfigBase, bb
 from upsies.utils.types import ReleaseType
+from upsies.utils.webdbs import idmap
 
 
 @pytest.fixture
@@ -170,14 +171,33 @@ async def test_get_tvmaze_id_from_tvmaze_job(output, exp_id, bb_tracker_jobs, mo
     assert id == exp_id
     assert bb_tracker_jobs.tvmaze_job.wait.call_args_list == [call()]
 
+@pytest.mark.parametrize('output, exp_id', ((('tt123',), '456'), (('tt789',), None), ((), None)))
+@pytest.mark.asyncio
+async def test_get_tvmaze_id_from_imdb_job(output, exp_id, bb_tracker_jobs, mocker):
+    idmap.add(imdb='tt123', tvmaze='456')
+    mocker.patch.object(bb_tracker_jobs, 'tvmaze_job', Mock(
+        is_enabled=False, wait=AsyncMock(), output=(),
+    ))
+    mocker.patch.object(bb_tracker_jobs, 'imdb_job', Mock(
+        is_enabled=True, wait=AsyncMock(), output=output,
+    ))
+    id = await bb_tracker_jobs.get_tvmaze_id()
+    assert id == exp_id
+    assert bb_tracker_jobs.tvmaze_job.wait.call_args_list == []
+    assert bb_tracker_jobs.imdb_job.wait.call_args_list == [call()]
+
 @pytest.mark.asyncio
 async def test_get_tvmaze_id_from_nowhere(bb_tracker_jobs, mocker):
     mocker.patch.object(bb_tracker_jobs, 'tvmaze_job', Mock(
         is_enabled=False, wait=AsyncMock(), output=(),
     ))
+    mocker.patch.object(bb_tracker_jobs, 'imdb_job', Mock(
+        is_enabled=False, wait=AsyncMock(), output=(),
+    ))
     id = await bb_tracker_jobs.get_tvmaze_id()
     assert id is None
     assert bb_tracker_jobs.tvmaze_job.wait.call_args_list == []
+    assert bb_tracker_jobs.imdb_job.wait.call_args_list == []
 
 
 @pytest.mark.asyncio
@@ -1451,6 +1471,14 @@ async def test_get_series_title_and_release_info_calls_fetch_info(imdb_id, exp_f
     assert bb_tracker_jobs.get_imdb_id.call_args_list == [call()]
     assert bb_tracker_jobs.release_name.fetch_info.call_args_list == exp_fetch_info_calls
 
+@pytest.mark.parametrize('exception', (None, errors.ContentError('nope')))
+@pytest.mark.asyncio
+async def test_get_series_title_and_release_info_probes_video_without_blocking(exception, bb_tracker_jobs, mocker):
+    mocker.patch.object(bb_tracker_jobs, 'get_imdb_id', AsyncMock(return_value=None))
+    tracks_async_mock = mocker.patch('upsies.utils.video.tracks_async', AsyncMock(side_effect=exception))
+    await bb_tracker_jobs.get_series_title_and_release_info()
+    assert tracks_async_mock.call_args_list == [call(bb_tracker_jobs.content_path, default=None)]
+
 @pytest.mark.parametrize('year_required', (True, False))
 @pytest.mark.asyncio
 async def test_get_series_title_and_release_info_title_with_aka_and_year(year_required, bb_tracker_jobs, mocker):
@@ -0,0 +1,154 @@
+import struct
+
+import pytest
+
+from upsies.utils import container
+
+
+def ebml_size(size, length=None):
+    if length is None:
+        length = 1
+        while size >= (1 << (7 * length)) - 1:
+            length += 1
+    return ((1 << (7 * length)) | size).to_bytes(length, 'big')
+
+def ebml(element_id, *children, size=None):
+    body = b''.join(children)
+    if size is None:
+        size = ebml_size(len(body))
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big') + size + body
+
+def ebml_uint(element_id, value):
+    return ebml(element_id, value.to_bytes(max(1, (value.bit_length() + 7) // 8), 'big'))
+
+def ebml_string(element_id, value):
+    return ebml(element_id, value.encode('utf-8'))
+
+def ebml_float(element_id, value):
+    return ebml(element_id, struct.pack('>d', value))
+
+def make_mkv(*segment_children, segment_size=None):
+    return (
+        ebml(0x1A45DFA3, ebml_string(0x4282, 'matroska'))
+        + ebml(0x18538067, *segment_children, size=segment_size)
+    )
+
+mkv_info = ebml(
+    0x1549A966,
+    ebml_uint(0x2AD7B1, 1000000),
+    ebml_float(0x4489, 5432100.0),
+)
+mkv_tracks = ebml(
+    0x1654AE6B,
+    ebml(0xAE, ebml_uint(0x83, 1), ebml_string(0x86, 'V_MPEG4/ISO/AVC')),
+)
+mkv_cluster = ebml(0x1F43B675, b'\x00' * 100)
+
+@pytest.mark.parametrize('segment_size', (None, ebml_size(0xFFFFFFFFFFFFFF, length=8)), ids=('known size', 'unknown size'))
+def test_duration_reads_matroska(segment_size, tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(make_mkv(ebml(0xEC, b'\x00' * 50), mkv_tracks, mkv_info, mkv_cluster,
+                                  segment_size=segment_size))
+    assert container.duration(filepath) == 5432.1
+
+def test_duration_reads_matroska_with_custom_timestamp_scale(tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    info = ebml(0x1549A966, ebml_uint(0x2AD7B1, 1000), ebml(0x4489, struct.pack('>f', 1.5e6)))
+    filepath.write_bytes(make_mkv(info))
+    assert container.duration(filepath) == 1.5
+
+def test_duration_stops_reading_matroska_at_first_cluster(tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(make_mkv(mkv_tracks, mkv_cluster, mkv_info))
+    assert container.duration(filepath) is None
+
+def test_duration_gets_matroska_without_info(tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(make_mkv(mkv_tracks))
+    assert container.duration(filepath) is None
+
+def test_duration_gets_matroska_info_without_duration(tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(make_mkv(ebml(0x1549A966, ebml_uint(0x2AD7B1, 1000000))))
+    assert container.duration(filepath) is None
+
+def test_duration_gets_truncated_matroska(tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(make_mkv(mkv_tracks, mkv_info)[:-20])
+    assert container.duration(filepath) is None
+
+
+def mp4_box(box_type, *children):
+    body = b''.join(children)
+    return struct.pack('>I4s', len(body) + 8, box_type) + body
+
+def mp4_full_box(box_type, version, flags, *children):
+    return mp4_box(box_type, bytes((version,)) + flags.to_bytes(3, 'big'), *children)
+
+def mp4_mvhd(timescale, duration, version=0):
+    if version == 1:
+        body = struct.pack('>QQIQ', 0, 0, timescale, duration)
+    else:
+        body = struct.pack('>IIII', 0, 0, timescale, duration)
+    return mp4_full_box(b'mvhd', version, 0, body, b'\x00' * 80)
+
+def make_mp4(*boxes):
+    return mp4_box(b'ftyp', b'isom\x00\x00\x02\x00isomiso2') + b''.join(boxes)
+
+def make_mp4_moov(version):
+    return mp4_box(
+        b'moov',
+        mp4_box(b'trak', mp4_full_box(b'tkhd', version, 0x3, b'\x00' * 80)),
+        mp4_mvhd(timescale=600, duration=600 * 4321, version=version),
+    )
+
+
+@pytest.mark.parametrize('version', (0, 1))
+@pytest.mark.parametrize('moov_at_end', (False, True), ids=('moov first', 'moov last'))
+def test_duration_reads_mp4(moov_at_end, version, tmp_path):
+    filepath = tmp_path / 'foo.mp4'
+    moov = make_mp4_moov(version)
+    mdat = mp4_box(b'mdat', b'\x00' * 1000)
+    if moov_at_end:
+        filepath.write_bytes(make_mp4(mdat, moov))
+    else:
+        filepath.write_bytes(make_mp4(moov, mdat))
+    assert container.duration(filepath) == 4321.0
+
+def test_duration_reads_mp4_with_64bit_box_size(tmp_path):
+    filepath = tmp_path / 'foo.mp4'
+    mdat = struct.pack('>I4sQ', 1, b'mdat', 16 + 1000) + b'\x00' * 1000
+    filepath.write_bytes(make_mp4(mdat, make_mp4_moov(0)))
+    assert container.duration(filepath) == 4321.0
+
+def test_duration_gets_mp4_with_unknown_duration(tmp_path):
+    filepath = tmp_path / 'foo.mp4'
+    filepath.write_bytes(make_mp4(mp4_box(b'moov', mp4_mvhd(timescale=600, duration=0xFFFFFFFF))))
+    assert container.duration(filepath) is None
+
+def test_duration_gets_mp4_without_mvhd(tmp_path):
+    filepath = tmp_path / 'foo.mp4'
+    filepath.write_bytes(make_mp4(mp4_box(b'moov', mp4_box(b'trak'))))
+    assert container.duration(filepath) is None
+
+def test_duration_gets_mp4_without_moov(tmp_path):
+    filepath = tmp_path / 'foo.mp4'
+    filepath.write_bytes(make_mp4(mp4_box(b'mdat', b'\x00' * 1000)))
+    assert container.duration(filepath) is None
+
+def test_duration_gets_truncated_mp4(tmp_path):
+    filepath = tmp_path / 'foo.mp4'
+    filepath.write_bytes(make_mp4(make_mp4_moov(0))[:-20])
+    assert container.duration(filepath) is None
+
+
+def test_duration_gets_unsupported_file(tmp_path):
+    filepath = tmp_path / 'foo.avi'
+    filepath.write_bytes(b'RIFF\x00\x00\x00\x00AVI LIST')
+    assert container.duration(filepath) is None
+
+def test_duration_gets_nonexisting_file(tmp_path):
+    assert container.duration(tmp_path / 'foo.mkv') is None
+
+def test_duration_gets_directory(tmp_path):
+    assert container.duration(tmp_path) is None
@@ -352,6 +352,38 @@ def test_mkdir_catches_makedirs_error(assert_dir_usable_mock, makedirs_mock):
     assert_dir_usable_mock.call_args_list == []
 
 
+@pytest.mark.parametrize('data', ('fö\r\no\n', b'\x00foo'), ids=('str', 'bytes'))
+def test_write_atomically_writes_data(data, tmp_path):
+    path = tmp_path / 'foo' / 'bar'
+    fs.write_atomically(str(path), data)
+    if isinstance(data, bytes):
+        assert path.read_bytes() == data
+    else:
+        assert path.read_bytes() == data.encode('utf-8')
+    assert os.listdir(path.parent) == ['bar']
+
+def test_write_atomically_replaces_existing_file(tmp_path):
+    path = tmp_path / 'foo'
+    path.write_text('old content')
+    fs.write_atomically(str(path), 'new')
+    assert path.read_text() == 'new'
+
+def test_write_atomically_removes_temporary_file_on_failure(tmp_path, mocker):
+    path = tmp_path / 'foo'
+    path.write_text('old content')
+    mocker.patch('os.replace', side_effect=OSError('No way'))
+    with pytest.raises(errors.ContentError, match=rf'^{path}: No way$'):
+        fs.write_atomically(str(path), 'new')
+    assert os.listdir(tmp_path) == ['foo']
+    assert path.read_text() == 'old content'
+
+def test_write_atomically_fails_to_create_parent(tmp_path):
+    (tmp_path / 'foo').write_text('not a directory')
+    path = tmp_path / 'foo' / 'bar'
+    with pytest.raises(errors.ContentError, match=rf'^{tmp_path / "foo"}: '):
+        fs.write_atomically(str(path), 'data')
+
+
 def test_basename():
     import pathlib
     assert fs.basename('a/b/c') == 'c'
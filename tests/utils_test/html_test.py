@@ -1,3 +1,6 @@
+import re
+from unittest.mock import call
+
 import pytest
 
 from upsies import errors
@@ -8,12 +11,56 @@ def test_html_returns_BeautifulSoup_instance(mocker):
     mocker.patch('bs4.BeautifulSoup', return_value='mock html')
     assert html.parse('<html>foo</html>') == 'mock html'
 
+def test_html_uses_default_parser(mocker):
+    BeautifulSoup_mock = mocker.patch('bs4.BeautifulSoup')
+    mocker.patch('upsies.utils.html.default_parser', return_value='fast.parser')
+    html.parse('<html>foo</html>')
+    assert BeautifulSoup_mock.call_args_list == [call('<html>foo</html>', features='fast.parser', parse_only=None)]
+
+def test_html_uses_custom_parser(mocker):
+    BeautifulSoup_mock = mocker.patch('bs4.BeautifulSoup')
+    html.parse('<html>foo</html>', parser='my.parser')
+    assert BeautifulSoup_mock.call_args_list == [call('<html>foo</html>', features='my.parser', parse_only=None)]
+
+@pytest.mark.parametrize('only', ('a', ['a'], re.compile(r'^a$')), ids=('str', 'list', 'regex'))
+def test_html_only_parses_matching_tags(only):
+    doc = html.parse('<div><a href="foo">Foo</a><p>bar</p><a>Baz</a></div>', only=only, parser='html.parser')
+    assert str(doc) == '<a href="foo">Foo</a><a>Baz</a>'
+
+def test_html_accepts_SoupStrainer():
+    from bs4 import SoupStrainer
+    only = SoupStrainer('p', class_='this')
+    doc = html.parse('<div><p class="this">Foo</p><p>bar</p></div>', only=only, parser='html.parser')
+    assert str(doc) == '<p class="this">Foo</p>'
+
 def test_html_raises_ContentError(mocker):
     mocker.patch('bs4.BeautifulSoup', side_effect=ValueError('Too many tags!'))
     with pytest.raises(errors.ContentError, match=r'^Invalid HTML: Too many tags!$'):
         html.parse('<html>foo</html>')
 
 
+@pytest.mark.parametrize(
+    argnames='lxml_spec, exp_parser',
+    argvalues=(
+        (None, 'html.parser'),
+        ('mock spec', 'lxml'),
+    ),
+)
+def test_default_parser(lxml_spec, exp_parser, mocker):
+    find_spec_mock = mocker.patch('importlib.util.find_spec', return_value=lxml_spec)
+    html.default_parser.cache_clear()
+    try:
+        assert html.default_parser() == exp_parser
+        assert find_spec_mock.call_args_list == [call('lxml')]
+    finally:
+        html.default_parser.cache_clear()
+
+
+def test_parsed_size():
+    assert html.parsed_size('<html>foo</html>') == 160
+    assert html.parsed_size('') == 0
+
+
 def test_dump_writes_string(tmp_path):
     html.dump('<html>foo</html>', tmp_path / 'foo.html')
     assert (tmp_path / 'foo.html').read_text() == '<html>\n foo\n</html>'
@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import collections
 import io
 import itertools
 import os
@@ -964,6 +965,26 @@ async def test_post_request_performs_only_one_identical_request_at_the_same_time
     }
     assert len(handler.requests_seen) == 4
 
+@pytest.mark.asyncio
+async def test_request_limits_simultaneous_requests_per_host(mocker):
+    mocker.patch.object(http, 'max_connections_per_host', 3)
+    running = collections.defaultdict(lambda: 0)
+    max_running = collections.defaultdict(lambda: 0)
+
+    async def send(self, request, **kwargs):
+        host = request.url.host
+        running[host] += 1
+        max_running[host] = max(max_running[host], running[host])
+        await asyncio.sleep(0.01)
+        running[host] -= 1
+        return httpx.Response(200, text=str(request.url), request=request)
+
+    mocker.patch('httpx.AsyncClient.send', send)
+    urls = [f'http://{host}/{i}' for host in ('foo.example', 'bar.example') for i in range(10)]
+    results = await asyncio.gather(*(http.get(url) for url in urls))
+    assert [str(result) for result in results] == urls
+    assert max_running == {'foo.example': 3, 'bar.example': 3}
+
 
 @pytest.mark.parametrize('cache', (True, False))
 @pytest.mark.asyncio
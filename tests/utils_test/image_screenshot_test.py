@@ -24,6 +24,13 @@ def test_make_screenshot_cmd(video_file, timestamp, screenshot_file, exp_args):
     cmd = image._make_screenshot_cmd(video_file, timestamp, screenshot_file)
     assert cmd == (image._ffmpeg_executable(),) + exp_args
 
+def test_make_screenshot_cmd_with_keyframe():
+    cmd = image._make_screenshot_cmd('video.mkv', 12.345, 'out.png', is_keyframe=True)
+    assert cmd == (image._ffmpeg_executable(),) + (
+        '-y', '-loglevel', 'level+error', '-ss', '12.346', '-noaccurate_seek', '-i', 'video.mkv',
+        '-vframes', '1', '-vf', 'scale=trunc(ih*dar):ih,setsar=1/1', 'file:out.png',
+    )
+
 def test_make_screenshot_cmd_handles_percent_characters(mocker):
     screenshot_path = r'path/to/%.png'
     cmd = image._make_screenshot_cmd('video.mkv', 123, screenshot_path)
@@ -86,7 +93,7 @@ def test_valid_timestamp(timestamp, mocker):
     assert sanitize_path_mock.call_args_list == [call('image.png')]
     assert path_exists_mock.call_args_list == [call('sanitized path'), call('sanitized path')]
     assert duration_mock.call_args_list == [call(mock_file)]
-    assert make_screenshot_cmd_mock.call_args_list == [call(mock_file, timestamp, 'sanitized path')]
+    assert make_screenshot_cmd_mock.call_args_list == [call(mock_file, timestamp, 'sanitized path', is_keyframe=False)]
     assert run_mock.call_args_list == [call(
         'mock cmd',
         ignore_errors=True,
@@ -94,6 +101,43 @@ def test_valid_timestamp(timestamp, mocker):
     )]
 
 
+def test_invalid_snap_to_keyframes(mocker):
+    mocker.patch('upsies.utils.fs.assert_file_readable', return_value=True)
+    make_screenshot_cmd_mock = mocker.patch('upsies.utils.image._make_screenshot_cmd', return_value='mock cmd')
+    with pytest.raises(errors.ScreenshotError, match=r"^Invalid snap_to_keyframes value: 'foo'$"):
+        image.screenshot('path/to/foo.mkv', 123, 'image.png', snap_to_keyframes='foo')
+    assert make_screenshot_cmd_mock.call_args_list == []
+
+
+@pytest.mark.parametrize(
+    argnames='snap_to_keyframes, keyframes, exp_timestamp, exp_is_keyframe',
+    argvalues=(
+        ('previous', (0.0, 50.5, 62.1, 120.0), 50.5, True),
+        ('nearest', (0.0, 50.5, 62.1, 120.0), 62.1, True),
+        ('nearest', errors.ContentError('no keyframes'), '01:01', False),
+    ),
+    ids=lambda v: str(v),
+)
+def test_snap_to_keyframes(snap_to_keyframes, keyframes, exp_timestamp, exp_is_keyframe, mocker):
+    mocker.patch('upsies.utils.fs.assert_file_readable', return_value=True)
+    mocker.patch('upsies.utils.fs.sanitize_path', return_value='sanitized path')
+    mocker.patch('os.path.exists', side_effect=(False, True))
+    mocker.patch('upsies.utils.video.duration', return_value=1e6)
+    if isinstance(keyframes, Exception):
+        keyframes_mock = mocker.patch('upsies.utils.video.keyframes', side_effect=keyframes)
+    else:
+        keyframes_mock = mocker.patch('upsies.utils.video.keyframes', return_value=keyframes)
+    make_screenshot_cmd_mock = mocker.patch('upsies.utils.image._make_screenshot_cmd', return_value='mock cmd')
+    mocker.patch('upsies.utils.subproc.run')
+
+    mock_file = 'path/to/foo.mkv'
+    image.screenshot(mock_file, '01:01', 'image.png', snap_to_keyframes=snap_to_keyframes)
+    assert keyframes_mock.call_args_list == [call(mock_file)]
+    assert make_screenshot_cmd_mock.call_args_list == [
+        call(mock_file, exp_timestamp, 'sanitized path', is_keyframe=exp_is_keyframe),
+    ]
+
+
 def test_timestamp_after_video_end(mocker):
     assert_file_readable_mock = mocker.patch('upsies.utils.fs.assert_file_readable', return_value=True)
     sanitize_path_mock = mocker.patch('upsies.utils.fs.sanitize_path', return_value='sanitized path')
@@ -167,7 +211,7 @@ def test_overwrite_existing_screenshot_file(mocker):
     assert sanitize_path_mock.call_args_list == [call('image.png')]
     assert path_exists_mock.call_args_list == [call('sanitized path')]
     assert duration_mock.call_args_list == [call(mock_file)]
-    assert make_screenshot_cmd_mock.call_args_list == [call(mock_file, '1:02:03', 'sanitized path')]
+    assert make_screenshot_cmd_mock.call_args_list == [call(mock_file, '1:02:03', 'sanitized path', is_keyframe=False)]
     assert run_mock.call_args_list == [call(
         'mock cmd',
         ignore_errors=True,
@@ -190,7 +234,7 @@ def test_screenshot_file_does_not_exist_for_some_reason(mocker):
     assert sanitize_path_mock.call_args_list == [call('image.png')]
     assert path_exists_mock.call_args_list == [call('sanitized path'), call('sanitized path')]
     assert duration_mock.call_args_list == [call(mock_file)]
-    assert make_screenshot_cmd_mock.call_args_list == [call(mock_file, 601, 'sanitized path')]
+    assert make_screenshot_cmd_mock.call_args_list == [call(mock_file, 601, 'sanitized path', is_keyframe=False)]
     assert run_mock.call_args_list == [call(
         'mock cmd',
         ignore_errors=True,
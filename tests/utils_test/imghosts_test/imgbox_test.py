@@ -10,6 +10,18 @@ def test_name():
     assert imgbox.ImgboxImageHost.name == 'imgbox'
 
 
+def test_cache_id_contains_thumb_width(tmp_path):
+    imghost = imgbox.ImgboxImageHost(cache_directory=tmp_path, options={'thumb_width': 123})
+    assert imghost.cache_id == {'thumb_width': 123}
+
+def test_thumb_width_changes_cache_file(tmp_path):
+    image_path = tmp_path / 'foo.png'
+    image_path.write_bytes(b'image data')
+    imghost1 = imgbox.ImgboxImageHost(cache_directory=tmp_path, options={'thumb_width': 123})
+    imghost2 = imgbox.ImgboxImageHost(cache_directory=tmp_path, options={'thumb_width': 456})
+    assert imghost1._cache_file(str(image_path)) != imghost2._cache_file(str(image_path))
+
+
 @pytest.mark.asyncio
 async def test_upload_image_handles_success(tmp_path, mocker):
     pyimgbox_upload_mock = mocker.patch('pyimgbox.Gallery.upload', AsyncMock(return_value=Mock(
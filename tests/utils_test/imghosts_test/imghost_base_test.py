@@ -1,4 +1,6 @@
+import builtins
 import copy
+import hashlib
 import os
 import re
 from unittest.mock import AsyncMock, Mock, PropertyMock, call
@@ -226,6 +228,8 @@ async def test_get_image_url_prepends_image_path_to_request_error(mocker, tmp_pa
 def test_get_url_from_cache_succeeds(tmp_path):
     ih = make_TestImageHost(cache_directory=tmp_path)
     image_filepath = os.path.join(tmp_path, 'foo.png')
+    with open(image_filepath, 'wb') as f:
+        f.write(b'image data')
     cache_file = ih._cache_file(image_filepath)
     with open(cache_file, 'w') as f:
         f.write('http://localhost:123/foo.png')
@@ -233,6 +237,14 @@ def test_get_url_from_cache_succeeds(tmp_path):
     assert url == 'http://localhost:123/foo.png'
 
 def test_get_url_from_cache_with_nonexisting_cache_file(tmp_path):
+    ih = make_TestImageHost(cache_directory=tmp_path)
+    image_filepath = os.path.join(tmp_path, 'foo.png')
+    with open(image_filepath, 'wb') as f:
+        f.write(b'image data')
+    url = ih._get_url_from_cache(image_path=image_filepath)
+    assert url is None
+
+def test_get_url_from_cache_with_nonexisting_image_file(tmp_path):
     ih = make_TestImageHost(cache_directory=tmp_path)
     image_filepath = os.path.join(tmp_path, 'foo.png')
     url = ih._get_url_from_cache(image_path=image_filepath)
@@ -240,38 +252,67 @@ def test_get_url_from_cache_with_nonexisting_cache_file(tmp_path):
 
 def test_get_url_from_cache_fails_to_read_cache_file(tmp_path):
     ih = make_TestImageHost(cache_directory=tmp_path)
-    cache_file = ih._cache_file(os.path.join(tmp_path, 'foo.png'))
+    image_filepath = os.path.join(tmp_path, 'foo.png')
+    with open(image_filepath, 'wb') as f:
+        f.write(b'image data')
+    cache_file = ih._cache_file(image_filepath)
     with open(cache_file, 'w') as f:
         f.write('secret')
     os.chmod(cache_file, 0o000)
     try:
-        url = ih._get_url_from_cache(image_path=os.path.join(tmp_path, 'foo.png'))
+        url = ih._get_url_from_cache(image_path=image_filepath)
     finally:
         os.chmod(cache_file, 0o600)
     assert url is None
 
+def test_get_url_from_cache_finds_identical_image_in_different_location(tmp_path):
+    ih = make_TestImageHost(cache_directory=tmp_path / 'cache')
+    for dirname in ('a', 'b'):
+        (tmp_path / dirname).mkdir()
+        (tmp_path / dirname / 'foo.png').write_bytes(b'image data')
+    ih._store_url_to_cache(str(tmp_path / 'a' / 'foo.png'), 'http://localhost:123/foo.png')
+    assert ih._get_url_from_cache(str(tmp_path / 'b' / 'foo.png')) == 'http://localhost:123/foo.png'
+    (tmp_path / 'b' / 'foo.png').write_bytes(b'other image data')
+    assert ih._get_url_from_cache(str(tmp_path / 'b' / 'foo.png')) is None
+
 
 def test_store_url_to_cache_succeeds(mocker, tmp_path):
     mkdir_mock = mocker.patch('upsies.utils.fs.mkdir')
     ih = make_TestImageHost(cache_directory=tmp_path)
+    image_filepath = os.path.join(tmp_path, 'foo.png')
+    with open(image_filepath, 'wb') as f:
+        f.write(b'image data')
     ih._store_url_to_cache(
-        image_path=os.path.join(tmp_path, 'foo.png'),
+        image_path=image_filepath,
         url='http://localhost:123/image.jpg',
     )
     assert mkdir_mock.call_args_list == [call(str(tmp_path))]
-    cache_file = ih._cache_file(os.path.join(tmp_path, 'foo.png'))
+    cache_file = ih._cache_file(image_filepath)
     cache_content = open(cache_file, 'r').read()
     assert cache_content == 'http://localhost:123/image.jpg'
 
+def test_store_url_to_cache_ignores_nonexisting_image_file(mocker, tmp_path):
+    mkdir_mock = mocker.patch('upsies.utils.fs.mkdir')
+    ih = make_TestImageHost(cache_directory=tmp_path)
+    ih._store_url_to_cache(
+        image_path=os.path.join(tmp_path, 'foo.png'),
+        url='http://localhost:123/image.jpg',
+    )
+    assert mkdir_mock.call_args_list == []
+    assert os.listdir(tmp_path) == []
+
 def test_store_url_to_cache_fails_to_write(mocker, tmp_path):
     mkdir_mock = mocker.patch('upsies.utils.fs.mkdir')
     ih = make_TestImageHost(cache_directory=tmp_path)
-    cache_file = ih._cache_file(os.path.join(tmp_path, 'foo.png'))
-    os.chmod(tmp_path, 0o000)
+    image_filepath = os.path.join(tmp_path, 'foo.png')
+    with open(image_filepath, 'wb') as f:
+        f.write(b'image data')
+    cache_file = ih._cache_file(image_filepath)
+    os.chmod(tmp_path, 0o500)
     try:
         with pytest.raises(RuntimeError, match=rf'^Unable to write cache {cache_file}: Permission denied$'):
             ih._store_url_to_cache(
-                image_path=os.path.join(tmp_path, 'foo.png'),
+                image_path=image_filepath,
                 url='http://localhost:123/image.jpg',
             )
         assert not os.path.exists(cache_file)
@@ -293,32 +334,34 @@ def test_store_url_to_cache_fails_to_write(mocker, tmp_path):
         ('some/path', 'image_id', 'some/path'),
     ),
 )
-@pytest.mark.parametrize('image_dir', (None, 'some/relative/path', '/absolute/path'))
-def test_cache_file(mocker, image_dir, cache_dir, cache_id, exp_cache_dir):
+def test_cache_file(mocker, tmp_path, cache_dir, cache_id, exp_cache_dir):
     mocker.patch('upsies.constants.DEFAULT_CACHE_DIRECTORY', exp_cache_dir)
     ih = make_TestImageHost(cache_directory=cache_dir)
     mocker.patch.object(ih, '_get_cache_id_as_string', return_value=cache_id)
-    image_name = 'foo.png'
+    image_path = tmp_path / 'foo.png'
+    image_path.write_bytes(b'image data')
+    digest = hashlib.sha256(b'image data').hexdigest()
 
     if cache_id:
-        exp_cache_name = f'{image_name}.{cache_id}.{ih.name}.url'
-    else:
-        exp_cache_name = f'{image_name}.{ih.name}.url'
-
-    if image_dir is None:
-        # Image is in cache dir
-        image_path = os.path.join(exp_cache_dir, image_name)
-    elif os.path.isabs(image_dir):
-        # Image has absolute path
-        image_path = os.path.join(image_dir, image_name)
-        exp_cache_name = os.path.join(os.path.dirname(image_path), exp_cache_name).replace(os.sep, '_')
+        exp_cache_name = f'{digest}.{cache_id}.{ih.name}.url'
     else:
-        # Image has relative path
-        image_path = os.path.join(os.getcwd(), image_dir, image_name)
-        exp_cache_name = os.path.join(os.path.dirname(image_path), exp_cache_name).replace(os.sep, '_')
+        exp_cache_name = f'{digest}.{ih.name}.url'
 
     exp_cache_file = os.path.join(exp_cache_dir, exp_cache_name)
-    assert ih._cache_file(image_path) == exp_cache_file
+    assert ih._cache_file(str(image_path)) == exp_cache_file
+
+def test_cache_file_with_nonexisting_image(tmp_path):
+    ih = make_TestImageHost(cache_directory=tmp_path)
+    assert ih._cache_file(str(tmp_path / 'foo.png')) is None
+
+def test_cache_file_does_not_read_unchanged_image_again(mocker, tmp_path):
+    ih = make_TestImageHost(cache_directory=tmp_path)
+    image_path = tmp_path / 'foo.png'
+    image_path.write_bytes(b'image data')
+    open_spy = mocker.spy(builtins, 'open')
+    cache_file = ih._cache_file(str(image_path))
+    assert ih._cache_file(str(image_path)) == cache_file
+    assert open_spy.call_args_list == [call(str(image_path), 'rb')]
 
 
 @pytest.mark.parametrize(
@@ -336,3 +379,8 @@ def test_get_cache_id_as_string(cache_id, exp_cache_id, mocker):
     mocker.patch.object(type(ih), 'cache_id', PropertyMock(return_value=cache_id))
     cache_id = ih._get_cache_id_as_string()
     assert cache_id == exp_cache_id
+
+
+def test_image_digests_are_bounded():
+    from upsies.utils.imghosts import base
+    assert base._get_file_digest.cache_info().maxsize is not None
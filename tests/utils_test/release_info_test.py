@@ -1,3 +1,6 @@
+import multiprocessing
+import pathlib
+import pickle
 import re
 from unittest.mock import Mock, call
 
@@ -566,3 +569,258 @@ def test_abbreviated_scene_filename(path, exp_release_name):
 ))
 def test_special_case(release_name, expected):
     assert_info(release_name, **expected)
+
+
+@pytest.fixture
+def guess_cache(mocker, tmp_path):
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    mocker.patch.object(release, 'cache_directory', str(tmp_path / 'release_info'))
+    mocker.patch.object(release, '_fast_guess', return_value=None)
+    return tmp_path / 'release_info'
+
+def test_guessit_results_are_cached_in_memory(guess_cache, mocker):
+    mocker.patch.object(release, 'cache_directory', None)
+    guessit_spy = mocker.spy(release._guessit.default_api, 'guessit')
+    for _ in range(3):
+        ri = release.ReleaseInfo('The.Foo.S01E02.2010.UK.1080p.WEB-DL.H.264-ASDF.mkv')
+        assert ri['title'] == 'The Foo'
+        assert ri['country'] == 'UK'
+        assert ri['episodes'] == {'1': ['2']}
+    assert len(guessit_spy.call_args_list) == 1
+    assert not guess_cache.exists()
+
+def test_guessit_results_are_cached_on_disk(guess_cache, mocker):
+    guessit_spy = mocker.spy(release._guessit.default_api, 'guessit')
+    ri = release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')
+    assert ri['title'] == 'The Foo'
+    assert len(guessit_spy.call_args_list) == 1
+    assert len(tuple(guess_cache.iterdir())) == 1
+
+    # New process
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    ri = release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')
+    assert ri['title'] == 'The Foo'
+    assert ri['year'] == '2010'
+    assert len(guessit_spy.call_args_list) == 1
+
+    # New upsies version
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    mocker.patch.object(release, '__version__', 'new version')
+    ri = release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')
+    assert ri['title'] == 'The Foo'
+    assert len(guessit_spy.call_args_list) == 2
+    assert len(tuple(guess_cache.iterdir())) == 2
+
+def test_guessit_results_are_not_shared_between_ReleaseInfo_instances(guess_cache):
+    ri1 = release.ReleaseInfo('The.Foo.S01E02.1080p.WEB-DL.H.264-ASDF.mkv')
+    ri1['episodes'].update(release.Episodes.from_string('S01E03'))
+    ri1['has_commentary'] = True
+    ri2 = release.ReleaseInfo('The.Foo.S01E02.1080p.WEB-DL.H.264-ASDF.mkv')
+    assert ri2['episodes'] == {'1': ['2']}
+    assert ri2._guess.get('has_commentary') is None
+
+def test_guessit_cache_ignores_unreadable_and_unwritable_cache(guess_cache, mocker):
+    mocker.patch('builtins.open', side_effect=OSError('nope'))
+    ri = release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')
+    assert ri['title'] == 'The Foo'
+    assert tuple(guess_cache.iterdir()) == ()
+
+def test_guessit_cache_ignores_corrupt_cache_file(guess_cache, mocker):
+    guessit_spy = mocker.spy(release._guessit.default_api, 'guessit')
+    release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')['title']
+    cache_file, = guess_cache.iterdir()
+    cache_file.write_text('[not, json')
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    assert release.ReleaseInfo('The.Foo.2010.1080p.BluRay.x264-ASDF')['title'] == 'The Foo'
+    assert len(guessit_spy.call_args_list) == 2
+
+
+@pytest.mark.parametrize('path', (
+    'The.Foo.2010.1080p.BluRay.x264-ASDF',
+    'The.Foo.2010.Extended.Remastered.2160p.UHD.BluRay.REMUX.HDR.HEVC.DTS-HD.MA.5.1-ASDF',
+    'The.Foo.2010.Theatrical.1080p.BluRay.DTS-HD.MA.7.1.x264-ASDF.mkv',
+    'The.Foo.2010.PROPER.720p.BluRay.DD5.1.x264-ASDF',
+    'The.Foo.S01E02.1080p.AMZN.WEB-DL.DDP5.1.H.264-ASDF',
+    'The.Foo.S01E02E03.720p.HDTV.x264-ASDF',
+    'The.Foo.S03.2160p.NF.WEB-DL.DV.HDR.DDP5.1.Atmos.H.265-ASDF',
+    'The.Foo.2010.1080p.WEBRip.AAC2.0.x264-ASDF',
+    'The.Foo.2010.DVDRip.x264-ASDF',
+    'path/to/The.Foo.2010.1080p.BluRay.FLAC.x264-ASDF.mkv',
+))
+def test_fast_parser_is_equivalent_to_guessit(path, mocker):
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    mocker.patch.object(release, 'cache_directory', None)
+    fast_info = release.ReleaseInfo(path)
+    exp_parser = 'guessit' if 'UHD' in path else 'fast'
+    assert fast_info.parser == exp_parser
+
+    mocker.patch.object(release, '_fast_guess', return_value=None)
+    guessit_info = release.ReleaseInfo(path)
+    assert guessit_info.parser == 'guessit'
+    assert dict(fast_info) == dict(guessit_info)
+
+@pytest.mark.parametrize('path', (
+    # No year or season
+    'The.Foo.1080p.BluRay.x264-ASDF',
+    # Unknown parameter
+    'The.Foo.2010.German.DL.1080p.BluRay.x264-ASDF',
+    'The.Foo.2010.1080p.BluRay.x264.Something-ASDF',
+    # Episode title
+    'The.Foo.S01E02.The.Bar.Baz.1080p.WEB-DL.H.264-ASDF',
+    # Neither resolution nor source
+    'The.Foo.2010.x264-ASDF',
+    # Title words guessit may interpret as something else
+    'The.Foo.Extended.2010.1080p.BluRay.x264-ASDF',
+    'Real.Life.2015.1080p.AMZN.WEB-DL.DDP5.1.H.264-ASDF',
+    'The.Foo.UK.2010.1080p.BluRay.x264-ASDF',
+    # Parent directory provides information
+    'The Foo (2010)/The.Bar.S01E02.1080p.WEB-DL.H.264-ASDF.mkv',
+    'The.Foo.2010.1080p.BluRay.x264-ASDF/The.Foo.2010.1080p.BluRay.x264-ASDF.mkv',
+    # No group
+    'The.Foo.2010.1080p.BluRay.x264',
+))
+def test_fast_parser_falls_back_to_guessit(path, mocker):
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    mocker.patch.object(release, 'cache_directory', None)
+    guessit_spy = mocker.spy(release._guessit.default_api, 'guessit')
+    info = release.ReleaseInfo(path)
+    assert info.parser == 'guessit'
+    assert len(guessit_spy.call_args_list) == 1
+
+def test_fast_parser_does_not_run_guessit(mocker):
+    mocker.patch.object(release, '_guess_cache', release.LRUCache())
+    guessit_mock = mocker.patch.object(release, '_run_guessit')
+    info = release.ReleaseInfo('The.Foo.S01E02.1080p.WEB-DL.DDP5.1.H.264-ASDF')
+    assert info.parser == 'fast'
+    assert info['title'] == 'The Foo'
+    assert info['episodes'] == {'1': ['2']}
+    assert info['audio_codec'] == 'E-AC-3'
+    assert guessit_mock.call_args_list == []
+
+
+parse_many_paths = (
+    'The.Foo.2010.1080p.BluRay.x264-ASDF',
+    'The.Foo.S01E02.1080p.WEB-DL.H.264-ASDF',
+    'path/to/The Bar (2003)/The.Bar.2003.German.DL.720p.BluRay.x264-BAZ.mkv',
+    'Baz S02 720p HDTV DD2.0 x264-ASDF',
+)
+
+def test_parse_many_in_calling_process(mocker):
+    ProcessPoolExecutor_mock = mocker.patch('concurrent.futures.ProcessPoolExecutor')
+    infos = release.parse_many(parse_many_paths * 10, workers=4, chunksize=64)
+    assert infos == [release.ReleaseRecord.from_release_info(release.ReleaseInfo(path)) for path in parse_many_paths * 10]
+    assert ProcessPoolExecutor_mock.call_args_list == []
+
+def test_parse_many_with_single_worker(mocker):
+    ProcessPoolExecutor_mock = mocker.patch('concurrent.futures.ProcessPoolExecutor')
+    infos = release.parse_many(parse_many_paths * 100, workers=1)
+    assert infos == [release.ReleaseRecord.from_release_info(release.ReleaseInfo(path)) for path in parse_many_paths * 100]
+    assert ProcessPoolExecutor_mock.call_args_list == []
+
+def test_parse_many_in_worker_processes(mocker, tmp_path):
+    mocker.patch.object(release, 'cache_directory', str(tmp_path / 'release_info'))
+    ProcessPoolExecutor_spy = mocker.spy(release.concurrent.futures, 'ProcessPoolExecutor')
+    infos = release.parse_many([pathlib.Path(p) for p in parse_many_paths * 2], workers=2, chunksize=2)
+    assert ProcessPoolExecutor_spy.call_args_list == [call(
+        max_workers=2,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=release._parse_many_init,
+        initargs=(str(tmp_path / 'release_info'),),
+    )]
+    # Workers store guessit results in the cache directory
+    assert tuple((tmp_path / 'release_info').iterdir())
+    assert infos == [release.ReleaseRecord.from_release_info(release.ReleaseInfo(path)) for path in parse_many_paths * 2]
+
+
+record_fields = {
+    'aka': '', 'audio_channels': '5.1', 'audio_codec': 'DTS-HD MA', 'country': '', 'date': '',
+    'edition': ['Extended Cut'], 'episode_title': '', 'episodes': release.Episodes({'1': ['2', '3']}),
+    'group': 'ASDF', 'has_commentary': False, 'resolution': '1080p', 'service': '',
+    'source': 'BluRay', 'title': 'The Foo', 'type': ReleaseType.episode, 'video_codec': 'x264',
+    'year': '2010',
+}
+
+def test_ReleaseRecord_requires_all_keys():
+    fields = dict(record_fields)
+    del fields['group']
+    del fields['source']
+    with pytest.raises(TypeError, match=r'^Missing keys: group, source$'):
+        release.ReleaseRecord('foo', **fields)
+
+def test_ReleaseRecord_rejects_unknown_keys():
+    with pytest.raises(TypeError, match=r'^Unknown keys: bar, foo$'):
+        release.ReleaseRecord('foo', foo=1, bar=2, **record_fields)
+
+def test_ReleaseRecord_values():
+    record = release.ReleaseRecord(pathlib.Path('path/to/foo'), **record_fields)
+    assert record.path == 'path/to/foo'
+    assert record.edition == ('Extended Cut',)
+    assert record.episodes == (('1', ('2', '3')),)
+    assert record['group'] == record.group == 'ASDF'
+    assert record['type'] is ReleaseType.episode
+    assert tuple(record) == tuple(sorted(record_fields))
+    assert len(record) == len(record_fields)
+    with pytest.raises(KeyError, match=r"^'path'$"):
+        record['path']
+
+def test_ReleaseRecord_interns_strings():
+    fields = dict(record_fields)
+    fields['group'] = ''.join(('AS', 'DF'))
+    fields['episodes'] = {''.join(('1', '')): [''.join(('2', ''))]}
+    record1 = release.ReleaseRecord('foo', **record_fields)
+    record2 = release.ReleaseRecord('bar', **fields)
+    assert record1.group is record2.group
+    assert record1.episodes[0][0] is record2.episodes[0][0]
+    assert record1.episodes[0][1][0] is record2.episodes[0][1][0]
+
+def test_ReleaseRecord_is_immutable():
+    record = release.ReleaseRecord('foo', **record_fields)
+    with pytest.raises(AttributeError, match=r'^ReleaseRecord is immutable$'):
+        record.group = 'BAR'
+    with pytest.raises(AttributeError, match=r'^ReleaseRecord is immutable$'):
+        del record.group
+    with pytest.raises(AttributeError):
+        record.foo = 'bar'
+
+def test_ReleaseRecord_equality_and_hash():
+    record1 = release.ReleaseRecord('foo', **record_fields)
+    record2 = release.ReleaseRecord('foo', **record_fields)
+    record3 = release.ReleaseRecord('foo', **{**record_fields, 'group': 'BAR'})
+    record4 = release.ReleaseRecord('bar', **record_fields)
+    assert record1 == record2
+    assert record1 != record3
+    assert record1 != record4
+    assert record1 != dict(record1)
+    assert len({record1, record2, record3, record4}) == 3
+
+def test_ReleaseRecord_can_be_pickled():
+    record = release.ReleaseRecord('foo', **record_fields)
+    assert pickle.loads(pickle.dumps(record)) == record
+
+def test_ReleaseRecord_repr():
+    assert repr(release.ReleaseRecord('path/to/foo', **record_fields)) == "ReleaseRecord('path/to/foo')"
+
+@pytest.mark.parametrize('path', (
+    'The.Foo.2010.Extended.1080p.BluRay.DTS-HD.MA.5.1.x264-ASDF',
+    'The.Foo.S01E02E03.720p.HDTV.x264-ASDF',
+    'path/to/The Foo S02 German DL 1080p WEB H264-ASDF',
+))
+def test_ReleaseRecord_conversion_to_and_from_ReleaseInfo(path, mocker):
+    info = release.ReleaseInfo(path)
+    record = release.ReleaseRecord.from_release_info(info)
+    assert record.path == path
+    assert dict(record) == {
+        **dict(info),
+        'edition': tuple(info['edition']),
+        'episodes': tuple((season, tuple(episodes)) for season, episodes in info['episodes'].items()),
+    }
+
+    fast_guess_mock = mocker.patch.object(release, '_fast_guess')
+    run_guessit_mock = mocker.patch.object(release, '_run_guessit')
+    info2 = record.to_release_info()
+    assert info2.path == path
+    assert info2.parser == 'record'
+    assert dict(info2) == dict(info)
+    assert isinstance(info2['episodes'], release.Episodes)
+    assert fast_guess_mock.call_args_list == []
+    assert run_guessit_mock.call_args_list == []
@@ -32,3 +32,12 @@ def store_response(data_dir):
         os.mkdir(cache_dir)
     with patch('upsies.constants.DEFAULT_CACHE_DIRECTORY', cache_dir):
         yield
+
+
+# Never use the user's local scene database
+@pytest.fixture(autouse=True)
+def localdb_database(tmp_path, mocker):
+    from upsies.utils.scene import localdb
+    database = tmp_path / 'scene.db'
+    mocker.patch.dict(localdb.LocaldbApi.default_config, {'database': str(database)})
+    return database
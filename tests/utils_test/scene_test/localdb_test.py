@@ -0,0 +1,161 @@
+import os
+import re
+from unittest.mock import AsyncMock, Mock, call
+
+import pytest
+
+from upsies import errors
+from upsies.utils.scene import find, localdb
+
+
+@pytest.fixture
+def api():
+    return localdb.LocaldbApi()
+
+
+def test_name(api):
+    assert api.name == 'localdb'
+
+def test_label(api):
+    assert api.label == 'Local database'
+
+def test_is_complete(api):
+    assert api.is_complete is False
+
+def test_database(api, localdb_database):
+    assert api.database == str(localdb_database)
+    assert localdb.LocaldbApi(config={'database': 'path/to/foo.db'}).database == 'path/to/foo.db'
+
+def test_exists(api, localdb_database):
+    assert api.exists is False
+    api.add(['Foo-BAR'], create=True)
+    assert api.exists is True
+
+
+def test_add_does_nothing_if_database_does_not_exist(api, localdb_database):
+    assert api.add(['Foo-BAR']) == 0
+    assert not localdb_database.exists()
+
+def test_add_creates_database(api, tmp_path):
+    database = tmp_path / 'path' / 'to' / 'scene.db'
+    api = localdb.LocaldbApi(config={'database': str(database)})
+    assert api.add(['Foo-BAR', ' Bar-BAZ\n', ''], create=True) == 2
+    assert database.exists()
+
+def test_add_ignores_existing_release_names(api):
+    assert api.add(['Foo-BAR', 'Bar-BAZ'], create=True) == 2
+    assert api.add(['Foo-BAR', 'foo-bar', 'Baz-FOO']) == 1
+
+def test_add_fails_to_create_database(api, tmp_path):
+    (tmp_path / 'file').write_text('not a directory')
+    api = localdb.LocaldbApi(config={'database': str(tmp_path / 'file' / 'scene.db')})
+    with pytest.raises(errors.RequestError, match=rf'^Local database: {re.escape(str(tmp_path))}/file/scene.db: '):
+        api.add(['Foo-BAR'], create=True)
+
+def test_add_fails_to_open_database(api, localdb_database):
+    localdb_database.write_text('this is not a database')
+    with pytest.raises(errors.RequestError, match=rf'^Local database: {re.escape(str(localdb_database))}: '):
+        api.add(['Foo-BAR'])
+
+
+def test_import_dump(api, tmp_path):
+    dump = tmp_path / 'dump.csv'
+    dump.write_text(
+        'Foo.2000.1080p.BluRay.x264-AAA,1234567890,x264\n'
+        '\n'
+        'Foo.2000.720p.BluRay.x264-BBB;1234567890;x264\n'
+        '  Bar.S01E01.720p.HDTV.x264-CCC\t1234567890\n'
+        'Bar.S01E02.720p.HDTV.x264-CCC 1234567890\n'
+        'Foo.2000.1080p.BluRay.x264-AAA\n'
+    )
+    assert api.import_dump(dump) == 4
+    assert api.import_dump(dump) == 0
+
+def test_import_dump_fails_to_read_file(api, tmp_path):
+    with pytest.raises(errors.RequestError, match=rf'^{re.escape(str(tmp_path))}/nope.txt: No such file or directory$'):
+        api.import_dump(tmp_path / 'nope.txt')
+
+
+release_names = (
+    'Foo.2000.1080p.BluRay.x264-AAA',
+    'Foo.2000.720p.BluRay.x264-BBB',
+    'Foo.Bar.2000.720p.BluRay.x264-BBB',
+    'Foo.S01E01.720p.HDTV.x264-CCC',
+    'Foo.S01E02.720p.HDTV.x264-CCC',
+    'Foo.S01E02.720p.HDTV.x264-CCC_iNT',
+    'Baz.2010.1080p.BluRay.x264-AAA',
+)
+
+@pytest.mark.parametrize(
+    argnames='keywords, group, exp_results',
+    argvalues=(
+        (('foo', '2000'), None, [
+            'Foo.2000.1080p.BluRay.x264-AAA',
+            'Foo.2000.720p.BluRay.x264-BBB',
+            'Foo.Bar.2000.720p.BluRay.x264-BBB',
+        ]),
+        (('Foo', '2000', '720p'), 'bbb', ['Foo.2000.720p.BluRay.x264-BBB', 'Foo.Bar.2000.720p.BluRay.x264-BBB']),
+        (('foo', 'S01E02'), None, ['Foo.S01E02.720p.HDTV.x264-CCC', 'Foo.S01E02.720p.HDTV.x264-CCC_iNT']),
+        (('foo', 'S01E02'), 'CCC', ['Foo.S01E02.720p.HDTV.x264-CCC']),
+        ((), 'AAA', ['Foo.2000.1080p.BluRay.x264-AAA', 'Baz.2010.1080p.BluRay.x264-AAA']),
+        (('"quoted"',), None, []),
+        (('-',), None, []),
+        ((), None, []),
+        (('nope',), None, []),
+    ),
+)
+@pytest.mark.asyncio
+async def test__search(keywords, group, exp_results, api):
+    api.add(release_names, create=True)
+    results = await api._search(keywords, group=group)
+    assert sorted(results) == sorted(exp_results)
+
+@pytest.mark.asyncio
+async def test__search_without_database(api, localdb_database):
+    assert await api._search(('foo',), group=None) == []
+    assert not localdb_database.exists()
+
+@pytest.mark.asyncio
+async def test_search_handles_episodes(api):
+    api.add(release_names, create=True)
+    results = await api.search(find.SceneQuery('foo', episodes={'1': []}))
+    assert results == [
+        'Foo.S01E01.720p.HDTV.x264-CCC',
+        'Foo.S01E02.720p.HDTV.x264-CCC',
+        'Foo.S01E02.720p.HDTV.x264-CCC_iNT',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_release_files(api):
+    assert await api.release_files('Foo-BAR') == {}
+
+
+@pytest.mark.asyncio
+async def test_refresh(api, mocker):
+    dbs = {
+        'foo': Mock(search=AsyncMock(return_value=['Foo.2000.1080p.BluRay.x264-AAA'])),
+        'bar': Mock(search=AsyncMock(side_effect=errors.RequestError('bar is down'))),
+        'baz': Mock(search=AsyncMock(return_value=['Foo.2000.1080p.BluRay.x264-AAA',
+                                                   'Foo.2000.720p.BluRay.x264-BBB'])),
+    }
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=lambda name: dbs[name])
+    query = find.SceneQuery('foo', '2000')
+    assert await api.refresh(query, dbs=('foo', 'bar', 'baz')) == 2
+    for db in dbs.values():
+        assert db.search.call_args_list == [call(query)]
+    assert sorted(await api._search(('foo',), group=None)) == [
+        'Foo.2000.1080p.BluRay.x264-AAA',
+        'Foo.2000.720p.BluRay.x264-BBB',
+    ]
+
+@pytest.mark.asyncio
+async def test_refresh_fails(api, localdb_database, mocker):
+    dbs = {
+        'foo': Mock(search=AsyncMock(side_effect=errors.RequestError('foo is down'))),
+        'bar': Mock(search=AsyncMock(side_effect=errors.RequestError('bar is down'))),
+    }
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=lambda name: dbs[name])
+    with pytest.raises(errors.RequestError, match=r'^All queries failed: foo is down, bar is down$'):
+        await api.refresh(find.SceneQuery('foo'), dbs=('foo', 'bar'))
+    assert not os.path.exists(localdb_database)
@@ -1,3 +1,4 @@
+import asyncio
 import re
 from unittest.mock import AsyncMock, Mock, call
 
@@ -41,7 +42,7 @@ async def test_search(q, results, exp_results, api, mocker):
     assert results == exp_results
     assert api._get_q.call_args_list == [call(('kw1', 'kw2'), 'ASDF')]
     if q:
-        assert api._request_all_pages.call_args_list == [call(q)]
+        assert api._request_all_pages.call_args_list == [call(q, is_enough=None)]
     else:
         assert api._request_all_pages.call_args_list == []
 
@@ -63,64 +64,86 @@ def test_get_q(keywords, group, exp_q, api):
     assert q == exp_q
 
 
-@pytest.mark.parametrize('last_result_index', (5, 6, 7, 8, 9, 10))
+def make_request_page(results, results_per_page):
+    async def request_page(q, page):
+        # Finish pages in reverse order
+        await asyncio.sleep(0.001 * (10 - page % 10))
+        page_results = results[(page - 1) * results_per_page:page * results_per_page]
+        next_page = page + 1 if len(page_results) >= results_per_page else -1
+        return page_results, next_page
+
+    return request_page
+
+
+@pytest.mark.parametrize(
+    argnames='last_result_index, exp_requested_pages',
+    argvalues=(
+        (5, (1, 2, 3, 4)),
+        (6, (1, 2, 3, 4)),
+        (12, (1, 2, 3, 4, 5, 6, 7, 8)),
+        (13, (1, 2, 3, 4, 5, 6, 7, 8)),
+    ),
+)
 @pytest.mark.asyncio
-async def test_request_all_pages_stops_when_there_is_no_next_page(last_result_index, api, mocker):
-    results_count = 100
-    results_per_page = 3
-    results = [f'Result {i}' for i in range(1, (results_count) + 1)]
-
-    pages = []
-    for i in range(0, len(results), results_per_page):
-        page = results[i:i + results_per_page]
-        if i >= last_result_index - 2:
-            page_len = last_result_index % results_per_page
-            page = page[:page_len]
-            next_page = -1
-            pages.append((page, next_page))
-            break
-        else:
-            page = results[i:i + results_per_page]
-            next_page = int((i / results_per_page) + 2)
-            pages.append((page, next_page))
-
-    mocker.patch.object(api, '_request_page', AsyncMock(side_effect=pages))
-
-    exp_results = results[:last_result_index]
+async def test_request_all_pages_stops_when_there_is_no_next_page(last_result_index, exp_requested_pages, api, mocker):
+    mocker.patch('upsies.utils.http.max_connections_per_host', 4)
+    results = [f'Result {i}' for i in range(1, last_result_index + 1)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page(results, results_per_page=3))
 
     mock_q = 'foo bar baz'
     return_value = await api._request_all_pages(mock_q)
-    assert return_value == exp_results
-
-    max_page_index_requested = (last_result_index // results_per_page) + 1
-    exp_request_page_calls = [
-        call(mock_q, i) for i in range(1, max_page_index_requested + 1)
-    ]
-    assert api._request_page.call_args_list == exp_request_page_calls
+    assert return_value == results
+    assert sorted(api._request_page.call_args_list) == [call(mock_q, page) for page in exp_requested_pages]
 
 @pytest.mark.asyncio
 async def test_request_all_pages_does_not_request_pages_indefinitely(api, mocker):
-    results_count = 100
-    results_per_page = 3
-    results = [f'Result {i}' for i in range(1, (results_count) + 1)]
-
-    pages = [
-        (results[i:i + results_per_page], int((i / results_per_page) + 2))
-        for i in range(0, len(results), results_per_page)
-    ]
-    mocker.patch.object(api, '_request_page', AsyncMock(side_effect=pages))
+    mocker.patch('upsies.utils.http.max_connections_per_host', 4)
     mocker.patch.object(api, '_max_pages', 10)
-
-    exp_results = results[:results_per_page * (api._max_pages - 1)]
+    results = [f'Result {i}' for i in range(1, 101)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page(results, results_per_page=3))
 
     mock_q = 'foo bar baz'
     return_value = await api._request_all_pages(mock_q)
-    assert return_value == exp_results
-
-    assert api._request_page.call_args_list == [
+    assert return_value == results[:3 * (api._max_pages - 1)]
+    assert sorted(api._request_page.call_args_list) == [
         call(mock_q, i) for i in range(1, api._max_pages)
     ]
 
+@pytest.mark.asyncio
+async def test_request_all_pages_stops_when_there_are_enough_results(api, mocker):
+    mocker.patch('upsies.utils.http.max_connections_per_host', 4)
+    results = [f'Result {i}' for i in range(1, 101)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page(results, results_per_page=3))
+
+    def is_enough(results):
+        return 'Result 14' in results
+
+    mock_q = 'foo bar baz'
+    return_value = await api._request_all_pages(mock_q, is_enough=is_enough)
+    assert 'Result 14' in return_value
+    assert return_value == sorted(return_value, key=lambda r: int(r.split()[1]))
+    assert sorted(api._request_page.call_args_list) == [call(mock_q, page) for page in range(1, 9)]
+
+@pytest.mark.asyncio
+async def test_request_all_pages_cancels_requests_when_a_request_fails(api, mocker):
+    mocker.patch('upsies.utils.http.max_connections_per_host', 4)
+    cancelled = []
+
+    async def request_page(q, page):
+        if page == 2:
+            raise errors.RequestError('Page 2 failed')
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(page)
+            raise
+
+    mocker.patch.object(api, '_request_page', side_effect=request_page)
+    with pytest.raises(errors.RequestError, match=r'^Page 2 failed$'):
+        await api._request_all_pages('foo')
+    await asyncio.sleep(0)
+    assert sorted(cancelled) == [1, 3, 4]
+
 
 @pytest.mark.parametrize(
     argnames='q, page, response, exp_return_value, exp_exception',
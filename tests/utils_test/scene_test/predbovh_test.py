@@ -1,3 +1,5 @@
+import asyncio
+import math
 import re
 from unittest.mock import AsyncMock, Mock, call
 
@@ -31,7 +33,7 @@ async def test_search(api, mocker):
     results = await api._search(('kw1', 'kw2'), group='ASDF')
     assert results == ('Foo', 'Bar', 'Baz')
     assert api._get_q.call_args_list == [call(('kw1', 'kw2'), 'ASDF')]
-    assert api._request_all_pages.call_args_list == [call('foo bar @team baz')]
+    assert api._request_all_pages.call_args_list == [call('foo bar @team baz', is_enough=None)]
 
 
 @pytest.mark.parametrize(
@@ -52,64 +54,121 @@ def test_get_q(keywords, group, exp_q, api):
     assert q == exp_q
 
 
-@pytest.mark.parametrize('last_result_index', (5, 6, 7, 8, 9, 10))
-@pytest.mark.asyncio
-async def test_request_all_pages_stops_when_there_is_no_next_page(last_result_index, api, mocker):
-    results_count = 100
-    results_per_page = 3
-    results = [f'Result {i}' for i in range(1, (results_count) + 1)]
-
-    pages = []
-    for i in range(0, len(results), results_per_page):
-        page = results[i:i + results_per_page]
-        if i >= last_result_index - 2:
-            page_len = last_result_index % results_per_page
-            page = page[:page_len]
-            next_page = -1
-            pages.append((page, next_page))
-            break
-        else:
-            page = results[i:i + results_per_page]
-            next_page = int((i / results_per_page) + 2)
-            pages.append((page, next_page))
+def make_request_page(results, results_per_page):
+    async def request_page(q, page):
+        # Finish pages in reverse order
+        await asyncio.sleep(0.001 * (40 - page))
+        page_results = results[(page - 1) * results_per_page:page * results_per_page]
+        return page_results, math.ceil(len(results) / results_per_page)
 
-    mocker.patch.object(api, '_request_page', AsyncMock(side_effect=pages))
+    return request_page
 
-    exp_results = results[:last_result_index]
+
+@pytest.mark.parametrize('results_count', (0, 1, 3, 4, 5, 6, 7, 10))
+@pytest.mark.asyncio
+async def test_request_all_pages_requests_pages_concurrently(results_count, api, mocker):
+    results = [f'Result {i}' for i in range(1, results_count + 1)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page(results, results_per_page=3))
 
     mock_q = 'foo bar @team baz'
     return_value = await api._request_all_pages(mock_q)
-    assert return_value == exp_results
+    assert return_value == results
 
-    max_page_index_requested = (last_result_index // results_per_page) + 1
-    exp_request_page_calls = [
-        call(mock_q, i) for i in range(1, max_page_index_requested + 1)
+    exp_page_count = max(1, math.ceil(results_count / 3))
+    assert api._request_page.call_args_list[0] == call(mock_q, 1)
+    assert sorted(api._request_page.call_args_list) == [
+        call(mock_q, i) for i in range(1, exp_page_count + 1)
     ]
-    assert api._request_page.call_args_list == exp_request_page_calls
 
 @pytest.mark.asyncio
 async def test_request_all_pages_does_not_request_pages_indefinitely(api, mocker):
-    results_count = 100
-    results_per_page = 3
-    results = [f'Result {i}' for i in range(1, (results_count) + 1)]
+    results = [f'Result {i}' for i in range(1, 101)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page(results, results_per_page=3))
 
-    pages = [
-        (results[i:i + results_per_page], int((i / results_per_page) + 2))
-        for i in range(0, len(results), results_per_page)
-    ]
-    mocker.patch.object(api, '_request_page', AsyncMock(side_effect=pages))
+    mock_q = 'foo bar @team baz'
+    return_value = await api._request_all_pages(mock_q)
+    assert return_value == results[:3 * 30]
+    assert sorted(api._request_page.call_args_list) == [call(mock_q, i) for i in range(1, 31)]
+
+@pytest.mark.asyncio
+async def test_request_all_pages_stops_if_first_page_is_enough(api, mocker):
+    results = [f'Result {i}' for i in range(1, 101)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page(results, results_per_page=3))
 
-    max_page_index_requested = 30
-    exp_results = results[:results_per_page * max_page_index_requested]
+    mock_q = 'foo bar @team baz'
+    return_value = await api._request_all_pages(mock_q, is_enough=lambda results: 'Result 2' in results)
+    assert return_value == ['Result 1', 'Result 2', 'Result 3']
+    assert api._request_page.call_args_list == [call(mock_q, 1)]
+
+@pytest.mark.asyncio
+async def test_request_all_pages_stops_when_there_are_enough_results(api, mocker):
+    results = [f'Result {i}' for i in range(1, 31)]
+    request_page = make_request_page(results, results_per_page=3)
+    cancelled = []
+
+    async def request_page_wrapper(q, page):
+        try:
+            # Only the last page finishes
+            if page not in (1, 10):
+                await asyncio.sleep(10)
+            return await request_page(q, page)
+        except asyncio.CancelledError:
+            cancelled.append(page)
+            raise
+
+    mocker.patch.object(api, '_request_page', side_effect=request_page_wrapper)
+
+    mock_q = 'foo bar @team baz'
+    return_value = await api._request_all_pages(mock_q, is_enough=lambda results: 'Result 29' in results)
+    assert return_value == ['Result 1', 'Result 2', 'Result 3', 'Result 28', 'Result 29', 'Result 30']
+    await asyncio.sleep(0)
+    assert sorted(cancelled) == list(range(2, 10))
+
+def make_request_page_without_total(results, results_per_page):
+    async def request_page(q, page):
+        page_results = results[(page - 1) * results_per_page:page * results_per_page]
+        if len(page_results) >= results_per_page:
+            return page_results, None
+        else:
+            return page_results, page
+
+    return request_page
+
+@pytest.mark.parametrize('results_count', (0, 1, 3, 4, 9, 10))
+@pytest.mark.asyncio
+async def test_request_all_pages_requests_pages_sequentially_without_total(results_count, api, mocker):
+    results = [f'Result {i}' for i in range(1, results_count + 1)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page_without_total(results, results_per_page=3))
 
     mock_q = 'foo bar @team baz'
     return_value = await api._request_all_pages(mock_q)
-    assert return_value == exp_results
+    assert return_value == results
 
+    exp_page_count = results_count // 3 + 1
     assert api._request_page.call_args_list == [
-        call(mock_q, i) for i in range(1, max_page_index_requested + 1)
+        call(mock_q, i) for i in range(1, exp_page_count + 1)
     ]
 
+@pytest.mark.asyncio
+async def test_request_all_pages_does_not_request_pages_indefinitely_without_total(api, mocker):
+    results = [f'Result {i}' for i in range(1, 101)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page_without_total(results, results_per_page=3))
+
+    mock_q = 'foo bar @team baz'
+    return_value = await api._request_all_pages(mock_q)
+    assert return_value == results[:3 * 30]
+    assert api._request_page.call_args_list == [call(mock_q, i) for i in range(1, 31)]
+
+@pytest.mark.asyncio
+async def test_request_all_pages_stops_when_there_are_enough_results_without_total(api, mocker):
+    results = [f'Result {i}' for i in range(1, 31)]
+    mocker.patch.object(api, '_request_page', side_effect=make_request_page_without_total(results, results_per_page=3))
+
+    mock_q = 'foo bar @team baz'
+    return_value = await api._request_all_pages(mock_q, is_enough=lambda results: 'Result 8' in results)
+    assert return_value == results[:9]
+    assert api._request_page.call_args_list == [call(mock_q, i) for i in range(1, 4)]
+
 
 @pytest.mark.parametrize(
     argnames='q, page, response, exp_return_value, exp_exception',
@@ -118,21 +177,35 @@ async def test_request_all_pages_does_not_request_pages_indefinitely(api, mocker
             'foo @team bar',
             1,
             {'status': 'success', 'data': {'rows': [{'name': f'Foo {i}'} for i in range(30)], 'reqCount': 29}},
-            (tuple(f'Foo {i}' for i in range(30)), 2),
+            (tuple(f'Foo {i}' for i in range(30)), None),
+            None,
+        ),
+        (
+            'foo @team bar',
+            3,
+            {'status': 'success', 'data': {'rows': [{'name': f'Foo {i}'} for i in range(30)], 'reqCount': 100, 'total': 1234}},
+            (tuple(f'Foo {i}' for i in range(30)), 13),
+            None,
+        ),
+        (
+            'foo @team bar',
+            1,
+            {'status': 'success', 'data': {'rows': [], 'reqCount': 100, 'total': 0}},
+            ((), 1),
             None,
         ),
         (
             'foo @team bar',
             1,
             {'status': 'success', 'data': {'rows': [{'name': f'Foo {i}'} for i in range(30)], 'reqCount': 30}},
-            (tuple(f'Foo {i}' for i in range(30)), 2),
+            (tuple(f'Foo {i}' for i in range(30)), None),
             None,
         ),
         (
             'foo @team bar',
             1,
             {'status': 'success', 'data': {'rows': [{'name': f'Foo {i}'} for i in range(30)], 'reqCount': 31}},
-            (tuple(f'Foo {i}' for i in range(30)), -1),
+            (tuple(f'Foo {i}' for i in range(30)), 1),
             None,
         ),
         (
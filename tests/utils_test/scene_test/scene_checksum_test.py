@@ -0,0 +1,146 @@
+import os
+import zlib
+from unittest.mock import AsyncMock
+
+import pytest
+
+from upsies import errors
+from upsies.utils import LRUCache
+from upsies.utils.scene import checksum
+
+
+@pytest.fixture(autouse=True)
+def checksum_cache(tmp_path, mocker):
+    mocker.patch.object(checksum, '_checksum_cache', LRUCache(maxsize=1024))
+    mocker.patch.object(checksum, 'cache_directory', str(tmp_path / 'checksums'))
+    return tmp_path / 'checksums'
+
+
+@pytest.mark.parametrize('length1', (0, 1, 1000, 65537))
+@pytest.mark.parametrize('length2', (0, 1, 777, 100000))
+def test_crc32_combine(length1, length2):
+    data1 = os.urandom(length1)
+    data2 = os.urandom(length2)
+    assert checksum._crc32_combine(zlib.crc32(data1), zlib.crc32(data2), length2) == zlib.crc32(data1 + data2)
+
+
+def test_crc32_segment(tmp_path, mocker):
+    mocker.patch.object(checksum, '_read_size', 10)
+    filepath = tmp_path / 'foo'
+    data = os.urandom(1000)
+    filepath.write_bytes(data)
+    assert checksum._crc32_segment(str(filepath), 123, 456) == (123, 456, zlib.crc32(data[123:123 + 456]))
+
+def test_crc32_segment_detects_truncated_file(tmp_path):
+    filepath = tmp_path / 'foo'
+    filepath.write_bytes(os.urandom(1000))
+    with pytest.raises(OSError, match=r'^File was truncated while reading: '):
+        checksum._crc32_segment(str(filepath), 900, 200)
+
+
+@pytest.mark.parametrize('size', (0, 1, 4095, 4096, 50000))
+@pytest.mark.asyncio
+async def test_crc32_returns_checksum_of_file(size, tmp_path, mocker):
+    mocker.patch.object(checksum, 'segment_size', 4096)
+    filepath = tmp_path / 'foo.mkv'
+    data = os.urandom(size)
+    filepath.write_bytes(data)
+    progress = []
+    exp_checksum = f'{zlib.crc32(data):08X}'
+    assert await checksum.crc32(filepath, progress_callback=lambda *args: progress.append(args)) == exp_checksum
+    if size:
+        assert progress[-1] == (filepath, size, size)
+        assert [bytes_done for _, bytes_done, _ in progress] == sorted(bytes_done for _, bytes_done, _ in progress)
+        assert len(progress) == -(-size // 4096)
+    else:
+        assert progress == []
+
+@pytest.mark.asyncio
+async def test_crc32_raises_ContentError_if_file_does_not_exist(tmp_path):
+    filepath = tmp_path / 'foo.mkv'
+    with pytest.raises(errors.ContentError, match=rf'^{filepath}: No such file or directory$'):
+        await checksum.crc32(filepath)
+
+@pytest.mark.asyncio
+async def test_crc32_caches_checksum_by_inode_size_and_mtime(tmp_path, mocker, checksum_cache):
+    calculate_mock = mocker.patch('upsies.utils.scene.checksum._calculate_crc32', AsyncMock(return_value='DEADBEEF'))
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(b'foo')
+    progress = []
+
+    assert await checksum.crc32(filepath) == 'DEADBEEF'
+    assert len(calculate_mock.call_args_list) == 1
+    assert len(tuple(checksum_cache.iterdir())) == 1
+
+    # Renamed file is still cached and progress is reported as complete
+    renamed_filepath = tmp_path / 'bar.mkv'
+    filepath.rename(renamed_filepath)
+    assert await checksum.crc32(renamed_filepath, progress_callback=lambda *args: progress.append(args)) == 'DEADBEEF'
+    assert len(calculate_mock.call_args_list) == 1
+    assert progress == [(renamed_filepath, 3, 3)]
+
+    # Cached on disk
+    mocker.patch.object(checksum, '_checksum_cache', LRUCache(maxsize=1024))
+    assert await checksum.crc32(renamed_filepath) == 'DEADBEEF'
+    assert len(calculate_mock.call_args_list) == 1
+
+    # Modified file is not cached
+    renamed_filepath.write_bytes(b'foo!')
+    calculate_mock.return_value = 'C0FFEE00'
+    assert await checksum.crc32(renamed_filepath) == 'C0FFEE00'
+    assert len(calculate_mock.call_args_list) == 2
+    assert len(tuple(checksum_cache.iterdir())) == 2
+
+@pytest.mark.asyncio
+async def test_crc32_ignores_invalid_cache_file(tmp_path, mocker, checksum_cache):
+    calculate_mock = mocker.patch('upsies.utils.scene.checksum._calculate_crc32', AsyncMock(return_value='DEADBEEF'))
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(b'foo')
+    assert await checksum.crc32(filepath) == 'DEADBEEF'
+    cache_file, = checksum_cache.iterdir()
+    cache_file.write_text('garbage')
+
+    mocker.patch.object(checksum, '_checksum_cache', LRUCache(maxsize=1024))
+    assert await checksum.crc32(filepath) == 'DEADBEEF'
+    assert len(calculate_mock.call_args_list) == 2
+    assert cache_file.read_text() == 'DEADBEEF'
+
+@pytest.mark.asyncio
+async def test_crc32_without_cache_directory(tmp_path, mocker):
+    mocker.patch.object(checksum, 'cache_directory', None)
+    calculate_mock = mocker.patch('upsies.utils.scene.checksum._calculate_crc32', AsyncMock(return_value='DEADBEEF'))
+    filepath = tmp_path / 'foo.mkv'
+    filepath.write_bytes(b'foo')
+    for _ in range(3):
+        assert await checksum.crc32(filepath) == 'DEADBEEF'
+    assert len(calculate_mock.call_args_list) == 1
+    assert tuple(tmp_path.iterdir()) == (filepath,)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_terminates_worker_processes(tmp_path, mocker):
+    mocker.patch.object(checksum, 'segment_size', 4096)
+    mocker.patch.object(checksum, 'cache_directory', None)
+    filepath = tmp_path / 'foo.mkv'
+    data = os.urandom(10000)
+    filepath.write_bytes(data)
+    assert await checksum.crc32(filepath) == f'{zlib.crc32(data):08X}'
+    executor = checksum._executor
+    assert executor is not None
+    processes = list(executor._processes.values())
+
+    checksum.shutdown()
+    assert checksum._executor is None
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+
+    # Worker processes are started again
+    checksum._checksum_cache.clear()
+    assert await checksum.crc32(filepath) == f'{zlib.crc32(data):08X}'
+    assert checksum._executor not in (None, executor)
+
+def test_shutdown_without_executor(mocker):
+    mocker.patch.object(checksum, '_executor', None)
+    checksum.shutdown()
+    assert checksum._executor is None
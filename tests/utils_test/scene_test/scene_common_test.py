@@ -29,6 +29,39 @@ def test_get_needed_keys(release_info, exp_keys, source, irrelevant_keys):
     assert common.get_needed_keys(release_info) == exp_keys
 
 
+@pytest.mark.parametrize(
+    argnames='release, exp_normalized',
+    argvalues=(
+        ('Foo.2000.1080p.BluRay.x264-ASDF', 'Foo.2000.1080p.BluRay.x264-ASDF'),
+        (' Foo.2000.1080p.BluRay.x264-ASDF\n', 'Foo.2000.1080p.BluRay.x264-ASDF'),
+        ('path/to/Foo.2000.1080p.BluRay.x264-ASDF/', 'path/to/Foo.2000.1080p.BluRay.x264-ASDF'),
+        ('path//to/./Foo.2000.1080p.BluRay.x264-ASDF', 'path/to/Foo.2000.1080p.BluRay.x264-ASDF'),
+        ('', ''),
+        (None, None),
+        ({'title': 'Foo'}, {'title': 'Foo'}),
+    ),
+)
+def test_normalize_release_name(release, exp_normalized):
+    assert common.normalize_release_name(release) == exp_normalized
+
+def test_normalize_release_name_makes_existing_paths_absolute(tmp_path, mocker):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'a' / 'foo.mkv').write_text('data')
+    (tmp_path / 'b' / 'foo.mkv').write_text('data')
+    mocker.patch('os.getcwd', return_value=str(tmp_path / 'a'))
+    mocker.patch('os.path.exists', return_value=True)
+    key_a = common.normalize_release_name(' foo.mkv ')
+    mocker.patch('os.getcwd', return_value=str(tmp_path / 'b'))
+    key_b = common.normalize_release_name(' foo.mkv ')
+    assert key_a == str(tmp_path / 'a' / 'foo.mkv')
+    assert key_b == str(tmp_path / 'b' / 'foo.mkv')
+
+def test_normalize_release_name_does_not_make_release_names_absolute(mocker):
+    mocker.patch('os.path.exists', return_value=False)
+    assert common.normalize_release_name('Foo.2000.BluRay-ASDF') == 'Foo.2000.BluRay-ASDF'
+
+
 @pytest.mark.parametrize(
     argnames='release_name, exp_season_pack',
     argvalues=(
@@ -1,10 +1,11 @@
+import asyncio
 import re
-from unittest.mock import AsyncMock, call
+from unittest.mock import AsyncMock, Mock, call
 
 import pytest
 
 from upsies import constants, errors
-from upsies.utils import release
+from upsies.utils import release, scene, semantic_hash
 from upsies.utils.scene import find
 
 
@@ -13,6 +14,7 @@ def make_db_class(name, exception):
 
     class MockSceneDb:
         name = _name
+        is_complete = True
         calls = []
 
         async def search(self, *args, **kwargs):
@@ -44,7 +46,7 @@ async def test_search_finds_query_results_directly(query, exp_query, mocker):
     find.search.clear_cache()
     results = await find.search(query, mock_dbs, only_existing_releases=mock_only_existing_releases)
     assert results == mock_results
-    assert multisearch_mock.call_args_list == [call(mock_dbs, exp_query, mock_only_existing_releases)]
+    assert multisearch_mock.call_args_list == [call(mock_dbs, exp_query, mock_only_existing_releases, union=False)]
 
 @pytest.mark.parametrize(
     argnames='query, exp_first_query, exp_perform_episode_searches',
@@ -89,20 +91,107 @@ async def test_search_finds_results_from_generated_episodes(query, exp_first_que
 
     if exp_perform_episode_searches:
         assert multisearch_mock.call_args_list == [
-            call(mock_dbs, exp_first_query, mock_only_existing_releases),
-            call(mock_dbs, mock_episode_queries[0], mock_only_existing_releases),
-            call(mock_dbs, mock_episode_queries[1], mock_only_existing_releases),
+            call(mock_dbs, exp_first_query, mock_only_existing_releases, union=False),
+            call(mock_dbs, mock_episode_queries[0], mock_only_existing_releases, union=False),
+            call(mock_dbs, mock_episode_queries[1], mock_only_existing_releases, union=False),
         ]
         assert generate_episode_queries_mock.call_args_list == [
             call(query),
         ]
     else:
         assert multisearch_mock.call_args_list == [
-            call(mock_dbs, exp_first_query, mock_only_existing_releases),
+            call(mock_dbs, exp_first_query, mock_only_existing_releases, union=False),
         ]
         assert generate_episode_queries_mock.call_args_list == []
 
 
+@pytest.mark.parametrize(
+    argnames='query_a, query_b, exp_equal',
+    argvalues=(
+        ('path/to/Foo.2000.BluRay-ASDF', 'path/to/Foo.2000.BluRay-ASDF/', True),
+        ('path/to/Foo.2000.BluRay-ASDF', ' path//to/Foo.2000.BluRay-ASDF', True),
+        ('path/to/Foo.2000.BluRay-ASDF', 'path/to/Foo.2000.BluRay-ASDFG', False),
+        (find.SceneQuery('Foo', '2000', group='ASDF'), find.SceneQuery('foo', '2000', group='asdf'), True),
+        (find.SceneQuery('Foo', '2000', group='ASDF'), find.SceneQuery('foo', '2001', group='asdf'), False),
+        (find.SceneQuery('Foo', episodes={'1': ['2']}), find.SceneQuery('Foo', episodes={'1': ['3']}), False),
+    ),
+)
+def test_search_cache_key(query_a, query_b, exp_equal):
+    key_a = semantic_hash(find._search_cache_key(query_a, ('predbovh',), only_existing_releases=True))
+    key_b = semantic_hash(find._search_cache_key(query_b, ('predbovh',), only_existing_releases=True))
+    assert (key_a == key_b) is exp_equal
+
+@pytest.mark.asyncio
+async def test_search_does_not_cache_RequestError(mocker):
+    multisearch_mock = mocker.patch('upsies.utils.scene.find._multisearch', AsyncMock(
+        side_effect=(errors.RequestError('predb is down'), ['Foo.2000.BluRay-ASDF']),
+    ))
+    find.search.clear_cache()
+    with pytest.raises(errors.RequestError, match=r'^predb is down$'):
+        await find.search(find.SceneQuery('foo'))
+    assert await find.search(find.SceneQuery('foo')) == ['Foo.2000.BluRay-ASDF']
+    assert await find.search(find.SceneQuery('FOO')) == ['Foo.2000.BluRay-ASDF']
+    assert len(multisearch_mock.call_args_list) == 2
+
+
+@pytest.mark.asyncio
+async def test_search_episodes_concurrently(mocker):
+    mocker.patch('upsies.utils.scene.find.max_concurrent_episode_searches', 2)
+    mocker.patch('upsies.utils.scene.find._generate_episode_queries', return_value=(
+        find.SceneQuery('foo', episodes={'1': ['1']}),
+        find.SceneQuery('foo', episodes={'1': ['2']}),
+        find.SceneQuery('foo', episodes={'1': ['1']}),
+        find.SceneQuery('foo', episodes={'1': ['3']}),
+    ))
+    running = []
+    max_running = 0
+
+    async def multisearch(dbs, query, only_existing_releases, union=False):
+        nonlocal max_running
+        if not query.episodes.get('1'):
+            return []
+        running.append(query)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(query)
+        episode = query.episodes['1'][0]
+        return [f'Foo.S01E0{episode}-GRP', 'Foo.S01-GRP']
+
+    multisearch_mock = mocker.patch('upsies.utils.scene.find._multisearch', side_effect=multisearch)
+    find.search.clear_cache()
+    results = await find.search('path/to/Foo.S01.720p.BluRay.x264-GRP', ('a', 'b'))
+    assert results == ['Foo.S01E01-GRP', 'Foo.S01-GRP', 'Foo.S01E02-GRP', 'Foo.S01E03-GRP']
+    # Duplicate episode query is only searched once
+    assert len(multisearch_mock.call_args_list) == 4
+    assert max_running == 2
+
+@pytest.mark.asyncio
+async def test_search_episodes_cancels_other_searches_if_one_fails(mocker):
+    mocker.patch('upsies.utils.scene.find._generate_episode_queries', return_value=(
+        find.SceneQuery('foo', episodes={'1': ['1']}),
+        find.SceneQuery('foo', episodes={'1': ['2']}),
+    ))
+    cancelled = []
+
+    async def multisearch(dbs, query, only_existing_releases, union=False):
+        if not query.episodes.get('1'):
+            return []
+        elif query.episodes['1'] == ['1']:
+            raise errors.RequestError('foo is down')
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+
+    mocker.patch('upsies.utils.scene.find._multisearch', side_effect=multisearch)
+    find.search.clear_cache()
+    with pytest.raises(errors.RequestError, match=r'^foo is down$'):
+        await find.search('path/to/Foo.S01.720p.BluRay.x264-GRP', ('a', 'b'))
+    await asyncio.sleep(0)
+    assert cancelled == [find.SceneQuery('foo', episodes={'1': ['2']})]
+
+
 @pytest.mark.parametrize(
     argnames='dbs, exp_results, exp_exception, exp_queried_db_names',
     argvalues=(
@@ -153,6 +242,247 @@ async def test_multisearch(dbs, exp_results, exp_exception, exp_queried_db_names
         assert db.calls == [call('mock query', only_existing_releases='mock bool')]
 
 
+@pytest.mark.asyncio
+async def test_multisearch_ignores_no_results_from_incomplete_database(mocker):
+    incomplete_db = Mock(is_complete=False, search=AsyncMock(return_value=[]))
+    complete_db = Mock(is_complete=True, search=AsyncMock(return_value=[]))
+    other_db = Mock(is_complete=True, search=AsyncMock(return_value=['Foo-BAR']))
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(incomplete_db, complete_db, other_db))
+    results = await find._multisearch(['incomplete', 'complete', 'other'], 'mock query', only_existing_releases=True)
+    assert results == []
+    assert incomplete_db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+    assert complete_db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+    assert other_db.search.call_args_list == []
+
+@pytest.mark.asyncio
+async def test_multisearch_adds_results_to_localdb(localdb_database, mocker):
+    scene.localdb.LocaldbApi().add(['Foo.2000.720p.BluRay.x264-AAA'], create=True)
+    predbovh_search_mock = mocker.patch('upsies.utils.scene.predbovh.PredbovhApi._search', AsyncMock(
+        return_value=['Foo.2000.720p.BluRay.x264-BBB', 'Foo.2000.720p.BluRay.x264-CCC'],
+    ))
+    query = find.SceneQuery('foo', '2000', '720p')
+    results = await find._multisearch(['localdb', 'predbovh'], query, only_existing_releases=True)
+    assert results == [
+        'Foo.2000.720p.BluRay.x264-BBB',
+        'Foo.2000.720p.BluRay.x264-CCC',
+        'Foo.2000.720p.BluRay.x264-AAA',
+    ]
+    assert len(predbovh_search_mock.call_args_list) == 1
+    assert sorted(await scene.localdb.LocaldbApi().search(query)) == [
+        'Foo.2000.720p.BluRay.x264-AAA',
+        'Foo.2000.720p.BluRay.x264-BBB',
+        'Foo.2000.720p.BluRay.x264-CCC',
+    ]
+
+@pytest.mark.asyncio
+async def test_multisearch_does_not_trust_localdb_on_its_own(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 10)
+    dbs = (
+        make_slow_db('localdb', delay=0, results=['Foo.S01E01-GRP'], is_complete=False),
+        make_slow_db('online', delay=0.05, results=['Foo.S01E01-GRP', 'Foo.S01E02-GRP']),
+    )
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=dbs)
+    mocker.patch('upsies.utils.scene.find._add_to_localdb')
+    results = await find._multisearch(['localdb', 'online'], 'mock query', only_existing_releases=True)
+    assert results == ['Foo.S01E01-GRP', 'Foo.S01E02-GRP']
+    for db in dbs:
+        assert db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+
+@pytest.mark.asyncio
+async def test_multisearch_ignores_failing_localdb(mocker):
+    dbs = (
+        make_slow_db('localdb', delay=0, exception=errors.RequestError('localdb is broken'), is_complete=False),
+        make_slow_db('online', delay=0, results=['Foo-GRP']),
+    )
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=dbs)
+    mocker.patch('upsies.utils.scene.find._add_to_localdb')
+    results = await find._multisearch(['localdb', 'online'], 'mock query', only_existing_releases=True)
+    assert results == ['Foo-GRP']
+
+@pytest.mark.asyncio
+async def test_multisearch_does_not_return_localdb_results_if_online_databases_fail(mocker):
+    dbs = (
+        make_slow_db('localdb', delay=0, results=['Foo-GRP'], is_complete=False),
+        make_slow_db('online', delay=0.01, exception=errors.RequestError('online is down')),
+    )
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=dbs)
+    with pytest.raises(errors.RequestError, match=r'^All queries failed: online is down$'):
+        await find._multisearch(['localdb', 'online'], 'mock query', only_existing_releases=True)
+    await asyncio.sleep(0)
+
+@pytest.mark.asyncio
+async def test_multisearch_searches_only_localdb(mocker):
+    db = make_slow_db('localdb', delay=0, results=['Foo-GRP'], is_complete=False)
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(db,))
+    add_to_localdb_mock = mocker.patch('upsies.utils.scene.find._add_to_localdb')
+    results = await find._multisearch(['localdb'], 'mock query', only_existing_releases=True)
+    assert results == ['Foo-GRP']
+    assert add_to_localdb_mock.call_args_list == [call(['Foo-GRP'])]
+
+@pytest.mark.asyncio
+async def test_multisearch_does_not_create_localdb(localdb_database, mocker):
+    mocker.patch('upsies.utils.scene.predbovh.PredbovhApi._search', AsyncMock(
+        return_value=['Foo.2000.720p.BluRay.x264-BBB'],
+    ))
+    results = await find._multisearch(['localdb', 'predbovh'], find.SceneQuery('foo'), only_existing_releases=True)
+    assert results == ['Foo.2000.720p.BluRay.x264-BBB']
+    assert not localdb_database.exists()
+
+
+def make_slow_db(name, delay, results=(), exception=None, is_complete=True):
+    db = Mock(is_complete=is_complete, cancelled=False)
+    db.name = name
+
+    async def search(*args, **kwargs):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            db.cancelled = True
+            raise
+        if exception:
+            raise exception
+        return list(results)
+
+    db.search = AsyncMock(side_effect=search)
+    return db
+
+@pytest.mark.asyncio
+async def test_multisearch_queries_next_database_if_first_database_is_slow(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 0.01)
+    slow_db = make_slow_db('slow', delay=10, results=['Slow-FOO'])
+    fast_db = make_slow_db('fast', delay=0, results=['Fast-FOO'])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(slow_db, fast_db))
+    results = await find._multisearch(['slow', 'fast'], 'mock query', only_existing_releases=True)
+    assert results == ['Fast-FOO']
+    assert slow_db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+    assert fast_db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+    # Let the cancelled task handle its cancellation
+    await asyncio.sleep(0)
+    assert slow_db.cancelled is True
+
+@pytest.mark.asyncio
+async def test_multisearch_queries_next_database_immediately_if_first_database_fails(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 10)
+    failing_db = make_slow_db('failing', delay=0, exception=errors.RequestError('failing is down'))
+    other_db = make_slow_db('other', delay=0, results=['Other-FOO'])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(failing_db, other_db))
+    results = await asyncio.wait_for(
+        find._multisearch(['failing', 'other'], 'mock query', only_existing_releases=True),
+        timeout=1,
+    )
+    assert results == ['Other-FOO']
+
+@pytest.mark.asyncio
+async def test_multisearch_does_not_query_next_database_if_first_database_is_fast(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 10)
+    fast_db = make_slow_db('fast', delay=0, results=['Fast-FOO'])
+    other_db = make_slow_db('other', delay=0, results=['Other-FOO'])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(fast_db, other_db))
+    results = await find._multisearch(['fast', 'other'], 'mock query', only_existing_releases=True)
+    assert results == ['Fast-FOO']
+    assert other_db.search.call_args_list == []
+
+@pytest.mark.asyncio
+async def test_multisearch_returns_slow_database_results_if_hedged_database_fails(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 0.01)
+    slow_db = make_slow_db('slow', delay=0.1, results=['Slow-FOO'])
+    failing_db = make_slow_db('failing', delay=0, exception=errors.RequestError('failing is down'))
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(slow_db, failing_db))
+    results = await find._multisearch(['slow', 'failing'], 'mock query', only_existing_releases=True)
+    assert results == ['Slow-FOO']
+    assert slow_db.cancelled is False
+
+@pytest.mark.asyncio
+async def test_multisearch_does_not_return_no_results_while_earlier_database_is_pending(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 0.01)
+    slow_db = make_slow_db('slow', delay=0.1, results=['Slow-FOO'])
+    empty_db = make_slow_db('empty', delay=0, results=[])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(slow_db, empty_db))
+    results = await find._multisearch(['slow', 'empty'], 'mock query', only_existing_releases=True)
+    assert results == ['Slow-FOO']
+    assert empty_db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+    assert slow_db.cancelled is False
+
+@pytest.mark.asyncio
+async def test_multisearch_returns_results_from_later_database_while_earlier_database_is_pending(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 0.01)
+    slow_db = make_slow_db('slow', delay=10, results=['Slow-FOO'])
+    empty_db = make_slow_db('empty', delay=0, results=[])
+    fast_db = make_slow_db('fast', delay=0, results=['Fast-FOO'])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(slow_db, empty_db, fast_db))
+    results = await find._multisearch(['slow', 'empty', 'fast'], 'mock query', only_existing_releases=True)
+    assert results == ['Fast-FOO']
+    await asyncio.sleep(0)
+    assert slow_db.cancelled is True
+
+@pytest.mark.asyncio
+async def test_multisearch_returns_no_results_if_earlier_database_fails(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 0.01)
+    failing_db = make_slow_db('failing', delay=0.1, exception=errors.RequestError('failing is down'))
+    empty_db = make_slow_db('empty', delay=0, results=[])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(failing_db, empty_db))
+    results = await find._multisearch(['failing', 'empty'], 'mock query', only_existing_releases=True)
+    assert results == []
+    assert failing_db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+
+@pytest.mark.asyncio
+async def test_multisearch_returns_no_results_from_first_database_immediately(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 10)
+    empty_db = make_slow_db('empty', delay=0, results=[])
+    other_db = make_slow_db('other', delay=0, results=['Other-FOO'])
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(empty_db, other_db))
+    results = await find._multisearch(['empty', 'other'], 'mock query', only_existing_releases=True)
+    assert results == []
+    assert other_db.search.call_args_list == []
+
+@pytest.mark.asyncio
+async def test_multisearch_combines_errors_in_database_order(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 0.01)
+    slow_db = make_slow_db('slow', delay=0.1, exception=errors.RequestError('slow is down'))
+    fast_db = make_slow_db('fast', delay=0, exception=errors.RequestError('fast is down'))
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=(slow_db, fast_db))
+    with pytest.raises(errors.RequestError, match=r'^All queries failed: slow is down, fast is down$'):
+        await find._multisearch(['slow', 'fast'], 'mock query', only_existing_releases=True)
+
+@pytest.mark.asyncio
+async def test_multisearch_combines_results_from_all_databases_in_union_mode(mocker):
+    mocker.patch('upsies.utils.scene.find.hedge_delay', 10)
+    dbs = (
+        make_slow_db('a', delay=0, results=['Foo.S01E10-GRP', 'Foo.S01E02-GRP']),
+        make_slow_db('b', delay=0.01, results=['foo.s01e02-grp', 'Foo.S01E01-GRP']),
+        make_slow_db('c', delay=0, exception=errors.RequestError('c is down')),
+    )
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=dbs)
+    add_to_localdb_mock = mocker.patch('upsies.utils.scene.find._add_to_localdb')
+    results = await find._multisearch(['a', 'b', 'c'], 'mock query', only_existing_releases=True, union=True)
+    assert results == ['Foo.S01E01-GRP', 'Foo.S01E02-GRP', 'Foo.S01E10-GRP']
+    for db in dbs:
+        assert db.search.call_args_list == [call('mock query', only_existing_releases=True)]
+    assert add_to_localdb_mock.call_args_list == []
+
+@pytest.mark.asyncio
+async def test_multisearch_adds_union_results_to_localdb(mocker):
+    dbs = (
+        make_slow_db('localdb', delay=0, results=['Foo-A'], is_complete=False),
+        make_slow_db('b', delay=0, results=['Foo-B']),
+    )
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=dbs)
+    add_to_localdb_mock = mocker.patch('upsies.utils.scene.find._add_to_localdb')
+    results = await find._multisearch(['localdb', 'b'], 'mock query', only_existing_releases=True, union=True)
+    assert results == ['Foo-A', 'Foo-B']
+    assert add_to_localdb_mock.call_args_list == [call(['Foo-A', 'Foo-B'])]
+
+@pytest.mark.asyncio
+async def test_multisearch_raises_if_all_databases_fail_in_union_mode(mocker):
+    dbs = (
+        make_slow_db('a', delay=0, exception=errors.RequestError('a is down')),
+        make_slow_db('b', delay=0, exception=errors.RequestError('b is down')),
+    )
+    mocker.patch('upsies.utils.scene.scenedb', side_effect=dbs)
+    with pytest.raises(errors.RequestError, match=r'^All queries failed: a is down, b is down$'):
+        await find._multisearch(['a', 'b'], 'mock query', only_existing_releases=True, union=True)
+
+
 @pytest.mark.parametrize(
     argnames='path, files, exp_queries, exp_file_list_called',
     argvalues=(
@@ -358,6 +688,34 @@ async def test_SceneQuery_search(only_existing_releases, exp_only_existing_relea
     assert query._handle_results.call_args_list == [
         call(('foo', 'bar', 'baz'), exp_only_existing_releases)
     ]
+    assert search_coro_func.call_args_list == [
+        call(('this', 'that'), group='ASDF', is_enough=query._has_all_episodes),
+    ]
+
+@pytest.mark.parametrize(
+    argnames='episodes, results, exp_has_all_episodes',
+    argvalues=(
+        ({}, ['Foo.S01E01.720p.HDTV.x264-ASDF'], False),
+        ({'1': []}, ['Foo.S01E01.720p.HDTV.x264-ASDF', 'Foo.S01E02.720p.HDTV.x264-ASDF'], False),
+        ({'1': ['2']}, ['Foo.S01E01.720p.HDTV.x264-ASDF', 'Foo.S02E02.720p.HDTV.x264-ASDF'], False),
+        ({'1': ['2']}, ['Foo.S01E01.720p.HDTV.x264-ASDF', 'Foo.S01E02.720p.HDTV.x264-ASDF'], True),
+        ({'1': ['2', '3']}, ['Foo.S01E02.720p.HDTV.x264-ASDF'], False),
+        ({'1': ['2', '3']}, ['Foo.S01E02.720p.HDTV.x264-ASDF', 'Foo.S01E03.720p.HDTV.x264-ASDF'], True),
+        ({'1': ['2'], '2': ['3']}, ['Foo.S01E02.720p.HDTV.x264-ASDF', 'Foo.S01E03.720p.HDTV.x264-ASDF'], False),
+        ({'1': ['2'], '2': ['3']}, ['Foo.S01E02.720p.HDTV.x264-ASDF', 'Foo.S02E03.720p.HDTV.x264-ASDF'], True),
+        ({'1': ['2'], '2': []}, ['Foo.S01E02.720p.HDTV.x264-ASDF', 'Foo.S02E03.720p.HDTV.x264-ASDF'], False),
+        ({'': ['3']}, ['Foo.S01E02.720p.HDTV.x264-ASDF'], False),
+        ({'': ['3']}, ['Foo.S05E03.720p.HDTV.x264-ASDF'], True),
+        ({'': ['3']}, ['Foo.E03.720p.HDTV.x264-ASDF'], True),
+    ),
+)
+def test_SceneQuery_has_all_episodes(episodes, results, exp_has_all_episodes):
+    query = find.SceneQuery('foo', group='ASDF', episodes=episodes)
+    assert query._has_all_episodes(results) is exp_has_all_episodes
+
+def test_SceneQuery_has_all_episodes_without_group():
+    query = find.SceneQuery('foo', episodes={'1': ['2']})
+    assert query._has_all_episodes(['Foo.S01E02.720p.HDTV.x264-ASDF']) is False
 
 
 @pytest.mark.parametrize(
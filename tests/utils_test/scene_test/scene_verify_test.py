@@ -1,5 +1,7 @@
+import asyncio
 import os
 import re
+import zlib
 from unittest.mock import AsyncMock, Mock, call
 
 import pytest
@@ -303,6 +305,67 @@ async def test_is_mixed_scene_release(directory_name, files, exp_return_value, s
     directory_path = str(tmp_path / directory_name)
     assert await verify.is_mixed_scene_release(directory_path) == exp_return_value
 
+@pytest.mark.asyncio
+async def test_is_mixed_scene_release_cancels_pending_searches_when_two_groups_are_found(tmp_path, mocker):
+    directory = tmp_path / 'Foo.S01.720p.HDTV.x264-MiXED'
+    directory.mkdir()
+    filenames = [
+        'Foo.S01E01.720p.HDTV.x264-AAA.mkv',
+        'Foo.S01E01.720p.HDTV.x264-AAA.sample.mkv',
+        'Foo.S01E02.720p.HDTV.x264-BBB.mkv',
+        'Foo.S01E03.720p.HDTV.x264-CCC.mkv',
+        'Foo.S01E04.720p.HDTV.x264.mkv',
+    ]
+    for filename in filenames:
+        (directory / filename).write_text('data')
+    cancelled = []
+
+    async def search(filepath):
+        name = os.path.basename(filepath)
+        if 'CCC' in name:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+        return [name[:-len('.mkv')]]
+
+    search_mock = mocker.patch('upsies.utils.scene.find.search', side_effect=search)
+    return_value = await asyncio.wait_for(verify.is_mixed_scene_release(str(directory)), timeout=5)
+    assert return_value is True
+    # Sample has the same query as its episode
+    assert sorted(os.path.basename(c.args[0]) for c in search_mock.call_args_list) == [
+        'Foo.S01E01.720p.HDTV.x264-AAA.mkv',
+        'Foo.S01E02.720p.HDTV.x264-BBB.mkv',
+        'Foo.S01E03.720p.HDTV.x264-CCC.mkv',
+        'Foo.S01E04.720p.HDTV.x264.mkv',
+    ]
+    await asyncio.sleep(0)
+    assert cancelled == ['Foo.S01E03.720p.HDTV.x264-CCC.mkv']
+
+@pytest.mark.asyncio
+async def test_is_mixed_scene_release_limits_concurrent_searches(tmp_path, mocker):
+    directory = tmp_path / 'Foo.S01.720p.HDTV.x264-AAA'
+    directory.mkdir()
+    for episode in range(1, 11):
+        (directory / f'Foo.S01E{episode:02d}.720p.HDTV.x264-AAA.mkv').write_text('data')
+    mocker.patch('upsies.utils.scene.find.max_concurrent_episode_searches', 3)
+    running = []
+    max_running = 0
+
+    async def search(filepath):
+        nonlocal max_running
+        running.append(filepath)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(filepath)
+        return ['Foo.S01E01.720p.HDTV.x264-AAA']
+
+    search_mock = mocker.patch('upsies.utils.scene.find.search', side_effect=search)
+    assert await verify.is_mixed_scene_release(str(directory)) is False
+    assert len(search_mock.call_args_list) == 10
+    assert max_running == 3
+
 
 @pytest.mark.parametrize(
     argnames='release_name, exp_return_value',
@@ -787,7 +850,7 @@ async def test_verify_release_gets_release_name(mocker):
     return_value = await verify.verify_release(content_path, release_name)
 
     assert return_value is _verify_release_mock.return_value
-    assert _verify_release_mock.call_args_list == [call(content_path, release_name)]
+    assert _verify_release_mock.call_args_list == [call(content_path, release_name, deep=False, progress_callback=None)]
     assert _verify_release_per_file_mock.call_args_list == []
 
 @pytest.mark.asyncio
@@ -830,10 +893,10 @@ async def test_verify_release_finds_valid_scene_release(mocker):
     assert return_value == (SceneCheckResult.true, ())
     assert search_mock.call_args_list == [call(content_path)]
     assert _verify_release_mock.call_args_list == [
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-CCC'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-DDD'),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-CCC', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-DDD', deep=False, progress_callback=None),
     ]
     assert _verify_release_per_file_mock.call_args_list == []
 
@@ -858,10 +921,10 @@ async def test_verify_release_finds_only_nonscene_releases(mocker):
     assert return_value is _verify_release_per_file_mock.return_value
     assert search_mock.call_args_list == [call(content_path)]
     assert _verify_release_mock.call_args_list == [
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB'),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB', deep=False, progress_callback=None),
     ]
-    assert _verify_release_per_file_mock.call_args_list == [call(content_path)]
+    assert _verify_release_per_file_mock.call_args_list == [call(content_path, deep=False, progress_callback=None)]
 
 @pytest.mark.asyncio
 async def test_verify_release_finds_only_scene_releases_with_exceptions(mocker):
@@ -887,11 +950,11 @@ async def test_verify_release_finds_only_scene_releases_with_exceptions(mocker):
     assert return_value == '_verify_release_per_file return value'
     assert search_mock.call_args_list == [call(content_path)]
     assert _verify_release_mock.call_args_list == [
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-CCC'),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-CCC', deep=False, progress_callback=None),
     ]
-    assert _verify_release_per_file_mock.call_args_list == [call(content_path)]
+    assert _verify_release_per_file_mock.call_args_list == [call(content_path, deep=False, progress_callback=None)]
 
 @pytest.mark.asyncio
 async def test_verify_release_finds_nothing(mocker):
@@ -916,10 +979,10 @@ async def test_verify_release_finds_nothing(mocker):
     assert return_value == '_verify_release_per_file return value'
     assert search_mock.call_args_list == [call(content_path)]
     assert _verify_release_mock.call_args_list == [
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA'),
-        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB'),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-AAA', deep=False, progress_callback=None),
+        call('mock/path/to/Mock.Release', 'The.Foo.2000.x264-BBB', deep=False, progress_callback=None),
     ]
-    assert _verify_release_per_file_mock.call_args_list == [call(content_path)]
+    assert _verify_release_per_file_mock.call_args_list == [call(content_path, deep=False, progress_callback=None)]
 
 
 @pytest.mark.parametrize(
@@ -938,7 +1001,7 @@ async def test_verify_release_finds_nothing(mocker):
                 ),
             },
             [call('foo.mkv'), call('bar.mp4')],
-            [call('foo.mkv', 'Foo-AAA'), call('foo.mkv', 'Foo-BBB'), call('bar.mp4', 'Bar-AAA')],
+            [call('foo.mkv', 'Foo-AAA', deep=False, progress_callback=None), call('foo.mkv', 'Foo-BBB', deep=False, progress_callback=None), call('bar.mp4', 'Bar-AAA', deep=False, progress_callback=None)],
             SceneCheckResult.true,
             (),
             id='Verification is stopped after first match is found',
@@ -957,7 +1020,7 @@ async def test_verify_release_finds_nothing(mocker):
                 ),
             },
             [call('foo.mkv'), call('bar.mp4')],
-            [call('foo.mkv', 'Foo-AAA'), call('foo.mkv', 'Foo-BBB'), call('bar.mp4', 'Bar-AAA')],
+            [call('foo.mkv', 'Foo-AAA', deep=False, progress_callback=None), call('foo.mkv', 'Foo-BBB', deep=False, progress_callback=None), call('bar.mp4', 'Bar-AAA', deep=False, progress_callback=None)],
             SceneCheckResult.unknown,
             (),
             id='One scene check is unknown',
@@ -975,7 +1038,7 @@ async def test_verify_release_finds_nothing(mocker):
                 ),
             },
             [call('foo.mkv'), call('bar.mp4')],
-            [call('foo.mkv', 'Foo-AAA'), call('foo.mkv', 'Foo-BBB'), call('bar.mp4', 'Bar-AAA'), call('bar.mp4', 'Bar-BBB')],
+            [call('foo.mkv', 'Foo-AAA', deep=False, progress_callback=None), call('foo.mkv', 'Foo-BBB', deep=False, progress_callback=None), call('bar.mp4', 'Bar-AAA', deep=False, progress_callback=None), call('bar.mp4', 'Bar-BBB', deep=False, progress_callback=None)],
             SceneCheckResult.false,
             (),
             id='All scene checks are false',
@@ -993,7 +1056,7 @@ async def test_verify_release_finds_nothing(mocker):
                 ),
             },
             [call('foo.mkv'), call('bar.mp4')],
-            [call('foo.mkv', 'Foo-AAA'), call('foo.mkv', 'Foo-BBB'), call('bar.mp4', 'Bar-AAA')],
+            [call('foo.mkv', 'Foo-AAA', deep=False, progress_callback=None), call('foo.mkv', 'Foo-BBB', deep=False, progress_callback=None), call('bar.mp4', 'Bar-AAA', deep=False, progress_callback=None)],
             SceneCheckResult.true,
             (errors.SceneError('foo!'),),
             id='One scene check returns exceptions',
@@ -1011,7 +1074,7 @@ async def test_verify_release_finds_nothing(mocker):
                 ),
             },
             [call('foo.mkv'), call('bar.mp4')],
-            [call('foo.mkv', 'Foo-AAA'), call('foo.mkv', 'Foo-BBB'), call('bar.mp4', 'Bar-AAA'), call('bar.mp4', 'Bar-BBB')],
+            [call('foo.mkv', 'Foo-AAA', deep=False, progress_callback=None), call('foo.mkv', 'Foo-BBB', deep=False, progress_callback=None), call('bar.mp4', 'Bar-AAA', deep=False, progress_callback=None), call('bar.mp4', 'Bar-BBB', deep=False, progress_callback=None)],
             SceneCheckResult.true,
             (errors.SceneError('foo!'), errors.SceneError('bar!'), ),
             id='Multiple scene checks return exceptions',
@@ -1049,6 +1112,67 @@ async def test__verify_release_per_file_verifies_each_search_result(
     assert _verify_release_mock.call_args_list == exp_verify_release_calls
 
 
+@pytest.mark.asyncio
+async def test__verify_release_per_file_verifies_files_concurrently(mocker):
+    mocker.patch.object(verify, 'max_concurrent_file_verifications', 3)
+    filepaths = [f'path/to/content/Foo.S01E{i:02d}.mkv' for i in range(1, 11)]
+    mocker.patch('upsies.utils.fs.file_list', Mock(return_value=filepaths))
+    running = 0
+    max_running = 0
+
+    async def search(filepath):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Finish in reverse order
+        await asyncio.sleep(0.001 * (20 - filepaths.index(filepath)))
+        running -= 1
+        return (f'{filepath}-AAA',)
+
+    async def _verify_release(filepath, release_name, deep=False, progress_callback=None):
+        if filepath.endswith('E03.mkv'):
+            return SceneCheckResult.true, (errors.SceneError(f'{filepath} is bad'),)
+        elif filepath.endswith('E07.mkv'):
+            return SceneCheckResult.true, (errors.SceneError(f'{filepath} is bad'),)
+        return SceneCheckResult.true, ()
+
+    mocker.patch('upsies.utils.scene.find.search', side_effect=search)
+    _verify_release_mock = mocker.patch('upsies.utils.scene.verify._verify_release', side_effect=_verify_release)
+
+    is_scene_release, exceptions = await verify._verify_release_per_file('path/to/content')
+    assert is_scene_release is SceneCheckResult.true
+    assert exceptions == (
+        errors.SceneError('path/to/content/Foo.S01E03.mkv is bad'),
+        errors.SceneError('path/to/content/Foo.S01E07.mkv is bad'),
+    )
+    assert max_running == 3
+    assert sorted(_verify_release_mock.call_args_list) == sorted(
+        call(filepath, f'{filepath}-AAA', deep=False, progress_callback=None) for filepath in filepaths
+    )
+
+@pytest.mark.asyncio
+async def test__verify_release_per_file_cancels_other_verifications_if_one_fails(mocker):
+    filepaths = ['path/to/content/Foo.S01E01.mkv', 'path/to/content/Foo.S01E02.mkv']
+    mocker.patch('upsies.utils.fs.file_list', Mock(return_value=filepaths))
+    cancelled = []
+
+    async def search(filepath):
+        if filepath.endswith('E01.mkv'):
+            raise errors.RequestError('foo is down')
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(filepath)
+            raise
+
+    mocker.patch('upsies.utils.scene.find.search', side_effect=search)
+    with pytest.raises(errors.RequestError, match=r'^foo is down$'):
+        await verify._verify_release_per_file('path/to/content')
+    await asyncio.sleep(0)
+    assert cancelled == ['path/to/content/Foo.S01E02.mkv']
+
+
+
 @pytest.mark.asyncio
 async def test__verify_release_gets_nonscene_release_name(mocker):
     is_scene_release_mock = mocker.patch('upsies.utils.scene.verify.is_scene_release', AsyncMock(
@@ -1127,3 +1251,82 @@ async def test__verify_release_gets_wrong_release_name_and_wrong_files(mocker):
     assert is_scene_release_mock.call_args_list == [call('Mock.Release')]
     assert verify_release_name_mock.call_args_list == [call('mock/path', 'Mock.Release')]
     assert verify_release_files_mock.call_args_list == [call('mock/path', 'Mock.Release')]
+
+@pytest.mark.parametrize(
+    argnames='exceptions, exp_checksums_verified',
+    argvalues=(
+        ((), True),
+        ((errors.SceneMissingInfoError('foo.nfo'),), True),
+        ((errors.SceneFileSizeError('foo', original_size=123, existing_size=456),), False),
+    ),
+    ids=lambda v: repr(v),
+)
+@pytest.mark.asyncio
+async def test__verify_release_verifies_checksums_if_deep(exceptions, exp_checksums_verified, mocker):
+    mocker.patch('upsies.utils.scene.verify.is_scene_release', AsyncMock(return_value=SceneCheckResult.true))
+    mocker.patch('upsies.utils.scene.verify.verify_release_name', AsyncMock())
+    mocker.patch('upsies.utils.scene.verify.verify_release_files', AsyncMock(return_value=exceptions))
+    checksum_error = errors.SceneFileChecksumError('foo', original_checksum='DEADBEEF', existing_checksum='C0FFEE00')
+    verify_release_checksums_mock = mocker.patch('upsies.utils.scene.verify.verify_release_checksums', AsyncMock(
+        return_value=(checksum_error,),
+    ))
+
+    is_scene, exceptions_ = await verify._verify_release('mock/path', 'Mock.Release')
+    assert is_scene is SceneCheckResult.true
+    assert exceptions_ == exceptions
+    assert verify_release_checksums_mock.call_args_list == []
+
+    is_scene, exceptions_ = await verify._verify_release('mock/path', 'Mock.Release', deep=True, progress_callback='mock cb')
+    assert is_scene is SceneCheckResult.true
+    if exp_checksums_verified:
+        assert exceptions_ == exceptions + (checksum_error,)
+        assert verify_release_checksums_mock.call_args_list == [
+            call('mock/path', 'Mock.Release', progress_callback='mock cb'),
+        ]
+    else:
+        assert exceptions_ == exceptions
+        assert verify_release_checksums_mock.call_args_list == []
+
+
+@pytest.mark.asyncio
+async def test_verify_release_checksums(tmp_path, mocker):
+    content_path = tmp_path / 'Foo.S01.720p.BluRay.x264-AAA'
+    content_path.mkdir()
+    (content_path / 'foo.s01e01.mkv').write_bytes(b'episode 1')
+    (content_path / 'foo.s01e02.mkv').write_bytes(b'episode 2')
+    (content_path / 'foo.s01e03.mkv').write_bytes(b'episode 3')
+    (content_path / 'foo.nfo').write_bytes(b'nfo')
+    mocker.patch('upsies.utils.scene.verify.release_files', AsyncMock(return_value={
+        'foo.s01e01.mkv': {'file_name': 'foo.s01e01.mkv', 'size': 9, 'crc': f'{zlib.crc32(b"episode 1"):08x}'},
+        'foo.s01e02.mkv': {'file_name': 'foo.s01e02.mkv', 'size': 9, 'crc': 'DEADBEEF'},
+        'foo.s01e03.mkv': {'file_name': 'foo.s01e03.mkv', 'size': 9},
+        'foo.s01e04.mkv': {'file_name': 'foo.s01e04.mkv', 'size': 9, 'crc': 'DEADBEEF'},
+    }))
+    crc32_mock = mocker.patch('upsies.utils.scene.checksum.crc32', AsyncMock(
+        side_effect=lambda filepath, progress_callback: f'{zlib.crc32(open(filepath, "rb").read()):08X}',
+    ))
+
+    exceptions = await verify.verify_release_checksums(str(content_path), 'Foo.S01.720p.BluRay.x264-AAA',
+                                                       progress_callback='mock cb')
+    assert exceptions == (
+        errors.SceneFileChecksumError(
+            'foo.s01e02.mkv',
+            original_checksum='DEADBEEF',
+            existing_checksum=f'{zlib.crc32(b"episode 2"):08X}',
+        ),
+    )
+    assert sorted(crc32_mock.call_args_list) == [
+        call(str(content_path / 'foo.s01e01.mkv'), progress_callback='mock cb'),
+        call(str(content_path / 'foo.s01e02.mkv'), progress_callback='mock cb'),
+    ]
+
+@pytest.mark.asyncio
+async def test_verify_release_checksums_reports_unreadable_file(tmp_path, mocker):
+    content_path = tmp_path / 'Foo.2000.720p.BluRay.x264-AAA.mkv'
+    content_path.write_bytes(b'movie')
+    mocker.patch('upsies.utils.scene.verify.release_files', AsyncMock(return_value={
+        'foo.mkv': {'file_name': 'foo.mkv', 'size': 5, 'crc': 'DEADBEEF'},
+    }))
+    mocker.patch('upsies.utils.scene.checksum.crc32', AsyncMock(side_effect=errors.ContentError('Permission denied')))
+    exceptions = await verify.verify_release_checksums(str(content_path), 'Foo.2000.720p.BluRay.x264-AAA')
+    assert exceptions == (errors.SceneError('Permission denied'),)
@@ -1,3 +1,6 @@
+import asyncio
+import sys
+import time
 from unittest.mock import call, patch
 
 import pytest
@@ -76,3 +79,92 @@ def test_run_joins_stdout_and_stderr_on_request(run_mock):
         stderr='Mocked STDOUT',
         stdin='Mocked PIPE',
     )]
+
+
+def python_cmd(code):
+    return (sys.executable, '-c', code)
+
+@pytest.fixture(autouse=True)
+def clear_command_output_cache(mocker):
+    mocker.patch.object(subproc, '_command_output_cache', {})
+
+
+@pytest.mark.asyncio
+async def test_run_async_returns_stdout():
+    stdout = await subproc.run_async(python_cmd('print("process output")'))
+    assert stdout == 'process output\n'
+
+@pytest.mark.asyncio
+async def test_run_async_raises_DependencyError_if_command_cannot_be_executed():
+    with pytest.raises(errors.DependencyError, match=r'^Missing dependency: no_such_command$'):
+        await subproc.run_async(['/no/such/path/no_such_command', 'bar', '--baz'])
+
+@pytest.mark.asyncio
+async def test_run_async_raises_ProcessError_if_stderr_is_truthy():
+    cmd = python_cmd('import sys ; print("process output") ; sys.stderr.write("something went wrong")')
+    with pytest.raises(errors.ProcessError, match=r'^something went wrong$'):
+        await subproc.run_async(cmd)
+
+@pytest.mark.asyncio
+async def test_run_async_ignores_stderr_on_request():
+    cmd = python_cmd('import sys ; print("process output") ; sys.stderr.write("something went wrong")')
+    stdout = await subproc.run_async(cmd, ignore_errors=True)
+    assert stdout == 'process output\n'
+
+@pytest.mark.asyncio
+async def test_run_async_joins_stdout_and_stderr_on_request():
+    cmd = python_cmd('import sys ; sys.stderr.write("err") ; sys.stderr.flush() ; sys.stdout.write("out")')
+    stdout = await subproc.run_async(cmd, join_stderr=True)
+    assert stdout == 'errout'
+
+@pytest.mark.asyncio
+async def test_run_async_caches_stdout_on_request(mocker):
+    create_subprocess_exec_spy = mocker.spy(asyncio, 'create_subprocess_exec')
+    cmd = python_cmd('print("process output")')
+    for _ in range(3):
+        assert await subproc.run_async(cmd, cache=True) == 'process output\n'
+    assert len(create_subprocess_exec_spy.call_args_list) == 1
+    assert subproc.run(cmd, cache=True) == 'process output\n'
+    assert len(create_subprocess_exec_spy.call_args_list) == 1
+
+@pytest.mark.asyncio
+async def test_run_async_kills_process_after_timeout():
+    cmd = python_cmd('import time ; time.sleep(10)')
+    start = time.monotonic()
+    with pytest.raises(errors.ProcessError, match=rf'^Timeout after 0.1 seconds: {sys.executable.rsplit("/", 1)[-1]}$'):
+        await subproc.run_async(cmd, timeout=0.1)
+    assert time.monotonic() - start < 5
+
+@pytest.mark.asyncio
+async def test_run_async_kills_process_when_cancelled(mocker):
+    create_subprocess_exec_spy = mocker.spy(asyncio, 'create_subprocess_exec')
+    task = asyncio.ensure_future(subproc.run_async(python_cmd('import time ; time.sleep(10)')))
+    while not create_subprocess_exec_spy.spy_return:
+        await asyncio.sleep(0.01)
+    proc = create_subprocess_exec_spy.spy_return
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert proc.returncode is not None
+
+@pytest.mark.asyncio
+async def test_run_async_limits_concurrent_processes(mocker):
+    mocker.patch.object(subproc, 'max_concurrent_processes', 2)
+    running = 0
+    max_running = 0
+    communicate = subproc._communicate
+
+    async def mock_communicate(*args, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        try:
+            return await communicate(*args, **kwargs)
+        finally:
+            running -= 1
+
+    mocker.patch.object(subproc, '_communicate', mock_communicate)
+    cmds = [python_cmd(f'import time ; time.sleep(0.1) ; print({i})') for i in range(5)]
+    stdouts = await asyncio.gather(*(subproc.run_async(cmd) for cmd in cmds))
+    assert stdouts == [f'{i}\n' for i in range(5)]
+    assert max_running == 2
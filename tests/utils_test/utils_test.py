@@ -1,9 +1,12 @@
+import asyncio
+import enum
 import re
+import time
 from unittest.mock import AsyncMock, Mock, call
 
 import pytest
 
-from upsies import utils
+from upsies import errors, utils
 
 
 def test_cached_property_caches_return_value_of_decorated_function():
@@ -73,6 +76,160 @@ async def test_asyncmemoize_caches_return_values():
             call.a('x', 'y', 'z'),
         ]
 
+@pytest.mark.asyncio
+async def test_asyncmemoize_does_not_cache_RequestError():
+    func = AsyncMock(side_effect=(errors.RequestError('Connection refused'), 'result'))
+    memoized = utils.asyncmemoize(func)
+    with pytest.raises(errors.RequestError, match=r'^Connection refused$'):
+        await memoized('foo')
+    for _ in range(3):
+        assert await memoized('foo') == 'result'
+    assert func.call_args_list == [call('foo'), call('foo')]
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_with_key(mocker):
+    func = AsyncMock(side_effect=lambda arg: f'result: {arg}')
+    memoized = utils.asyncmemoize(key=lambda arg: arg.strip().casefold())(func)
+    assert await memoized('Foo') == 'result: Foo'
+    assert await memoized(' foo ') == 'result: Foo'
+    assert await memoized('bar') == 'result: bar'
+    assert func.call_args_list == [call('Foo'), call('bar')]
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_with_ttl(mocker):
+    time_mock = mocker.patch('time.time', return_value=1000)
+    func = AsyncMock(side_effect=('result 1', ValueError('error 2'), 'result 3'))
+    memoized = utils.asyncmemoize(ttl=10)(func)
+    assert await memoized('foo') == 'result 1'
+    time_mock.return_value = 1010
+    assert await memoized('foo') == 'result 1'
+    time_mock.return_value = 1010.1
+    with pytest.raises(ValueError, match=r'^error 2$'):
+        await memoized('foo')
+    time_mock.return_value = 1020
+    with pytest.raises(ValueError, match=r'^error 2$'):
+        await memoized('foo')
+    time_mock.return_value = 1020.2
+    assert await memoized('foo') == 'result 3'
+    assert len(func.call_args_list) == 3
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_with_empty_ttl(mocker):
+    time_mock = mocker.patch('time.time', return_value=1000)
+    func = AsyncMock(side_effect=([], ['result 2'], ['result 3']))
+    memoized = utils.asyncmemoize(ttl=100, empty_ttl=10)(func)
+    assert await memoized('foo') == []
+    time_mock.return_value = 1010
+    assert await memoized('foo') == []
+    time_mock.return_value = 1010.1
+    assert await memoized('foo') == ['result 2']
+    time_mock.return_value = 1110.1
+    assert await memoized('foo') == ['result 2']
+    assert len(func.call_args_list) == 2
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_persistent_does_not_store_empty_values_with_empty_ttl(tmp_path, mocker):
+    mocker.patch.object(utils, 'memoize_cache_directory', str(tmp_path / 'memoized'))
+    results = {'foo': [], 'bar': {}, 'baz': ['result']}
+
+    async def func(arg):
+        return results[arg]
+
+    memoized = utils.asyncmemoize(ttl=100, empty_ttl=10, persistent=True)(func)
+    assert await memoized('foo') == []
+    assert await memoized('bar') == {}
+    assert not (tmp_path / 'memoized').exists() or tuple((tmp_path / 'memoized').iterdir()) == ()
+    assert await memoized('baz') == ['result']
+    assert len(tuple((tmp_path / 'memoized').iterdir())) == 1
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_persistent_stores_empty_values_without_empty_ttl(tmp_path, mocker):
+    mocker.patch.object(utils, 'memoize_cache_directory', str(tmp_path / 'memoized'))
+    async def func(arg):
+        return []
+
+    memoized = utils.asyncmemoize(ttl=100, persistent=True)(func)
+    assert await memoized('foo') == []
+    assert len(tuple((tmp_path / 'memoized').iterdir())) == 1
+
+
+class Color(enum.Enum):
+    red = 'red'
+    blue = 'blue'
+
+async def persistent_func(arg):
+    persistent_func.calls.append(arg)
+    return {'arg': arg, 'color': Color.red, 'colors': [Color.blue]}
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_persistent(tmp_path, mocker):
+    mocker.patch.object(utils, 'memoize_cache_directory', str(tmp_path / 'memoized'))
+    mocker.patch.object(persistent_func, 'calls', [], create=True)
+    exp_result = {'arg': 'foo', 'color': Color.red, 'colors': [Color.blue]}
+
+    memoized = utils.asyncmemoize(ttl=60, persistent=True)(persistent_func)
+    assert await memoized('foo') == exp_result
+    cache_file, = (tmp_path / 'memoized').iterdir()
+    assert cache_file.name.startswith(f'{__name__}.persistent_func.')
+
+    # New session
+    memoized = utils.asyncmemoize(ttl=60, persistent=True)(persistent_func)
+    assert await memoized('foo') == exp_result
+    assert persistent_func.calls == ['foo']
+
+    # Expired
+    mocker.patch('time.time', return_value=time.time() + 61)
+    memoized = utils.asyncmemoize(ttl=60, persistent=True)(persistent_func)
+    assert await memoized('foo') == exp_result
+    assert persistent_func.calls == ['foo', 'foo']
+
+    memoized.clear_cache()
+    assert tuple((tmp_path / 'memoized').iterdir()) == ()
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_persistent_ignores_unserializable_values(tmp_path, mocker):
+    mocker.patch.object(utils, 'memoize_cache_directory', str(tmp_path / 'memoized'))
+    func = AsyncMock(return_value=object())
+    func.__module__ = 'mock_module'
+    func.__qualname__ = 'mock_func'
+    memoized = utils.asyncmemoize(persistent=True)(func)
+    result = await memoized('foo')
+    assert await memoized('foo') is result
+    assert len(func.call_args_list) == 1
+    assert not (tmp_path / 'memoized').exists() or tuple((tmp_path / 'memoized').iterdir()) == ()
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_persistent_ignores_invalid_cache_file(tmp_path, mocker):
+    mocker.patch.object(utils, 'memoize_cache_directory', str(tmp_path / 'memoized'))
+    mocker.patch.object(persistent_func, 'calls', [], create=True)
+    memoized = utils.asyncmemoize(persistent=True)(persistent_func)
+    await memoized('foo')
+    cache_file, = (tmp_path / 'memoized').iterdir()
+    cache_file.write_text('{"expires": "never"')
+
+    memoized = utils.asyncmemoize(persistent=True)(persistent_func)
+    assert await memoized('foo') == {'arg': 'foo', 'color': Color.red, 'colors': [Color.blue]}
+    assert persistent_func.calls == ['foo', 'foo']
+
+@pytest.mark.asyncio
+async def test_asyncmemoize_does_not_cache_cancellation():
+    calls = []
+
+    async def func(arg):
+        calls.append(arg)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return f'result: {arg}'
+
+    memoized = utils.asyncmemoize(func)
+    task = asyncio.ensure_future(memoized('foo'))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await memoized('foo') == 'result: foo'
+    assert calls == ['foo', 'foo']
+
 @pytest.mark.asyncio
 async def test_asyncmemoize_clear_cache():
     def a(*args, **kwargs):
@@ -202,6 +359,170 @@ def test_asyncmemoize_properly_wraps_function():
     assert a_memoized.__wrapped__ is a
 
 
+def test_LRUCache_get_and_set():
+    cache = utils.LRUCache(maxsize=3)
+    assert cache.get('foo') is None
+    assert cache.get('foo', 'default') == 'default'
+    cache['foo'] = 'bar'
+    assert cache.get('foo') == 'bar'
+    assert cache['foo'] == 'bar'
+    with pytest.raises(KeyError, match=r"^'baz'$"):
+        cache['baz']
+    assert len(cache) == 1
+    assert cache.info() == utils.LRUCache.CacheInfo(hits=2, misses=3, maxsize=3, currsize=1)
+
+def test_LRUCache_removes_least_recently_used_item():
+    cache = utils.LRUCache(maxsize=3)
+    for key in ('a', 'b', 'c'):
+        cache[key] = key.upper()
+    assert cache['a'] == 'A'
+    cache['d'] = 'D'
+    assert len(cache) == 3
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in ('a', 'c', 'd')] == ['A', 'C', 'D']
+
+def test_LRUCache_without_maxsize():
+    cache = utils.LRUCache(maxsize=None)
+    for i in range(1000):
+        cache[i] = i
+    assert len(cache) == 1000
+
+def test_LRUCache_expires_items(mocker):
+    monotonic_mock = mocker.patch('time.monotonic', return_value=100)
+    cache = utils.LRUCache(ttl=10)
+    cache['foo'] = 'bar'
+    monotonic_mock.return_value = 110
+    assert cache.get('foo') == 'bar'
+    monotonic_mock.return_value = 110.1
+    assert cache.get('foo') is None
+    assert len(cache) == 0
+
+def test_LRUCache_discards_items_with_different_signature():
+    cache = utils.LRUCache()
+    cache.set('foo', 'bar', signature=(1, 2))
+    assert cache.get('foo', signature=(1, 2)) == 'bar'
+    assert cache.get('foo', signature=(1, 3)) is None
+    assert cache.get('foo', signature=(1, 2)) is None
+
+def test_LRUCache_removes_least_recently_used_items_if_maxbytes_is_exceeded():
+    cache = utils.LRUCache(maxsize=None, maxbytes=100)
+    cache.set('a', 'A', nbytes=40)
+    cache.set('b', 'B', nbytes=40)
+    assert cache['a'] == 'A'
+    cache.set('c', 'C', nbytes=30)
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in ('a', 'c')] == ['A', 'C']
+    assert cache.info().currbytes == 70
+
+def test_LRUCache_replaces_item_size():
+    cache = utils.LRUCache(maxbytes=100)
+    cache.set('a', 'A', nbytes=60)
+    cache.set('a', 'AA', nbytes=90)
+    assert cache['a'] == 'AA'
+    assert cache.info().currbytes == 90
+
+def test_LRUCache_does_not_keep_item_that_exceeds_maxbytes():
+    cache = utils.LRUCache(maxbytes=100)
+    cache.set('a', 'A', nbytes=10)
+    cache.set('b', 'B', nbytes=101)
+    assert len(cache) == 0
+    assert cache.info().currbytes == 0
+
+def test_LRUCache_releases_bytes_of_stale_items():
+    cache = utils.LRUCache(maxbytes=100)
+    cache.set('a', 'A', signature=1, nbytes=50)
+    assert cache.get('a', signature=2) is None
+    assert cache.info().currbytes == 0
+
+def test_LRUCache_clear():
+    cache = utils.LRUCache()
+    cache['foo'] = 'bar'
+    cache.get('foo')
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.info() == utils.LRUCache.CacheInfo(hits=0, misses=0, maxsize=128, currsize=0, currbytes=0)
+
+
+def test_memoize_caches_return_values():
+    a_mock = Mock(side_effect=lambda *args, **kwargs: f'a({args}, {kwargs})')
+    a_memoized = utils.memoize()(a_mock)
+    for _ in range(3):
+        assert a_memoized('foo', bar='baz') == "a(('foo',), {'bar': 'baz'})"
+        assert a_memoized('foo') == "a(('foo',), {})"
+    assert a_mock.call_args_list == [call('foo', bar='baz'), call('foo')]
+    assert a_memoized.cache_info() == utils.LRUCache.CacheInfo(hits=4, misses=2, maxsize=128, currsize=2)
+    a_memoized.cache_clear()
+    assert a_memoized('foo') == "a(('foo',), {})"
+    assert a_mock.call_args_list == [call('foo', bar='baz'), call('foo'), call('foo')]
+
+def test_memoize_is_bounded():
+    a_mock = Mock(side_effect=lambda x: x * 2)
+    a_memoized = utils.memoize(maxsize=2)(a_mock)
+    assert [a_memoized(x) for x in (1, 2, 3, 1)] == [2, 4, 6, 2]
+    assert a_mock.call_args_list == [call(1), call(2), call(3), call(1)]
+    assert a_memoized.cache_info().currsize == 2
+
+def test_memoize_does_not_cache_exceptions():
+    a_mock = Mock(side_effect=(ValueError('nope'), 'yes'))
+    a_memoized = utils.memoize()(a_mock)
+    with pytest.raises(ValueError, match=r'^nope$'):
+        a_memoized('foo')
+    assert a_memoized('foo') == 'yes'
+    assert a_memoized('foo') == 'yes'
+    assert a_mock.call_args_list == [call('foo'), call('foo')]
+
+def test_memoize_discards_return_value_if_file_changes(tmp_path):
+    file1 = tmp_path / 'file1'
+    file2 = tmp_path / 'file2'
+    file1.write_text('foo')
+    a_mock = Mock(side_effect=lambda path, paths, other: 'result')
+    a_memoized = utils.memoize(stat_args=(0, 1))(a_mock)
+    for _ in range(3):
+        a_memoized(str(file1), (str(file1), str(file2)), str(file2))
+    assert len(a_mock.call_args_list) == 1
+
+    # Modified file
+    file1.write_text('foo!')
+    a_memoized(str(file1), (str(file1), str(file2)), str(file2))
+    a_memoized(str(file1), (str(file1), str(file2)), str(file2))
+    assert len(a_mock.call_args_list) == 2
+
+    # Created file in sequence argument
+    file2.write_text('bar')
+    a_memoized(str(file1), (str(file1), str(file2)), str(file2))
+    a_memoized(str(file1), (str(file1), str(file2)), str(file2))
+    assert len(a_mock.call_args_list) == 3
+
+    # Argument that is not in stat_args
+    other = tmp_path / 'other'
+    other.write_text('baz')
+    a_memoized(str(file1), (str(file1), str(file2)), str(other))
+    other.write_text('baz!')
+    a_memoized(str(file1), (str(file1), str(file2)), str(other))
+    assert len(a_mock.call_args_list) == 4
+
+def test_memoize_expires_return_values(mocker):
+    monotonic_mock = mocker.patch('time.monotonic', return_value=100)
+    a_mock = Mock(return_value='result')
+    a_memoized = utils.memoize(ttl=60)(a_mock)
+    a_memoized('foo')
+    monotonic_mock.return_value = 160
+    a_memoized('foo')
+    assert len(a_mock.call_args_list) == 1
+    monotonic_mock.return_value = 161
+    a_memoized('foo')
+    assert len(a_mock.call_args_list) == 2
+
+def test_memoize_properly_wraps_function():
+    def a(*args, **kwargs):
+        """This is a()"""
+
+    a_memoized = utils.memoize()(a)
+    assert a_memoized.__name__ is a.__name__
+    assert a_memoized.__doc__ is a.__doc__
+    assert a_memoized.__wrapped__ is a
+
+
 def test_asyncontextmanager():
     import sys
 
@@ -1,12 +1,13 @@
+import json
 import os
 import random
 import re
-from unittest.mock import call, patch
+from unittest.mock import AsyncMock, call, patch
 
 import pytest
 
 from upsies import constants, errors
-from upsies.utils import video
+from upsies.utils import image, video
 
 
 def test_run_mediainfo_gets_unreadable_file(mocker):
@@ -66,6 +67,142 @@ def test_run_mediainfo_does_not_catch_ProcessError(mocker):
     ]
 
 
+def test_run_mediainfo_stores_output_in_probe_cache(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='mediainfo id')
+    run_mock = mocker.patch('upsies.utils.subproc.run', side_effect=('text output', 'json output'))
+    for _ in range(3):
+        assert video._run_mediainfo(str(video_file)) == 'text output'
+        assert video._run_mediainfo(str(video_file), '--Output=JSON') == 'json output'
+    assert run_mock.call_args_list == [
+        call((video._mediainfo_executable, str(video_file)), cache=True),
+        call((video._mediainfo_executable, str(video_file), '--Output=JSON'), cache=True),
+    ]
+
+def test_run_mediainfo_ignores_probe_cache_if_video_file_changed(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='mediainfo id')
+    run_mock = mocker.patch('upsies.utils.subproc.run', side_effect=('old output', 'new output'))
+    assert video._run_mediainfo(str(video_file)) == 'old output'
+    video_file.write_bytes(b'new video data')
+    assert video._run_mediainfo(str(video_file)) == 'new output'
+    assert len(run_mock.call_args_list) == 2
+
+def test_run_mediainfo_ignores_probe_cache_if_mediainfo_changed(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', side_effect=('old id', 'old id', 'new id', 'new id'))
+    run_mock = mocker.patch('upsies.utils.subproc.run', side_effect=('old output', 'new output'))
+    assert video._run_mediainfo(str(video_file)) == 'old output'
+    assert video._run_mediainfo(str(video_file)) == 'new output'
+    assert len(run_mock.call_args_list) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_mediainfo_async_gets_unreadable_file(mocker):
+    run_async_mock = mocker.patch('upsies.utils.subproc.run_async', AsyncMock())
+    mocker.patch('upsies.utils.fs.assert_file_readable', side_effect=errors.ContentError("Can't read this, yo"))
+    with pytest.raises(errors.ContentError, match=r"^Can't read this, yo$"):
+        await video._run_mediainfo_async('some/path')
+    assert run_async_mock.call_args_list == []
+
+@pytest.mark.asyncio
+async def test_run_mediainfo_async_catches_DependencyError(mocker):
+    mocker.patch('upsies.utils.subproc.run_async', AsyncMock(
+        side_effect=errors.DependencyError('Missing dependency: your mom'),
+    ))
+    mocker.patch('upsies.utils.fs.assert_file_readable')
+    with pytest.raises(errors.ContentError, match=r'^Missing dependency: your mom$'):
+        await video._run_mediainfo_async('some/path')
+
+@pytest.mark.asyncio
+async def test_run_mediainfo_async_shares_caches_with_run_mediainfo(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='mediainfo id')
+    run_async_mock = mocker.patch('upsies.utils.subproc.run_async', AsyncMock(return_value='json output'))
+    run_mock = mocker.patch('upsies.utils.subproc.run')
+    for _ in range(3):
+        assert await video._run_mediainfo_async(str(video_file), '--Output=JSON') == 'json output'
+        assert video._run_mediainfo(str(video_file), '--Output=JSON') == 'json output'
+    assert run_async_mock.call_args_list == [
+        call((video._mediainfo_executable, str(video_file), '--Output=JSON'),
+             cache=True, timeout=video._probe_timeout),
+    ]
+    assert run_mock.call_args_list == []
+
+
+def test_probe_cache_without_executable(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value=None)
+    video._write_probe_cache(str(video_file), 'foo', 'bar', 'baz')
+    assert video._read_probe_cache(str(video_file), 'foo', 'bar') is None
+
+def test_probe_cache_with_nonexisting_video_file(mocker, tmp_path, video_cache_directory):
+    mocker.patch('upsies.utils.video._executable_id', return_value='foo id')
+    video._write_probe_cache(str(tmp_path / 'foo.mkv'), 'foo', 'bar', 'baz')
+    assert video._read_probe_cache(str(tmp_path / 'foo.mkv'), 'foo', 'bar') is None
+    assert os.listdir(video_cache_directory) == []
+
+def test_probe_cache_with_corrupt_cache_file(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='foo id')
+    video._write_probe_cache(str(video_file), 'foo', 'bar', 'baz')
+    assert video._read_probe_cache(str(video_file), 'foo', 'bar') == 'baz'
+    with open(video._probe_cache_file(str(video_file)), 'w') as f:
+        f.write('{not json')
+    # Read from disk by new process
+    video._probe_caches.clear()
+    assert video._read_probe_cache(str(video_file), 'foo', 'bar') is None
+    video._write_probe_cache(str(video_file), 'foo', 'bar', 'baz')
+    assert video._read_probe_cache(str(video_file), 'foo', 'bar') == 'baz'
+
+def test_probe_cache_reads_cache_file_only_once(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='foo id')
+    video._write_probe_cache(str(video_file), 'foo', 'bar', 'baz')
+    video._probe_caches.clear()
+    open_spy = mocker.patch('builtins.open', side_effect=open)
+    for _ in range(3):
+        assert video._read_probe_cache(str(video_file), 'foo', 'bar') == 'baz'
+    assert open_spy.call_args_list == [call(video._probe_cache_file(str(video_file)), 'r')]
+
+    # Modified video file gets a new cache file
+    video_file.write_bytes(b'more video data')
+    assert video._read_probe_cache(str(video_file), 'foo', 'bar') is None
+    assert len(open_spy.call_args_list) == 2
+
+def test_probe_cache_ignores_directories(mocker, tmp_path, video_cache_directory):
+    (tmp_path / 'BDMV').mkdir()
+    mocker.patch('upsies.utils.video._executable_id', return_value='foo id')
+    video._write_probe_cache(str(tmp_path), 'foo', 'bar', 'baz')
+    assert video._read_probe_cache(str(tmp_path), 'foo', 'bar') is None
+    assert os.listdir(video_cache_directory) == []
+
+def test_probe_cache_removes_temporary_file_if_writing_fails(mocker, tmp_path, video_cache_directory):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='foo id')
+    video._write_probe_cache(str(video_file), 'foo', 'bar', object())
+    assert video._read_probe_cache(str(video_file), 'foo', 'bar') is None
+    assert os.listdir(video_cache_directory) == []
+
+def test_executable_id(mocker, tmp_path):
+    executable = tmp_path / 'foo'
+    executable.write_text('#!/bin/sh')
+    mocker.patch('shutil.which', return_value=str(executable))
+    video._executable_id.cache_clear()
+    try:
+        assert video._executable_id('foo') == video._file_id(str(executable))
+    finally:
+        video._executable_id.cache_clear()
+
+
 @patch('upsies.utils.video._run_mediainfo')
 @patch('upsies.utils.video.first_video')
 def test_mediainfo_gets_first_video_from_path(first_video_mock, run_mediainfo_mock):
@@ -129,14 +266,40 @@ def test_duration_with_default_value(path_exists, duration, default, exp_return_
     else:
         assert video.duration(path, default=default) == exp_return_value
 
-def test_duration_gets_duration_from_ffprobe(mocker):
+def test_duration_gets_duration_from_container_header(mocker):
+    container_duration_mock = mocker.patch('upsies.utils.container.duration', return_value=789.0)
     duration_from_ffprobe_mock = mocker.patch('upsies.utils.video._duration_from_ffprobe', return_value=123.0)
     duration_from_mediainfo_mock = mocker.patch('upsies.utils.video._duration_from_mediainfo', return_value=456.0)
     first_video_mock = mocker.patch('upsies.utils.video.first_video', return_value='some/path/to/foo.mkv')
+    assert video.duration('some/path') == 789.0
+    assert container_duration_mock.call_args_list == [call(first_video_mock.return_value)]
+    assert duration_from_mediainfo_mock.call_args_list == []
+    assert duration_from_ffprobe_mock.call_args_list == []
+
+def test_duration_gets_duration_from_mediainfo(mocker):
+    duration_from_ffprobe_mock = mocker.patch('upsies.utils.video._duration_from_ffprobe', return_value=123.0)
+    duration_from_mediainfo_mock = mocker.patch('upsies.utils.video._duration_from_mediainfo', return_value=456.0)
+    first_video_mock = mocker.patch('upsies.utils.video.first_video', return_value='some/path/to/foo.mkv')
+    assert video.duration('some/path') == 456.0
+    assert first_video_mock.call_args_list == [call('some/path')]
+    assert duration_from_mediainfo_mock.call_args_list == [call(first_video_mock.return_value)]
+    assert duration_from_ffprobe_mock.call_args_list == []
+
+@pytest.mark.parametrize(
+    argnames='mediainfo_exception',
+    argvalues=(
+        RuntimeError('foo'),
+        errors.ContentError('bar'),
+    ),
+)
+def test_duration_gets_duration_from_ffprobe(mediainfo_exception, mocker):
+    duration_from_ffprobe_mock = mocker.patch('upsies.utils.video._duration_from_ffprobe', return_value=123.0)
+    duration_from_mediainfo_mock = mocker.patch('upsies.utils.video._duration_from_mediainfo', side_effect=mediainfo_exception)
+    first_video_mock = mocker.patch('upsies.utils.video.first_video', return_value='some/path/to/foo.mkv')
     assert video.duration('some/path') == 123.0
     assert first_video_mock.call_args_list == [call('some/path')]
+    assert duration_from_mediainfo_mock.call_args_list == [call(first_video_mock.return_value)]
     assert duration_from_ffprobe_mock.call_args_list == [call(first_video_mock.return_value)]
-    assert duration_from_mediainfo_mock.call_args_list == []
 
 @pytest.mark.parametrize(
     argnames='ffprobe_exception',
@@ -146,14 +309,49 @@ def test_duration_gets_duration_from_ffprobe(mocker):
         errors.ProcessError('baz'),
     ),
 )
-def test_duration_gets_duration_from_mediainfo(ffprobe_exception, mocker):
+def test_duration_raises_mediainfo_exception_if_ffprobe_fails(ffprobe_exception, mocker):
     duration_from_ffprobe_mock = mocker.patch('upsies.utils.video._duration_from_ffprobe', side_effect=ffprobe_exception)
-    duration_from_mediainfo_mock = mocker.patch('upsies.utils.video._duration_from_mediainfo', return_value=456.0)
+    duration_from_mediainfo_mock = mocker.patch('upsies.utils.video._duration_from_mediainfo',
+                                                side_effect=errors.ContentError('Missing dependency: mediainfo'))
     first_video_mock = mocker.patch('upsies.utils.video.first_video', return_value='some/path/to/foo.mkv')
-    assert video.duration('some/path') == 456.0
-    assert first_video_mock.call_args_list == [call('some/path')]
-    assert duration_from_ffprobe_mock.call_args_list == [call(first_video_mock.return_value)]
+    with pytest.raises(errors.ContentError, match=r'^Missing dependency: mediainfo$'):
+        video.duration('some/path')
     assert duration_from_mediainfo_mock.call_args_list == [call(first_video_mock.return_value)]
+    assert duration_from_ffprobe_mock.call_args_list == [call(first_video_mock.return_value)]
+
+
+def test_all_accessors_share_one_mediainfo_call(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mediainfo_json = json.dumps({'media': {'track': [
+        {'@type': 'General', 'Duration': '5432.1'},
+        {'@type': 'Video', 'Width': '1920', 'Height': '1080', 'FrameRate': '23.976', 'BitDepth': '10',
+         'HDR_Format': 'SMPTE ST 2086', 'HDR_Format_Compatibility': 'HDR10'},
+        {'@type': 'Audio', 'Format': 'AC-3', 'Channels': '6', 'Language': 'en'},
+        {'@type': 'Audio', 'Format': 'AAC', 'Channels': '2', 'Title': 'Commentary'},
+    ]}})
+    run_mock = mocker.patch('upsies.utils.subproc.run', return_value=mediainfo_json)
+    mocker.patch('upsies.utils.video._executable_id', return_value=None)
+    video._tracks.cache_clear()
+    try:
+        path = str(video_file)
+        assert video.duration(path) == 5432.1
+        assert video.width(path) == 1920
+        assert video.height(path) == 1080
+        assert video.resolution(path) == '1080p'
+        assert video.frame_rate(path) == 23.976
+        assert video.bit_depth(path) == 10
+        assert video.hdr_format(path) == 'HDR10'
+        assert video.audio_format(path) == 'AC-3'
+        assert video.audio_channels(path) == '5.1'
+        assert video.has_commentary(path) is True
+        assert video.has_dual_audio(path) is False
+        assert video.tracks(path)['General'][0]['Duration'] == '5432.1'
+    finally:
+        video._tracks.cache_clear()
+    assert run_mock.call_args_list == [
+        call((video._mediainfo_executable, path, '--Output=JSON'), cache=True),
+    ]
 
 
 def test_duration_from_ffprobe_succeeds(mocker):
@@ -169,6 +367,15 @@ def test_duration_from_ffprobe_succeeds(mocker):
         ignore_errors=True,
     )]
 
+def test_duration_from_ffprobe_stores_duration_in_probe_cache(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch('upsies.utils.video._executable_id', return_value='ffprobe id')
+    run_mock = mocker.patch('upsies.utils.subproc.run', return_value='123.4\n')
+    assert video._duration_from_ffprobe(str(video_file)) == 123.4
+    assert video._duration_from_ffprobe(str(video_file)) == 123.4
+    assert len(run_mock.call_args_list) == 1
+
 def test_duration_from_ffprobe_fails(mocker):
     make_ffmpeg_input_mock = mocker.patch('upsies.utils.video.make_ffmpeg_input', return_value='path/to/foo.mkv')
     run_mock = mocker.patch('upsies.utils.subproc.run', return_value='arf!')
@@ -214,6 +421,125 @@ def test_duration_from_mediainfo_fails(track, mocker):
     assert tracks_mock.call_args_list == [call('some/path')]
 
 
+def test_keyframes_creates_and_reads_cache_file(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch.object(video, 'cache_directory', str(tmp_path / 'cache'))
+    mocker.patch('upsies.utils.video.first_video', return_value=str(video_file))
+    keyframes_from_ffprobe_mock = mocker.patch('upsies.utils.video._keyframes_from_ffprobe',
+                                               return_value=(0.0, 4.2, 10.5))
+    assert video.keyframes('foo') == (0.0, 4.2, 10.5)
+    assert video.keyframes('foo') == (0.0, 4.2, 10.5)
+    assert keyframes_from_ffprobe_mock.call_args_list == [call(str(video_file))]
+    assert os.listdir(tmp_path / 'cache') == [os.path.basename(video._keyframes_cache_file(str(video_file)))]
+
+def test_keyframes_cache_is_invalidated_when_video_changes(mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocker.patch.object(video, 'cache_directory', str(tmp_path / 'cache'))
+    mocker.patch('upsies.utils.video.first_video', return_value=str(video_file))
+    keyframes_from_ffprobe_mock = mocker.patch('upsies.utils.video._keyframes_from_ffprobe',
+                                               side_effect=((0.0, 4.2), (0.0, 3.1)))
+    assert video.keyframes('foo') == (0.0, 4.2)
+    video_file.write_bytes(b'different video data')
+    assert video.keyframes('foo') == (0.0, 3.1)
+    assert keyframes_from_ffprobe_mock.call_args_list == [call(str(video_file)), call(str(video_file))]
+
+def test_keyframes_are_not_cached_for_directories(mocker, tmp_path, video_cache_directory):
+    (tmp_path / 'BDMV').mkdir()
+    mocker.patch('upsies.utils.video.first_video', return_value=str(tmp_path))
+    keyframes_from_ffprobe_mock = mocker.patch('upsies.utils.video._keyframes_from_ffprobe',
+                                               return_value=(0.0, 4.2))
+    assert video.keyframes('foo') == (0.0, 4.2)
+    assert video.keyframes('foo') == (0.0, 4.2)
+    assert keyframes_from_ffprobe_mock.call_args_list == [call(str(tmp_path)), call(str(tmp_path))]
+    assert os.listdir(video_cache_directory) == []
+
+def test_keyframes_cache_file_reports_stat_error(mocker, tmp_path):
+    mocker.patch('os.stat', side_effect=PermissionError(13, 'Permission denied'))
+    with pytest.raises(errors.ContentError, match=rf'^{re.escape(str(tmp_path / "foo.mkv"))}: Permission denied$'):
+        video._keyframes_cache_file(str(tmp_path / 'foo.mkv'))
+
+def test_keyframes_cache_file_with_nonexisting_video_file(tmp_path):
+    with pytest.raises(errors.ContentError, match=rf'^{re.escape(str(tmp_path / "foo.mkv"))}: No such file or directory$'):
+        video._keyframes_cache_file(str(tmp_path / 'foo.mkv'))
+
+def test_keyframes_from_ffprobe_succeeds(mocker):
+    make_ffmpeg_input_mock = mocker.patch('upsies.utils.video.make_ffmpeg_input', return_value='path/to/foo.mkv')
+    run_mock = mocker.patch('upsies.utils.subproc.run', return_value=(
+        'packet,1.500000,K_\n'
+        'packet,1.541667,__\n'
+        'packet,N/A,K_\n'
+        'packet,6.000000,K_\n'
+        'packet,3.500000,K_\n'
+        'format,1.500000\n'
+    ))
+    assert video._keyframes_from_ffprobe('foo') == (0.0, 2.0, 4.5)
+    assert make_ffmpeg_input_mock.call_args_list == [call('foo')]
+    assert run_mock.call_args_list == [call(
+        (video._ffprobe_executable,
+         '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'format=start_time:packet=pts_time,flags',
+         '-of', 'csv=print_section=1',
+         make_ffmpeg_input_mock.return_value),
+        ignore_errors=True,
+    )]
+
+def test_keyframes_from_ffprobe_subtracts_start_time(mocker):
+    mocker.patch('upsies.utils.video.make_ffmpeg_input', return_value='path/to/foo.m2ts')
+    mocker.patch('upsies.utils.subproc.run', return_value=(
+        'format,0.033000\n'
+        'packet,0.033000,K_\n'
+        'packet,10.010000,K_\n'
+        'packet,600.043000,K_\n'
+    ))
+    keyframes = video._keyframes_from_ffprobe('foo')
+    assert keyframes == (0.0, 9.977, 600.01)
+    # Seeking to a keyframe must not end up before that keyframe
+    for kf in keyframes:
+        cmd = image._make_screenshot_cmd('foo', kf, 'out.png', is_keyframe=True)
+        seek_position = float(cmd[cmd.index('-ss') + 1])
+        assert kf < seek_position < kf + 0.01
+
+@pytest.mark.parametrize(
+    argnames='run_result, exp_error',
+    argvalues=(
+        ('packet,1.5,__\nformat,0.0\n', 'foo: Unable to find keyframes'),
+        (errors.DependencyError('Missing dependency: ffprobe'), 'Missing dependency: ffprobe'),
+    ),
+)
+def test_keyframes_from_ffprobe_fails(run_result, exp_error, mocker):
+    mocker.patch('upsies.utils.video.make_ffmpeg_input', return_value='path/to/foo.mkv')
+    if isinstance(run_result, Exception):
+        mocker.patch('upsies.utils.subproc.run', side_effect=run_result)
+    else:
+        mocker.patch('upsies.utils.subproc.run', return_value=run_result)
+    with pytest.raises(errors.ContentError, match=rf'^{re.escape(exp_error)}$'):
+        video._keyframes_from_ffprobe('foo')
+
+
+@pytest.mark.parametrize(
+    argnames='keyframes, seconds, mode, exp_result',
+    argvalues=(
+        ((), 12.3, 'nearest', 12.3),
+        ((0.0, 10.0, 20.0), 0.0, 'previous', 0.0),
+        ((0.0, 10.0, 20.0), 14.9, 'previous', 10.0),
+        ((0.0, 10.0, 20.0), 15.1, 'previous', 10.0),
+        ((0.0, 10.0, 20.0), 25.0, 'previous', 20.0),
+        ((0.0, 10.0, 20.0), 14.9, 'nearest', 10.0),
+        ((0.0, 10.0, 20.0), 15.1, 'nearest', 20.0),
+        ((0.0, 10.0, 20.0), 25.0, 'nearest', 20.0),
+        ((5.0, 10.0, 20.0), 1.0, 'previous', 5.0),
+    ),
+)
+def test_closest_keyframe(keyframes, seconds, mode, exp_result):
+    assert video.closest_keyframe(keyframes, seconds, mode=mode) == exp_result
+
+def test_closest_keyframe_gets_invalid_mode():
+    with pytest.raises(ValueError, match=r"^Invalid mode: 'foo'$"):
+        video.closest_keyframe((1.0, 2.0), 1.5, mode='foo')
+
+
 @pytest.mark.parametrize(
     argnames='path_exists, tracks, default, exp_return_value, exp_exception',
     argvalues=(
@@ -276,6 +602,46 @@ def test_tracks_gets_unexpected_output_from_mediainfo(mocker):
         video.tracks('foo/bar.mkv')
 
 
+@pytest.mark.parametrize(
+    argnames='name',
+    argvalues=(
+        'tracks', 'duration', 'width', 'height', 'resolution', 'frame_rate', 'bit_depth',
+        'hdr_format', 'has_dual_audio', 'has_commentary', 'audio_format', 'audio_channels',
+        'video_format',
+    ),
+)
+@pytest.mark.asyncio
+async def test_async_accessor_probes_without_blocking(name, mocker, tmp_path):
+    video_file = tmp_path / 'foo.mkv'
+    video_file.write_bytes(b'video data')
+    mocks = mocker.Mock()
+    mocks.attach_mock(mocker.patch('upsies.utils.video.first_video', return_value='path/to/foo.mkv'), 'first_video')
+    mocks.attach_mock(mocker.patch('upsies.utils.video._run_mediainfo_async', AsyncMock()), '_run_mediainfo_async')
+    mocks.attach_mock(mocker.patch(f'upsies.utils.video.{name}', __name__=name), name)
+    accessor = video._make_async(getattr(video, name))
+    assert accessor.__name__ == f'{name}_async'
+    return_value = await accessor(str(video_file), default='default')
+    assert return_value is getattr(video, name).return_value
+    assert mocks.mock_calls == [
+        call.first_video(str(video_file)),
+        call._run_mediainfo_async('path/to/foo.mkv', '--Output=JSON'),
+        getattr(call, name)(str(video_file), default='default'),
+    ]
+
+@pytest.mark.asyncio
+async def test_async_accessor_returns_default_for_nonexisting_path(mocker, tmp_path):
+    run_mediainfo_async_mock = mocker.patch('upsies.utils.video._run_mediainfo_async', AsyncMock())
+    assert await video.width_async(str(tmp_path / 'nope.mkv'), default=123) == 123
+    assert run_mediainfo_async_mock.call_args_list == []
+
+@pytest.mark.asyncio
+async def test_async_accessor_raises_ContentError(mocker, tmp_path):
+    mocker.patch('upsies.utils.video.first_video', return_value='path/to/foo.mkv')
+    mocker.patch('upsies.utils.video._run_mediainfo_async', AsyncMock(side_effect=errors.ContentError('nope')))
+    with pytest.raises(errors.ContentError, match=r'^nope$'):
+        await video.tracks_async(str(tmp_path))
+
+
 @pytest.mark.parametrize(
     argnames='tracks, default, exp_return_value, exp_exception',
     argvalues=(
@@ -1098,6 +1464,14 @@ def test_first_video_gets_dvd_image(tmp_path, mocker):
     ]
 
 
+def _duration_side_effect(durations):
+    def duration(filepath):
+        result = durations[filepath]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+    return duration
+
 def test_filter_similar_duration_gets_multiple_files(mocker):
     durations = {
         'a.mkv': 50,
@@ -1111,7 +1485,7 @@ def test_filter_similar_duration_gets_multiple_files(mocker):
     }
     duration_mock = mocker.patch(
         'upsies.utils.video._duration',
-        side_effect=tuple(durations.values()),
+        side_effect=_duration_side_effect(durations),
     )
     assert video.filter_similar_duration(tuple(durations.keys())) == (
         'd.mkv',
@@ -1119,7 +1493,7 @@ def test_filter_similar_duration_gets_multiple_files(mocker):
         'g.mkv',
         'h.mkv',
     )
-    assert duration_mock.call_args_list == [
+    assert sorted(duration_mock.call_args_list) == [
         call('a.mkv'),
         call('b.mkv'),
         call('c.mkv'),
@@ -1138,15 +1512,51 @@ def test_filter_similar_duration_gets_only_crap_files(mocker):
     }
     duration_mock = mocker.patch(
         'upsies.utils.video._duration',
-        side_effect=tuple(durations.values()),
+        side_effect=_duration_side_effect(durations),
     )
     assert video.filter_similar_duration(tuple(durations.keys())) == ()
-    assert duration_mock.call_args_list == [
+    assert sorted(duration_mock.call_args_list) == [
         call('a.mkv'),
         call('b.mkv'),
         call('c.mkv'),
     ]
 
+def test_filter_similar_duration_raises_ContentError(mocker):
+    durations = {
+        'a.mkv': 100,
+        'b.mkv': errors.ContentError('b.mkv: Permission denied'),
+    }
+    mocker.patch('upsies.utils.video._duration', side_effect=_duration_side_effect(durations))
+    with pytest.raises(errors.ContentError, match=r'^b.mkv: Permission denied$'):
+        video.filter_similar_duration(tuple(durations.keys()))
+
+def test_filter_similar_duration_probes_concurrently(mocker):
+    import threading
+    barrier = threading.Barrier(video._max_concurrent_duration_probes, timeout=5)
+
+    def duration(filepath):
+        # Deadlocks (and times out) unless probes run concurrently
+        barrier.wait()
+        return 100
+
+    mocker.patch('upsies.utils.video._duration', side_effect=duration)
+    paths = tuple(f'{i}.mkv' for i in range(video._max_concurrent_duration_probes * 2))
+    assert video.filter_similar_duration(paths) == paths
+
+def test_filter_similar_duration_probes_files_with_similar_size(mocker, tmp_path):
+    # File size says nothing about duration, e.g. 10 minutes of high bitrate
+    # extras next to 60 minutes of low bitrate feature
+    durations = {}
+    for name, size, duration in (('feature.mkv', 2250, 3600), ('extra.mkv', 1500, 600)):
+        (tmp_path / name).write_bytes(b'x' * size)
+        durations[str(tmp_path / name)] = duration
+    duration_mock = mocker.patch(
+        'upsies.utils.video._duration',
+        side_effect=_duration_side_effect(durations),
+    )
+    assert video.filter_similar_duration(tuple(durations)) == (str(tmp_path / 'feature.mkv'),)
+    assert sorted(duration_mock.call_args_list) == sorted(call(path) for path in durations)
+
 def test_filter_similar_duration_gets_single_file(mocker):
     duration_mock = mocker.patch('upsies.utils.video._duration', return_value=12345)
     assert video.filter_similar_duration(('foo.mkv',)) == ('foo.mkv',)
@@ -1171,9 +1581,13 @@ def test_make_ffmpeg_input_gets_dvd_directory(duration_mock, tmp_path):
     (path / 'VIDEO_TS' / '1.VOB').write_text('video data')
     (path / 'VIDEO_TS' / '2.VOB').write_text('video data')
     (path / 'VIDEO_TS' / '3.VOB').write_text('video data')
-    duration_mock.side_effect = (100, 1000, 900)
+    duration_mock.side_effect = _duration_side_effect({
+        str(path / 'VIDEO_TS' / '1.VOB'): 100,
+        str(path / 'VIDEO_TS' / '2.VOB'): 1000,
+        str(path / 'VIDEO_TS' / '3.VOB'): 900,
+    })
     assert video.make_ffmpeg_input(path) == str(path / 'VIDEO_TS' / '2.VOB')
-    assert duration_mock.call_args_list == [
+    assert sorted(duration_mock.call_args_list) == [
         call(str(path / 'VIDEO_TS' / '1.VOB')),
         call(str(path / 'VIDEO_TS' / '2.VOB')),
         call(str(path / 'VIDEO_TS' / '3.VOB')),
@@ -1,7 +1,9 @@
 from itertools import zip_longest
+from unittest.mock import AsyncMock
 
 import pytest
 
+from upsies import utils
 from upsies.utils.types import ReleaseType
 from upsies.utils.webdbs import Query, SearchResult, imdb
 
@@ -11,6 +13,23 @@ def api():
     return imdb.ImdbApi()
 
 
+@pytest.mark.asyncio
+async def test_get_soup_caches_parsed_pages_within_memory_budget(api, mocker):
+    mocker.patch.object(api, '_soup_cache', utils.LRUCache(maxsize=None, maxbytes=2000))
+    get_mock = mocker.patch('upsies.utils.http.get', AsyncMock(side_effect=lambda url, **_: f'<html>{url}</html>'))
+
+    soup = await api._get_soup('title/tt123/', params={'foo': 'bar'})
+    assert await api._get_soup('title/tt123/', params={'foo': 'bar'}) is soup
+    assert len(get_mock.call_args_list) == 1
+    assert api._soup_cache.info().currbytes == utils.html.parsed_size(f'<html>{api._url_base}/title/tt123/</html>')
+
+    # Other pages eventually push the first page out of the cache
+    for i in range(10):
+        await api._get_soup(f'title/tt123/{i}')
+    assert await api._get_soup('title/tt123/', params={'foo': 'bar'}) is not soup
+    assert api._soup_cache.info().currbytes <= 2000
+
+
 @pytest.mark.parametrize(
     argnames='query, exp_query',
     argvalues=(
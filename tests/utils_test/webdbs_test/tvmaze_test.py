@@ -1,10 +1,10 @@
 from itertools import zip_longest
-from unittest.mock import AsyncMock, call
+from unittest.mock import AsyncMock, Mock, call
 
 import pytest
 
 from upsies.utils.types import ReleaseType
-from upsies.utils.webdbs import Query, SearchResult, tvmaze
+from upsies.utils.webdbs import Query, SearchResult, idmap, tvmaze
 
 
 @pytest.fixture
@@ -12,6 +12,29 @@ def api():
     return tvmaze.TvmazeApi()
 
 
+@pytest.mark.parametrize(
+    argnames='query, previous_query, exp_years',
+    argvalues=(
+        (Query('The Foo', year=2001), Query('the foo'), ['2001']),
+        (Query('The Foo', year=2003), Query('the foo'), []),
+        (Query('The Foo'), Query('the foo'), None),
+        (Query('The Foo', year=2001), Query('the foo', year=2002), None),
+        (Query('The Foo', year=2001), Query('the bar'), None),
+        (Query('The Foo', year=2001, type='season'), Query('the foo'), None),
+        (Query(id='123'), Query('the foo'), None),
+        (Query('The Foo', year=2001), Query(id='123'), None),
+    ),
+    ids=lambda v: str(v),
+)
+def test_refine_search_results(query, previous_query, exp_years, api):
+    previous_results = [Mock(year='2000'), Mock(year='2001'), Mock(year='2002')]
+    results = api.refine_search_results(query, previous_query, previous_results)
+    if exp_years is None:
+        assert results is None
+    else:
+        assert [result.year for result in results] == exp_years
+
+
 def test_sanitize_query(api):
     q = Query('The Foo', type='movie', year='2000')
     assert api.sanitize_query(q) == Query('The Foo', type='unknown', year='2000')
@@ -500,6 +523,27 @@ async def test_year(id, exp_year, api, store_response):
 async def test_imdb_id(id, exp_imdb_id, api, store_response):
     assert await api.imdb_id(id) == exp_imdb_id
 
+@pytest.mark.asyncio
+async def test_imdb_id_is_looked_up_in_idmap(api, mocker):
+    idmap.add(tvmaze='123', imdb='tt456')
+    mocker.patch.object(api, '_get_show', AsyncMock(side_effect=RuntimeError('no requests')))
+    assert await api.imdb_id(123) == 'tt456'
+
+@pytest.mark.asyncio
+async def test_ids_are_added_to_idmap(api, store_response):
+    await api.search(Query('star wars'))
+    assert idmap.get('tvmaze', 117, 'imdb') == 'tt2930604'
+    assert idmap.get('imdb', 'tt2930604', 'tvmaze') == '117'
+    await api.cast(35256)
+    assert idmap.get('imdb', 'tt8078816', 'tvmaze') == '35256'
+
+@pytest.mark.asyncio
+async def test_ids_from_search_results_are_added_at_once(api, store_response, mocker):
+    add_many_mock = mocker.patch.object(idmap, 'add_many', wraps=idmap.add_many)
+    results = await api.search(Query('star wars'))
+    assert len(results) > 1
+    assert len(add_many_mock.call_args_list) == 1
+
 
 @pytest.mark.parametrize(
     argnames=('id', 'season', 'episode', 'exp_episode'),
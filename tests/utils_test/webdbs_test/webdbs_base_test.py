@@ -95,6 +95,10 @@ async def test_runtimes(runtimes, exp_runtimes, webdb, mocker):
     assert webdb._runtimes.call_args_list == [call('mock id')]
 
 
+def test_refine_search_results(webdb):
+    assert webdb.refine_search_results(Query('foo', year=2000), Query('foo'), ['result']) is None
+
+
 @pytest.mark.asyncio
 async def test_gather(webdb):
     webdb.cast.return_value = 'mock cast'
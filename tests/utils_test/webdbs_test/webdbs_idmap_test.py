@@ -0,0 +1,137 @@
+import pytest
+
+from upsies import errors
+from upsies.utils.webdbs import idmap
+
+
+@pytest.fixture
+def idmap_file(tmp_path, mocker):
+    filepath = tmp_path / 'cache' / 'webdb_ids.csv'
+    mocker.patch.object(idmap, 'filepath', str(filepath))
+    return filepath
+
+
+def test_get_returns_None_for_unknown_id():
+    assert idmap.get('imdb', 'tt123', 'tvmaze') is None
+    assert idmap.get('imdb', '', 'tvmaze') is None
+
+def test_add_maps_ids_in_both_directions():
+    assert idmap.add(imdb='tt123', tvmaze=456) is True
+    assert idmap.get('imdb', 'tt123', 'tvmaze') == '456'
+    assert idmap.get('tvmaze', 456, 'imdb') == 'tt123'
+    assert idmap.get('tvmaze', '456', 'tmdb') is None
+
+def test_add_merges_ids():
+    idmap.add(imdb='tt123', tvmaze='456')
+    idmap.add(tmdb='tv/789', tvmaze='456')
+    assert idmap.get('imdb', 'tt123', 'tmdb') == 'tv/789'
+    assert idmap.get('tmdb', 'tv/789', 'imdb') == 'tt123'
+
+def test_add_replaces_ids():
+    idmap.add(imdb='tt123', tvmaze='456')
+    idmap.add(imdb='tt123', tvmaze='789')
+    assert idmap.get('imdb', 'tt123', 'tvmaze') == '789'
+    assert idmap.get('tvmaze', '789', 'imdb') == 'tt123'
+    assert idmap.get('tvmaze', '456', 'imdb') is None
+
+@pytest.mark.parametrize(
+    argnames='ids',
+    argvalues=(
+        {},
+        {'imdb': 'tt123'},
+        {'imdb': 'tt123', 'tvmaze': ''},
+        {'imdb': 'tt123', 'tvmaze': None},
+    ),
+)
+def test_add_ignores_less_than_two_ids(ids):
+    assert idmap.add(**ids) is False
+    assert idmap.get('imdb', 'tt123', 'tvmaze') is None
+
+def test_add_reports_known_ids(idmap_file):
+    assert idmap.add(imdb='tt123', tvmaze='456') is True
+    idmap_file.unlink()
+    assert idmap.add(imdb='tt123', tvmaze='456') is False
+    assert not idmap_file.exists()
+
+def test_add_writes_file(idmap_file, mocker):
+    idmap.add(imdb='tt123', tvmaze='456')
+    idmap.add(tmdb='movie/1', imdb='tt1')
+    assert idmap_file.read_text().splitlines() == [
+        'imdb,tmdb,tvmaze',
+        'tt1,movie/1,',
+        'tt123,,456',
+    ]
+    mocker.patch.object(idmap, '_ids', None)
+    assert idmap.get('tvmaze', '456', 'imdb') == 'tt123'
+    assert idmap.get('imdb', 'tt1', 'tmdb') == 'movie/1'
+
+def test_add_many_writes_file_once(idmap_file, mocker):
+    write_mock = mocker.patch.object(idmap, '_write', wraps=idmap._write)
+    assert idmap.add_many((
+        {'imdb': 'tt123', 'tvmaze': '456'},
+        {'imdb': 'tt1'},
+        {'tmdb': 'movie/1', 'imdb': 'tt1'},
+        {'imdb': 'tt123', 'tvmaze': '456'},
+    )) == 2
+    assert write_mock.call_args_list == [mocker.call()]
+    assert idmap_file.read_text().splitlines() == [
+        'imdb,tmdb,tvmaze',
+        'tt1,movie/1,',
+        'tt123,,456',
+    ]
+
+def test_add_many_does_not_write_file_without_new_ids(idmap_file, mocker):
+    idmap.add(imdb='tt123', tvmaze='456')
+    write_mock = mocker.patch.object(idmap, '_write')
+    assert idmap.add_many(({'imdb': 'tt123', 'tvmaze': '456'}, {'imdb': 'tt1'})) == 0
+    assert write_mock.call_args_list == []
+
+def test_invalid_file_is_ignored(idmap_file):
+    idmap_file.parent.mkdir()
+    idmap_file.write_text('garbage\n')
+    assert idmap.get('imdb', 'tt123', 'tvmaze') is None
+    idmap.add(imdb='tt123', tvmaze='456')
+    assert idmap_file.read_text().splitlines() == ['imdb,tvmaze', 'tt123,456']
+
+
+def test_import_csv(tmp_path, idmap_file):
+    filepath = tmp_path / 'ids.csv'
+    filepath.write_text(
+        'tvmaze, imdb ,tmdb\n'
+        '1,tt1,\n'
+        '2,,tv/2\n'
+        '3,,\n'
+        '1,tt1,\n'
+    )
+    assert idmap.import_csv(filepath) == 2
+    assert idmap.get('imdb', 'tt1', 'tvmaze') == '1'
+    assert idmap.get('tmdb', 'tv/2', 'tvmaze') == '2'
+    assert idmap.get('tvmaze', '3', 'imdb') is None
+    assert idmap_file.exists()
+
+def test_import_csv_with_nonexisting_file(tmp_path):
+    filepath = tmp_path / 'ids.csv'
+    with pytest.raises(errors.ContentError, match=rf'^{filepath}: No such file or directory$'):
+        idmap.import_csv(filepath)
+
+def test_import_csv_with_invalid_file(tmp_path):
+    filepath = tmp_path / 'ids.csv'
+    filepath.write_text('imdb\ntt123\n')
+    with pytest.raises(errors.ContentError, match=rf'^{filepath}: Invalid CSV: Expected at least two columns: imdb$'):
+        idmap.import_csv(filepath)
+
+def test_export_csv(tmp_path):
+    idmap.add(imdb='tt123', tvmaze='456')
+    idmap.add(imdb='tt1', tvmaze='2', tmdb='tv/3')
+    filepath = tmp_path / 'ids.csv'
+    idmap.export_csv(filepath)
+    assert filepath.read_text().splitlines() == [
+        'imdb,tmdb,tvmaze',
+        'tt1,tv/3,2',
+        'tt123,,456',
+    ]
+
+def test_export_csv_with_unwritable_file(tmp_path):
+    filepath = tmp_path / 'nonexisting' / 'ids.csv'
+    with pytest.raises(errors.ContentError, match=rf'^{filepath}: No such file or directory$'):
+        idmap.export_csv(filepath)
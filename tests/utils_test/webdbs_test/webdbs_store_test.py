@@ -0,0 +1,197 @@
+import enum
+import json
+from unittest.mock import AsyncMock, call
+
+import pytest
+
+from upsies import __version__, errors
+from upsies.utils.types import ReleaseType, SceneCheckResult
+from upsies.utils.webdbs import Person, store
+
+
+@pytest.fixture(autouse=True)
+def store_directory(tmp_path, mocker):
+    mocker.patch.object(store, 'cache_directory', str(tmp_path / 'webdb_info'))
+    mocker.patch.object(store, '_records', {})
+    mocker.patch.object(store, '_unwritten', set())
+    return tmp_path / 'webdb_info'
+
+
+class MockApi:
+    name = 'mockdb'
+
+    def __init__(self):
+        self.mock = AsyncMock(return_value='The Foo')
+
+    @store.stored
+    async def title(self, id):
+        return await self.mock(id)
+
+    @store.stored
+    async def poster_url(self, id, season=None):
+        return await self.mock(id, season=season)
+
+
+@pytest.mark.asyncio
+async def test_stored_returns_stored_value(store_directory, mocker):
+    api = MockApi()
+    for _ in range(3):
+        assert await api.title('tt123') == 'The Foo'
+    assert api.mock.call_args_list == [call('tt123')]
+    assert not store_directory.exists()
+
+    # Read from disk by new process
+    store.flush()
+    mocker.patch.object(store, '_records', {})
+    assert await api.title('tt123') == 'The Foo'
+    assert api.mock.call_args_list == [call('tt123')]
+    assert [path.name for path in store_directory.iterdir()] == ['mockdb.tt123.json']
+
+@pytest.mark.asyncio
+async def test_stored_distinguishes_ids_and_arguments():
+    api = MockApi()
+    await api.poster_url('tt123')
+    await api.poster_url('tt123', season=None)
+    await api.poster_url('tt123', season=1)
+    await api.poster_url('tt456', season=1)
+    await api.poster_url('tt123', 1)
+    assert api.mock.call_args_list == [
+        call('tt123', season=None),
+        call('tt123', season=1),
+        call('tt456', season=1),
+    ]
+
+@pytest.mark.parametrize('id', ('', None))
+@pytest.mark.asyncio
+async def test_stored_ignores_empty_id(id, store_directory):
+    api = MockApi()
+    for _ in range(3):
+        await api.title(id)
+    assert api.mock.call_args_list == [call(id)] * 3
+    assert not store_directory.exists()
+
+@pytest.mark.asyncio
+async def test_stored_without_cache_directory(mocker):
+    mocker.patch.object(store, 'cache_directory', None)
+    api = MockApi()
+    for _ in range(3):
+        await api.title('tt123')
+    assert api.mock.call_args_list == [call('tt123')] * 3
+
+@pytest.mark.asyncio
+async def test_stored_does_not_store_exceptions():
+    api = MockApi()
+    api.mock.side_effect = errors.RequestError('No')
+    for _ in range(2):
+        with pytest.raises(errors.RequestError, match=r'^No$'):
+            await api.title('tt123')
+    api.mock.side_effect = None
+    assert await api.title('tt123') == 'The Foo'
+    assert api.mock.call_args_list == [call('tt123')] * 3
+
+@pytest.mark.asyncio
+async def test_stored_value_expires(mocker):
+    time_mock = mocker.patch('time.time', return_value=1000)
+    mocker.patch.object(store, 'ttl', 100)
+    api = MockApi()
+    await api.title('tt123')
+    time_mock.return_value = 1100
+    await api.title('tt123')
+    assert api.mock.call_args_list == [call('tt123')]
+    time_mock.return_value = 1100.1
+    await api.title('tt123')
+    assert api.mock.call_args_list == [call('tt123')] * 2
+
+
+@pytest.mark.parametrize(
+    argnames='value',
+    argvalues=(
+        None,
+        'foo',
+        123,
+        4.5,
+        ('foo', 'bar'),
+        ['foo', ('bar', 'baz')],
+        (Person('Foo', url='http://foo'), Person('Bar')),
+        ReleaseType.season,
+        SceneCheckResult.true,
+        {'default': 123, "Director's Cut": 145},
+        {'date': '2020-01-02', 'episode': '3'},
+    ),
+    ids=lambda v: repr(v),
+)
+def test_put_and_get_preserve_types(value, mocker):
+    store.put('mockdb', 'tt123', 'field', value)
+    store.flush()
+    mocker.patch.object(store, '_records', {})
+    stored_value = store.get('mockdb', 'tt123', 'field')
+    assert stored_value == value
+    assert type(stored_value) is type(value)
+    if isinstance(value, tuple) and value and isinstance(value[0], Person):
+        assert [p.url for p in stored_value] == [p.url for p in value]
+
+class UnknownEnum(enum.Enum):
+    foo = 'foo'
+
+@pytest.mark.parametrize('value', (object(), UnknownEnum.foo), ids=lambda v: repr(v))
+def test_put_does_not_write_unsupported_types(value, store_directory):
+    store.put('mockdb', 'tt123', 'field', value)
+    store.put('mockdb', 'tt123', 'other field', 'Foo')
+    store.flush()
+    data = json.loads((store_directory / 'mockdb.tt123.json').read_text())
+    assert list(data['fields']) == ['other field']
+
+def test_put_writes_nothing_until_flush(store_directory, mocker):
+    write_mock = mocker.patch('upsies.utils.fs.write_atomically')
+    for field in ('foo', 'bar', 'baz'):
+        store.put('mockdb', 'tt123', field, field.upper())
+    store.put('mockdb', 'tt456', 'foo', 'FOO')
+    assert write_mock.call_args_list == []
+    store.flush()
+    assert sorted(c.args[0] for c in write_mock.call_args_list) == [
+        str(store_directory / 'mockdb.tt123.json'),
+        str(store_directory / 'mockdb.tt456.json'),
+    ]
+    store.flush()
+    assert len(write_mock.call_args_list) == 2
+
+def test_put_drops_expired_values(store_directory, mocker):
+    time_mock = mocker.patch('time.time', return_value=1000)
+    mocker.patch.object(store, 'ttl', 100)
+    store.put('mockdb', 'tt123', 'foo', 'Foo')
+    time_mock.return_value = 1200
+    store.put('mockdb', 'tt123', 'bar', 'Bar')
+    store.flush()
+    data = json.loads((store_directory / 'mockdb.tt123.json').read_text())
+    assert data == {'__version__': __version__, 'fields': {'bar': {'expires': 1300, 'value': 'Bar'}}}
+
+def test_get_quotes_id_in_filename(store_directory):
+    store.put('tmdb', 'movie/525', 'field', 'foo')
+    store.flush()
+    assert [path.name for path in store_directory.iterdir()] == ['tmdb.movie%2F525.json']
+
+def test_get_ignores_invalid_file(store_directory):
+    store_directory.mkdir()
+    (store_directory / 'mockdb.tt123.json').write_text('{"field": "garbage"}')
+    assert store.get('mockdb', 'tt123', 'field', default='default') == 'default'
+
+def test_get_ignores_record_from_other_version(store_directory, mocker):
+    store.put('mockdb', 'tt123', 'field', 'foo')
+    store.flush()
+    mocker.patch.object(store, '_records', {})
+    mocker.patch.object(store, '__version__', '0.0.1')
+    assert store.get('mockdb', 'tt123', 'field', default='default') == 'default'
+
+@pytest.mark.parametrize(
+    argnames='enum_name',
+    argvalues=('UnknownEnum', 'upsies.utils.types:ReleaseType', 'os:system'),
+)
+def test_get_ignores_unknown_enum(enum_name, store_directory):
+    store_directory.mkdir()
+    (store_directory / 'mockdb.tt123.json').write_text(json.dumps({
+        '__version__': __version__,
+        'fields': {
+            'field': {'expires': 2e9, 'value': {'__enum__': enum_name, 'value': 'foo'}},
+        },
+    }))
+    assert store.get('mockdb', 'tt123', 'field', default='default') == 'default'
@@ -14,12 +14,34 @@ def application_setup(config):
     """
     import os
 
-    from . import utils
+    from . import constants, utils
 
     utils.http.cache_directory = os.path.join(
         config['config']['main']['cache_directory'],
         'http_responses',
     )
+    utils.video.cache_directory = os.path.join(
+        config['config']['main']['cache_directory'],
+        'video_info',
+    )
+    utils.release.cache_directory = os.path.join(
+        config['config']['main']['cache_directory'],
+        'release_info',
+    )
+    utils.memoize_cache_directory = os.path.join(
+        config['config']['main']['cache_directory'],
+        'memoized',
+    )
+    utils.scene.checksum.cache_directory = os.path.join(
+        config['config']['main']['cache_directory'],
+        'scene_checksums',
+    )
+    utils.webdbs.store.cache_directory = os.path.join(
+        config['config']['main']['cache_directory'],
+        'webdb_info',
+    )
+    # The ID mapping must not be removed when the cache is pruned
+    utils.webdbs.idmap.filepath = constants.WEBDB_IDS_FILEPATH
 
 
 def application_shutdown(config):
@@ -32,6 +54,12 @@ def application_shutdown(config):
 
     from . import utils
 
+    # Terminate worker processes
+    utils.scene.checksum.shutdown()
+
+    # Write information from web databases before the cache is pruned
+    utils.webdbs.store.flush()
+
     # Maintain maximum cache size
     utils.fs.limit_directory_size(
         path=config['config']['main']['cache_directory'],
@@ -6,6 +6,7 @@ import os
 
 from xdg.BaseDirectory import xdg_cache_home as XDG_CACHE_HOME
 from xdg.BaseDirectory import xdg_config_home as XDG_CONFIG_HOME
+from xdg.BaseDirectory import xdg_data_home as XDG_DATA_HOME
 
 from . import __project_name__
 
@@ -15,6 +16,21 @@ DEFAULT_CACHE_DIRECTORY = os.path.join(XDG_CACHE_HOME, __project_name__)
 GENERIC_TORRENTS_DIRPATH = os.path.join(DEFAULT_CACHE_DIRECTORY, 'generic_torrents')
 """Path to directory that contains cached torrents for re-using piece hashes"""
 
+SCENE_DATABASE_FILEPATH = os.path.join(XDG_DATA_HOME, __project_name__, 'scene.db')
+"""Path to optional local scene release database"""
+
+WEBDB_IDS_FILEPATH = os.path.join(XDG_DATA_HOME, __project_name__, 'webdb_ids.csv')
+"""Path to mapping of IDs of the same movie or series in different web databases"""
+
+SCENE_CACHE_TTL = 12 * 60 * 60
+"""Number of seconds scene search results and checks are cached"""
+
+SCENE_EMPTY_CACHE_TTL = 10 * 60
+"""Number of seconds empty scene search results are cached (in memory only)"""
+
+WEBDB_CACHE_TTL = 7 * 24 * 60 * 60
+"""Number of seconds information from IMDb, TMDb, TVmaze, etc is stored"""
+
 CONFIG_FILEPATH = os.path.join(XDG_CONFIG_HOME, __project_name__, 'config.ini')
 """Path to general configuration file"""
 
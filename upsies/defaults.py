@@ -19,6 +19,20 @@ defaults = {
                 ),
             ),
         },
+        'screenshots': {
+            'snap_to_keyframes': utils.configfiles.config_value(
+                value=utils.types.Choice('off', options=utils.image.SNAP_TO_KEYFRAMES_MODES),
+                description=(
+                    'Whether to move screenshot timestamps to keyframes. '
+                    '"previous" uses the closest keyframe before the timestamp, '
+                    '"nearest" uses the closest keyframe in either direction.\n'
+                    'This is much faster for videos with few keyframes, but '
+                    'the keyframes are found by reading the whole video once.\n'
+                    'Screenshot file names still contain the requested '
+                    'timestamp, so they may be off by a few seconds.'
+                ),
+            ),
+        },
         'torrent-create': {
             'reuse_torrent_paths': utils.configfiles.config_value(
                 value=[],
@@ -148,6 +148,29 @@ class SceneFileSizeError(SceneError):
         """Size of the file in the local file system"""
         return self._existing_size
 
+class SceneFileChecksumError(SceneError):
+    """Scene release file checksum differs from original release"""
+    def __init__(self, filename, *, original_checksum, existing_checksum):
+        super().__init__(f'{filename} should have CRC32 {original_checksum}, not {existing_checksum}')
+        self._filename = filename
+        self._original_checksum = original_checksum
+        self._existing_checksum = existing_checksum
+
+    @property
+    def filename(self):
+        """Name of the file in the scene release"""
+        return self._filename
+
+    @property
+    def original_checksum(self):
+        """CRC32 checksum of the file in the scene release"""
+        return self._original_checksum
+
+    @property
+    def existing_checksum(self):
+        """CRC32 checksum of the file in the local file system"""
+        return self._existing_checksum
+
 class SceneMissingInfoError(UpsiesError):
     """Missing information about a file from a scene release"""
     def __init__(self, file_name):
@@ -79,6 +79,11 @@ class SceneCheckJob(JobBase):
             override it. Registered callbacks get a
             :class:`~.types.SceneCheckResult` enum as a positional argument.
 
+        ``checksum_progress``
+            Emitted while CRC32 checksums are calculated (see `deep` argument of
+            :meth:`initialize`). Registered callbacks get the percentage of
+            processed bytes of all files as a positional argument.
+
         ``checked``
             Emitted after the user decided whether it's a scene release or not.
             Registered callbacks get a :class:`~.utils.types.SceneCheckResult`
@@ -102,7 +107,7 @@ class SceneCheckJob(JobBase):
         """
         return self._is_scene_release
 
-    def initialize(self, *, content_path, force=None):
+    def initialize(self, *, content_path, force=None, deep=False):
         """
         Set internal state
 
@@ -110,12 +115,17 @@ class SceneCheckJob(JobBase):
             video file or release name
         :param bool force: Predetermined check result; `True` (is scene),
             `False` (is not scene) or `None` (autodetect)
+        :param bool deep: Whether to verify the CRC32 checksum of each file (see
+            :func:`~.utils.scene.verify.verify_release_checksums`)
         """
         self._content_path = content_path
         self._predetermined_result = None if force is None else bool(force)
+        self._deep = bool(deep)
+        self._checksum_progress = {}
         self._is_scene_release = None
         self.signal.add('ask_release_name')
         self.signal.add('ask_is_scene_release')
+        self.signal.add('checksum_progress')
         self.signal.add('checked')
         self.signal.record('checked')
         self.signal.register('checked', lambda is_scene: setattr(self, '_is_scene_release', is_scene))
@@ -182,9 +192,24 @@ class SceneCheckJob(JobBase):
             self._handle_scene_check_result(types.SceneCheckResult.false)
 
     async def _verify_release(self, release_name=None):
-        is_scene_release, exceptions = await scene.verify_release(self._content_path, release_name)
+        if self._deep:
+            is_scene_release, exceptions = await scene.verify_release(
+                self._content_path, release_name,
+                deep=True,
+                progress_callback=self._handle_checksum_progress,
+            )
+        else:
+            is_scene_release, exceptions = await scene.verify_release(self._content_path, release_name)
         self._handle_scene_check_result(is_scene_release, exceptions)
 
+    def _handle_checksum_progress(self, filepath, bytes_done, bytes_total):
+        # Combine progress of files that are processed in parallel
+        self._checksum_progress[filepath] = (bytes_done, bytes_total)
+        bytes_done = sum(done for done, _ in self._checksum_progress.values())
+        bytes_total = sum(total for _, total in self._checksum_progress.values())
+        percent = bytes_done / bytes_total * 100 if bytes_total else 100
+        self.signal.emit('checksum_progress', percent)
+
     def _handle_scene_check_result(self, is_scene_release, exceptions=()):
         _log.debug('Handling result: %r: %r', is_scene_release, exceptions)
 
@@ -39,7 +39,7 @@ class ScreenshotsJob(JobBase):
     label = 'Screenshots'
     cache_id = None
 
-    def initialize(self, *, content_path, timestamps=(), count=0):
+    def initialize(self, *, content_path, timestamps=(), count=0, snap_to_keyframes='off'):
         """
         Set internal state
 
@@ -48,6 +48,8 @@ class ScreenshotsJob(JobBase):
         :param timestamps: Screenshot positions in the video
         :type timestamps: sequence of "[[H+:]M+:]S+" strings or seconds
         :param count: How many screenshots to make
+        :param str snap_to_keyframes: Whether to move each timestamp to a
+            keyframe (see :func:`~.image.screenshot`)
 
         If `timestamps` and `count` are not given, screenshot positions are
         picked at even intervals. If `count` is larger than the length of
@@ -64,11 +66,12 @@ class ScreenshotsJob(JobBase):
             name=self.name,
             target=_screenshots_process,
             kwargs={
-                'content_path' : content_path,
-                'timestamps'   : timestamps,
-                'count'        : count,
-                'output_dir'   : self.home_directory,
-                'overwrite'    : self.ignore_cache,
+                'content_path'      : content_path,
+                'timestamps'        : timestamps,
+                'count'             : count,
+                'output_dir'        : self.home_directory,
+                'overwrite'         : self.ignore_cache,
+                'snap_to_keyframes' : snap_to_keyframes,
             },
             info_callback=self._handle_info,
             error_callback=self._handle_error,
@@ -214,7 +217,8 @@ def _normalize_timestamps(video_file, timestamps, count):
 
 
 def _screenshots_process(output_queue, input_queue,
-                         content_path, timestamps, count, output_dir, overwrite):
+                         content_path, timestamps, count, output_dir, overwrite,
+                         snap_to_keyframes='off'):
     # Find appropriate video file if `content_path` is a directory
     try:
         video_file = video.first_video(content_path)
@@ -255,6 +259,7 @@ def _screenshots_process(output_queue, input_queue,
                         screenshot_file=screenshot_file,
                         timestamp=ts,
                         overwrite=overwrite,
+                        snap_to_keyframes=snap_to_keyframes,
                     )
                 except errors.ScreenshotError as e:
                     output_queue.put((daemon.MsgType.error, str(e)))
@@ -95,6 +95,7 @@ class WebDbSearchJob(JobBase):
         self._is_searching = False
         self._searcher = _Searcher(
             search_coro=self._db.search,
+            refine_results=self._db.refine_search_results,
             results_callback=self._handle_search_results,
             searching_callback=self._handle_searching_status,
             error_callback=self.warn,
@@ -179,6 +180,7 @@ class WebDbSearchJob(JobBase):
             self._info_updater.set_result(results[0])
         else:
             self._info_updater.set_result(None)
+        self._info_updater.prefetch(results)
         self.signal.emit('search_results', results)
 
     def result_focused(self, result):
@@ -225,14 +227,21 @@ class WebDbSearchJob(JobBase):
 
 class _Searcher:
     def __init__(self, search_coro, results_callback, searching_callback,
-                 error_callback, exception_callback):
+                 error_callback, exception_callback, refine_results=None):
         self._search_coro = search_coro
+        self._refine_results = refine_results
         self._results_callback = results_callback
         self._searching_callback = searching_callback
         self._error_callback = error_callback
         self._exception_callback = exception_callback
         self._previous_search_time = 0
         self._search_task = None
+        self._search_started = None
+        # Map query keys to (query, results) tuples
+        self._cache = collections.OrderedDict()
+        # (query string, seconds from search() call to results, source) tuples
+        # where source is "cache", "refined" or "request"
+        self.latencies = collections.deque(maxlen=100)
 
     async def wait(self):
         if self._search_task:
@@ -260,24 +269,68 @@ class _Searcher:
         :type query: :class:`~.utils.webdbs.Query`
         """
         if self._search_task:
+            # This also cancels any ongoing HTTP requests
             self._search_task.cancel()
             self._search_task = None
+        self._search_started = time_monotonic()
         self._search_task = get_aioloop().create_task(self._search(query))
         self._search_task.add_done_callback(self._handle_search_task)
 
     async def _search(self, query):
+        # Our query may be changed by the caller while we are searching
+        query = query.copy()
         self._results_callback(())
         self._searching_callback(True)
-        await self._delay()
         results = ()
         try:
-            results = await self._search_coro(query)
+            results, source = self._get_cached_results(query)
+            if results is None:
+                await self._delay()
+                results = await self._search_coro(query)
+                source = 'request'
+            self._cache_results(query, results)
+            self._record_latency(query, source)
         except errors.RequestError as e:
+            results = ()
             self._error_callback(e)
         finally:
             self._searching_callback(False)
             self._results_callback(results)
 
+    _max_cached_queries = 32
+
+    @staticmethod
+    def _get_query_key(query):
+        return (query.title_normalized, query.type, query.year, query.id)
+
+    def _get_cached_results(self, query):
+        # Return (results, source) tuple; results are `None` if there are no
+        # cached results for `query`
+        key = self._get_query_key(query)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key][1], 'cache'
+
+        if self._refine_results:
+            # Try to filter results of an earlier, less specific query
+            for cached_query, cached_results in reversed(self._cache.values()):
+                results = self._refine_results(query, cached_query, cached_results)
+                if results is not None:
+                    return results, 'refined'
+
+        return None, None
+
+    def _cache_results(self, query, results):
+        self._cache[self._get_query_key(query)] = (query, results)
+        while len(self._cache) > self._max_cached_queries:
+            self._cache.popitem(last=False)
+
+    def _record_latency(self, query, source):
+        if self._search_started is not None:
+            latency = time_monotonic() - self._search_started
+            self.latencies.append((str(query), latency, source))
+            _log.debug('Got results for %s from %s in %.3f seconds', query, source, latency)
+
     _min_seconds_between_searches = 1
 
     async def _delay(self):
@@ -304,17 +357,22 @@ class _InfoUpdater:
         # SearchResult instance or None
         self._result = None
         self._update_task = None
+        self._prefetch_task = None
+        # Map cache keys to tasks that are fetching values
+        self._fetch_tasks = {}
 
     async def wait(self):
-        if self._update_task:
-            try:
-                await self._update_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._update_task, self._prefetch_task):
+            if task:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
 
     def cancel(self):
-        if self._update_task:
-            self._update_task.cancel()
+        for task in (self._update_task, self._prefetch_task, *self._fetch_tasks.values()):
+            if task:
+                task.cancel()
 
     def _handle_update_task(self, task):
         try:
@@ -324,7 +382,10 @@ class _InfoUpdater:
             pass
 
     def set_result(self, result):
-        self.cancel()
+        # Don't cancel any fetch tasks; their values are cached when they finish
+        # and the user is likely to come back to the previous result
+        if self._update_task:
+            self._update_task.cancel()
         self._result = result
 
         if not self._result:
@@ -365,17 +426,77 @@ class _InfoUpdater:
         else:
             # Indicate "Loading..." status
             callback(Ellipsis)
-            await asyncio.sleep(self._delay_between_updates)
+            if cache_key not in self._fetch_tasks:
+                # Don't make requests for every result the user scrolls past
+                await asyncio.sleep(self._delay_between_updates)
             try:
-                value = await value_getter()
+                value_str = await self._fetch(value_getter, cache_key)
             except errors.RequestError as e:
                 callback('')
                 self._error_callback(e)
             else:
-                value_str = self._value_as_string(value)
-                self._cache[cache_key] = value_str
                 callback(value_str)
 
+    _prefetch_count = 5
+
+    def prefetch(self, results):
+        """
+        Fetch information about the first few `results` in the background
+
+        Any previous prefetching is cancelled.
+
+        :param results: Sequence of :class:`~.utils.webdbs.common.SearchResult`
+            instances
+        """
+        if self._prefetch_task:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        if results:
+            self._prefetch_task = asyncio.ensure_future(self._prefetch(results[:self._prefetch_count]))
+            self._prefetch_task.add_done_callback(self._handle_update_task)
+
+    async def _prefetch(self, results):
+        # Let the focused result go first and fetch one value at a time to
+        # keep any connections free for it
+        await asyncio.sleep(self._delay_between_updates)
+        for result in results:
+            for attr in self._targets:
+                value_getter = getattr(result, attr)
+                if callable(value_getter):
+                    try:
+                        await self._fetch(value_getter, (result.id, attr))
+                    except errors.RequestError as e:
+                        _log.debug('Failed to prefetch %s of %s: %r', attr, result.id, e)
+
+    async def _fetch(self, value_getter, cache_key):
+        # Return cached value or await the task that fetches it, creating it if
+        # necessary. The task is shared between the focused result and
+        # prefetching, and it is not cancelled if the awaiting coroutine is.
+        cached_value = self._cache.get(cache_key, None)
+        if cached_value is not None:
+            return cached_value
+
+        task = self._fetch_tasks.get(cache_key, None)
+        if task is None:
+            task = self._fetch_tasks[cache_key] = asyncio.ensure_future(
+                self._fetch_value(value_getter, cache_key),
+            )
+            task.add_done_callback(lambda task: self._handle_fetch_task(cache_key, task))
+        return await asyncio.shield(task)
+
+    async def _fetch_value(self, value_getter, cache_key):
+        value_str = self._value_as_string(await value_getter())
+        self._cache[cache_key] = value_str
+        return value_str
+
+    def _handle_fetch_task(self, cache_key, task):
+        if self._fetch_tasks.get(cache_key, None) is task:
+            del self._fetch_tasks[cache_key]
+        # Any exception is handled by whoever awaits the task; if nobody does
+        # anymore, don't complain about it
+        if not task.cancelled():
+            task.exception()
+
     @staticmethod
     def _value_as_string(value):
         if not isinstance(value, str) and isinstance(value, collections.abc.Iterable):
@@ -10,6 +10,7 @@ import unidecode
 
 from ... import __homepage__, __project_name__, __version__, errors, jobs
 from ...utils import cached_property, fs, http, image, release, string, video
+from ...utils.webdbs import idmap
 from ..base import TrackerJobsBase
 
 import logging  # isort:skip
@@ -77,6 +78,11 @@ class BbTrackerJobs(TrackerJobsBase):
             await self.tvmaze_job.wait()
             if self.tvmaze_job.output:
                 return self.tvmaze_job.output[0]
+        elif self.imdb_job.is_enabled:
+            # Don't call get_imdb_id(), which calls us
+            await self.imdb_job.wait()
+            if self.imdb_job.output:
+                return idmap.get(self.imdb.name, self.imdb_job.output[0], self.tvmaze.name)
 
     async def try_webdbs(self, webdbs, method, default=None):
         """
@@ -798,6 +804,13 @@ class BbTrackerJobs(TrackerJobsBase):
                 # Use "SxxEyy" string or default to "UNKNOWN_EPISODE"
                 title.append(str(self.release_name.episodes))
 
+        # Probe video file without blocking the event loop so that the
+        # release_info_* properties below get their information from cache.
+        try:
+            await video.tracks_async(self.content_path, default=None)
+        except errors.ContentError:
+            pass
+
         info = [
             # [Source / VideoCodec / AudioCodec / Container / Resolution]
             self.release_info_source,
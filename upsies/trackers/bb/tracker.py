@@ -139,7 +139,7 @@ class BbTracker(TrackerBase):
                 )
                 _log.debug('%s: Getting announce URL from %s', self.name, url)
                 response = await http.get(url, cache=False, user_agent=True)
-                doc = html.parse(response)
+                doc = html.parse(response, only='input')
                 announce_url_tag = doc.find('input', value=re.compile(r'^https?://.*/announce$'))
                 if announce_url_tag:
                     return announce_url_tag['value']
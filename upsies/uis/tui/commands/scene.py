@@ -56,6 +56,10 @@ class scene_check(CommandBase):
 
     If RELEASE is a scene release, make sure it has the correct file size(s) and
     is named properly.
+
+    With --deep, the CRC32 checksum of each file is also verified. This reads
+    all files completely, but multiple CPU cores are used and checksums are
+    cached.
     """
 
     names = ('scene-check', 'scc')
@@ -65,6 +69,10 @@ class scene_check(CommandBase):
             'type': utils.argtypes.release,
             'help': 'Release name or path to release content',
         },
+        ('--deep', '-d'): {
+            'action': 'store_true',
+            'help': 'Verify CRC32 checksums of all files',
+        },
     }
 
     @utils.cached_property
@@ -75,5 +83,6 @@ class scene_check(CommandBase):
                 cache_directory=self.cache_directory,
                 ignore_cache=self.args.ignore_cache,
                 content_path=self.args.RELEASE,
+                deep=self.args.deep,
             ),
         )
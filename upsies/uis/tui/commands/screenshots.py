@@ -50,6 +50,7 @@ class screenshots(CommandBase):
             content_path=self.args.CONTENT,
             timestamps=self.args.timestamps,
             count=self.args.number,
+            snap_to_keyframes=self.config['config']['screenshots']['snap_to_keyframes'],
         )
 
     @utils.cached_property
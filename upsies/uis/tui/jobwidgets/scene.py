@@ -27,16 +27,22 @@ class SceneCheckJobWidget(JobWidgetBase):
     def setup(self):
         self._question = FormattedTextControl('')
         self._radiolist = widgets.RadioList()
+        self._checksum_progress = widgets.ProgressBar()
         self._activity_indicator = utils.ActivityIndicator(
             callback=self._handle_activity_indicator_state,
             active=True,
         )
         self.job.signal.register('ask_release_name', self._ask_release_name)
         self.job.signal.register('ask_is_scene_release', self._ask_is_scene_release)
+        self.job.signal.register('checksum_progress', self._handle_checksum_progress)
 
     def _handle_activity_indicator_state(self, state):
         self.job.info = state
 
+    def _handle_checksum_progress(self, percent):
+        self._checksum_progress.percent = percent
+        self.invalidate()
+
     def _ask_release_name(self, release_names):
         _log.debug('Asking for release name: %r', release_names)
         self._activity_indicator.active = False
@@ -87,6 +93,10 @@ class SceneCheckJobWidget(JobWidgetBase):
     def runtime_widget(self):
         return HSplit(
             children=[
+                ConditionalContainer(
+                    filter=Condition(lambda: 0 < self._checksum_progress.percent < 100),
+                    content=self._checksum_progress,
+                ),
                 ConditionalContainer(
                     filter=Condition(lambda: bool(self._radiolist.choices)),
                     content=HSplit(
@@ -4,15 +4,21 @@ Swiss Army knife
 
 import asyncio
 import collections
+import enum
 import functools
 import hashlib
 import importlib
 import inspect
 import itertools
+import json
 import os
 import sys
+import threading
+import time
 import types as _types
 
+from .. import errors
+
 
 def get_aioloop():
     """Return :class:`asyncio.AbstractEventLoop` instance"""
@@ -58,30 +64,76 @@ except ImportError:
                 return value
 
 
-def asyncmemoize(func):
+memoize_cache_directory = None
+"""
+Where :func:`asyncmemoize` stores persistent return values or `None` to keep
+them only in memory
+"""
+
+
+def asyncmemoize(func=None, *, key=None, ttl=None, empty_ttl=None, persistent=False):
     """
     Cache return value of `func` using arguments as the key
 
     The cache key is generated with :func:`semantic_hash`, so arguments don't
     need to be hashable, they just need a unique string representation.
 
-    Exceptions are also cached and re-raised.
+    Exceptions are also cached and re-raised, except for
+    :class:`~.errors.RequestError`, which is usually temporary. Cancellation is
+    not cached.
 
     The decorated function has a `clear_cache` method that can be called to
     remove all cached return values of that function.
+
+    This decorator can be used with or without arguments.
+
+    :param key: Callable that gets the same arguments as `func` and returns the
+        object that is passed to :func:`semantic_hash` (e.g. to normalize
+        arguments)
+    :param ttl: Number of seconds after which cached return values and
+        exceptions expire or `None`
+    :param empty_ttl: Number of seconds after which empty return values (e.g.
+        ``[]`` or ``{}``) expire or `None` to use `ttl`; if this is not `None`,
+        empty return values are only cached in memory
+    :param bool persistent: Whether return values are also stored in
+        :attr:`memoize_cache_directory`; return values must be JSON
+        serializable or :class:`enum.Enum` instances, anything else is only
+        cached in memory
     """
+    if func is None:
+        return functools.partial(asyncmemoize, key=key, ttl=ttl, empty_ttl=empty_ttl, persistent=persistent)
+
     cache = {}
+    cache_name = f'{func.__module__}.{func.__qualname__}' if persistent else None
 
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        key = semantic_hash((args, kwargs))
-        if key not in cache:
+        cache_key = semantic_hash(key(*args, **kwargs) if key else (args, kwargs))
+        now = time.time()
+        entry = cache.get(cache_key, None)
+        if (entry is None or entry[0] < now) and persistent:
+            entry = _read_memoized(cache_name, cache_key)
+            if entry is not None:
+                cache[cache_key] = entry
+
+        if entry is not None and entry[0] >= now:
+            result = entry[1]
+        else:
+            expires = now + ttl if ttl is not None else float('inf')
             try:
-                result = cache[key] = await func(*args, **kwargs)
+                result = await func(*args, **kwargs)
+            except (asyncio.CancelledError, errors.RequestError):
+                cache.pop(cache_key, None)
+                raise
             except BaseException as e:
-                result = cache[key] = e
-        else:
-            result = cache[key]
+                result = e
+            else:
+                if empty_ttl is not None and _is_empty(result):
+                    # Don't remember "nothing found" for long, it may be found soon
+                    expires = now + empty_ttl
+                elif persistent:
+                    _write_memoized(cache_name, cache_key, expires, result)
+            cache[cache_key] = (expires, result)
 
         if isinstance(result, BaseException):
             raise result
@@ -91,10 +143,229 @@ def asyncmemoize(func):
     def clear_cache():
         """Remove any previously cached return values"""
         cache.clear()
+        if persistent and memoize_cache_directory:
+            try:
+                filenames = os.listdir(memoize_cache_directory)
+            except OSError:
+                filenames = ()
+            for filename in filenames:
+                if filename.startswith(f'{cache_name}.'):
+                    try:
+                        os.remove(os.path.join(memoize_cache_directory, filename))
+                    except OSError:
+                        pass
     wrapper.clear_cache = clear_cache
 
     return wrapper
 
+def _is_empty(value):
+    return isinstance(value, collections.abc.Sized) and not value
+
+def _memoized_cache_file(cache_name, cache_key):
+    if memoize_cache_directory:
+        return os.path.join(memoize_cache_directory, f'{cache_name}.{cache_key}.json')
+
+def _read_memoized(cache_name, cache_key):
+    # Return (expiration time, return value) tuple or `None`
+    cache_file = _memoized_cache_file(cache_name, cache_key)
+    if cache_file:
+        try:
+            with open(cache_file, 'r') as f:
+                entry = json.load(f, object_hook=_decode_memoized_value)
+            return (float(entry['expires']), entry['value'])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError, ImportError):
+            pass
+
+def _write_memoized(cache_name, cache_key, expires, value):
+    cache_file = _memoized_cache_file(cache_name, cache_key)
+    if cache_file:
+        try:
+            # JSON doesn't support infinity
+            data = json.dumps(
+                {'expires': min(expires, sys.float_info.max), 'value': value},
+                default=_encode_memoized_value,
+            )
+            fs.write_atomically(cache_file, data)
+        except (TypeError, ValueError, errors.ContentError):
+            pass
+
+def _encode_memoized_value(obj):
+    if isinstance(obj, enum.Enum):
+        return {'__enum__': f'{type(obj).__module__}:{type(obj).__qualname__}', 'value': obj.value}
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def _decode_memoized_value(obj):
+    if '__enum__' in obj:
+        module_name, qualname = obj['__enum__'].split(':')
+        cls = importlib.import_module(module_name)
+        for name in qualname.split('.'):
+            cls = getattr(cls, name)
+        return cls(obj['value'])
+    return obj
+
+
+class LRUCache:
+    """
+    Thread-safe mapping with limited size and optional expiration
+
+    Only :meth:`get`, :meth:`set`, item access and :func:`len` are supported.
+
+    :param maxsize: Maximum number of items or `None` for no limit; the least
+        recently used item is removed if this is exceeded
+    :param ttl: Number of seconds after which an item expires or `None`
+    :param maxbytes: Maximum combined size of all items (see :meth:`set`) or
+        `None` for no limit; least recently used items are removed if this is
+        exceeded
+    """
+
+    CacheInfo = collections.namedtuple(
+        'CacheInfo',
+        ('hits', 'misses', 'maxsize', 'currsize', 'currbytes'),
+        defaults=(0,),
+    )
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=128, ttl=None, maxbytes=None):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._maxbytes = maxbytes
+        self._items = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = self._misses = 0
+
+    def get(self, key, default=None, signature=None):
+        """
+        Return cached value or `default`
+
+        :param signature: Any object that is compared to the `signature` that
+            was passed to :meth:`set`; if they are not equal, the cached value
+            is stale and removed
+        """
+        with self._lock:
+            item = self._items.get(key, None)
+            if item is not None:
+                value, timestamp, stored_signature, _ = item
+                if stored_signature != signature or (
+                    self._ttl is not None and time.monotonic() - timestamp > self._ttl
+                ):
+                    self._remove(key)
+                else:
+                    self._items.move_to_end(key)
+                    self._hits += 1
+                    return value
+            self._misses += 1
+            return default
+
+    def set(self, key, value, signature=None, nbytes=0):
+        """
+        Store `value` under `key`
+
+        :param signature: See :meth:`get`
+        :param int nbytes: Approximate memory usage of `value`; this is only
+            used to enforce `maxbytes`
+        """
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (value, time.monotonic(), signature, nbytes)
+            self._bytes += nbytes
+            while self._items and (
+                (self._maxsize is not None and len(self._items) > self._maxsize)
+                or (self._maxbytes is not None and self._bytes > self._maxbytes)
+            ):
+                self._remove(next(iter(self._items)))
+
+    def _remove(self, key):
+        *_, nbytes = self._items.pop(key)
+        self._bytes -= nbytes
+
+    def __getitem__(self, key):
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        """Remove all items and reset statistics"""
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+            self._hits = self._misses = 0
+
+    def info(self):
+        """Return :class:`CacheInfo` namedtuple with statistics"""
+        with self._lock:
+            return self.CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self._maxsize,
+                currsize=len(self._items),
+                currbytes=self._bytes,
+            )
+
+
+def memoize(maxsize=128, ttl=None, stat_args=()):
+    """
+    Cache return value of decorated function using arguments as the key
+
+    This works like :func:`functools.lru_cache`, but cached return values can
+    also expire and they are discarded if any file they depend on changes.
+    Arguments must be hashable. Exceptions are not cached.
+
+    The decorated function has the methods `cache_clear` and `cache_info` like
+    functions decorated with :func:`functools.lru_cache`.
+
+    :param maxsize: Maximum number of cached return values (see
+        :class:`LRUCache`)
+    :param ttl: Number of seconds after which cached return values expire
+    :param stat_args: Indexes of positional arguments that are file paths or
+        sequences of file paths; if any of those files is created, removed,
+        modified or replaced, the cached return value is discarded
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            signature = _stat_signature(args[i] for i in stat_args if i < len(args))
+            result = cache.get(key, missing, signature=signature)
+            if result is missing:
+                result = func(*args, **kwargs)
+                cache.set(key, result, signature=signature)
+            return result
+
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_info = cache.info
+        return wrapper
+
+    return decorator
+
+def _stat_signature(paths_or_sequences):
+    # Return tuple that changes if any file is created, removed, modified or
+    # replaced
+    signature = []
+    for paths in paths_or_sequences:
+        if isinstance(paths, (str, os.PathLike)):
+            paths = (paths,)
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except (OSError, TypeError, ValueError):
+                signature.append(None)
+            else:
+                signature.append((stat.st_size, stat.st_mtime_ns, stat.st_ino))
+    return tuple(signature)
+
 
 try:
     # New in Python 3.7
@@ -435,6 +706,6 @@ def semantic_hash(obj):
     return hashlib.sha256(bytes(as_str(obj), 'utf-8')).hexdigest()
 
 
-from . import (argtypes, browser, configfiles, daemon, fs, html, http, image,
-               imghosts, iso, release, scene, signal, string, subproc,
-               timestamp, torrent, types, update, video, webdbs)
+from . import (argtypes, browser, configfiles, container, daemon, fs, html,
+               http, image, imghosts, iso, release, scene, signal, string,
+               subproc, timestamp, torrent, types, update, video, webdbs)
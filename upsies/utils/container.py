@@ -0,0 +1,211 @@
+"""
+Read video duration directly from container headers
+
+This is much faster than executing ``mediainfo`` or ``ffprobe``, but only
+Matroska and MP4 are supported.
+"""
+
+import io
+import os
+import struct
+
+import logging  # isort:skip
+_log = logging.getLogger(__name__)
+
+
+def duration(path):
+    """
+    Read duration from Matroska or MP4 header
+
+    :param str path: Path to video file
+
+    :return: Duration in seconds as :class:`float` or `None` if it can't be
+        determined
+    """
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(8)
+            f.seek(0)
+            if magic[:4] == _EBML_MAGIC:
+                return _read_matroska(f)
+            elif magic[4:8] in _MP4_TOP_LEVEL_BOXES:
+                return _read_mp4(f)
+    except (OSError, EOFError, ValueError, struct.error) as e:
+        _log.debug('Failed to read container header from %s: %r', path, e)
+    return None
+
+
+# Don't read absurdly large header elements into memory
+_MAX_HEADER_SIZE = 64 * 1048576
+
+
+# Matroska
+
+_EBML_MAGIC = b'\x1a\x45\xdf\xa3'
+_MKV_SEGMENT = 0x18538067
+_MKV_INFO = 0x1549A966
+_MKV_TIMESTAMP_SCALE = 0x2AD7B1
+_MKV_DURATION = 0x4489
+_MKV_CLUSTER = 0x1F43B675
+
+
+def _read_matroska(f):
+    # Skip EBML header
+    if _read_vint(f, is_id=True) != int.from_bytes(_EBML_MAGIC, 'big'):
+        raise ValueError('Missing EBML header')
+    f.seek(_read_size(f), os.SEEK_CUR)
+
+    if _read_vint(f, is_id=True) != _MKV_SEGMENT:
+        raise ValueError('Missing Segment')
+    segment_size = _read_vint(f)
+    segment_end = None if segment_size is None else f.tell() + segment_size
+
+    # Info is stored before the first Cluster by every sane muxer
+    while segment_end is None or f.tell() < segment_end:
+        try:
+            element_id = _read_vint(f, is_id=True)
+        except EOFError:
+            break
+        size = _read_vint(f)
+        if element_id == _MKV_CLUSTER or size is None:
+            break
+        elif element_id == _MKV_INFO:
+            return _parse_mkv_info(_read_body(f, size))
+        else:
+            f.seek(size, os.SEEK_CUR)
+    raise ValueError('No Info found')
+
+def _parse_mkv_info(data):
+    timestamp_scale = 1000000
+    duration = None
+    for element_id, value in _ebml_children(data):
+        if element_id == _MKV_TIMESTAMP_SCALE:
+            timestamp_scale = _uint(value)
+        elif element_id == _MKV_DURATION:
+            duration = _float(value)
+    if duration:
+        return duration * timestamp_scale / 1e9
+
+def _read_vint(f, is_id=False):
+    # Return EBML variable size integer. Element IDs keep their length marker.
+    # Sizes are returned without length marker or as `None` if the size is
+    # unknown.
+    first = f.read(1)
+    if not first:
+        raise EOFError('Unexpected end of file')
+    first_byte = first[0]
+    length = 1
+    mask = 0x80
+    while not first_byte & mask:
+        mask >>= 1
+        length += 1
+        if length > 8:
+            raise ValueError(f'Invalid variable size integer: {first_byte:#x}')
+
+    rest = f.read(length - 1)
+    if len(rest) != length - 1:
+        raise ValueError('Truncated variable size integer')
+    elif is_id:
+        return int.from_bytes(first + rest, 'big')
+    else:
+        value = int.from_bytes(bytes((first_byte & (mask - 1),)) + rest, 'big')
+        if value == (1 << (7 * length)) - 1:
+            return None
+        return value
+
+def _read_size(f):
+    size = _read_vint(f)
+    if size is None:
+        raise ValueError('Unknown element size')
+    return size
+
+def _read_body(f, size):
+    if size > _MAX_HEADER_SIZE:
+        raise ValueError(f'Header element is too large: {size} bytes')
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError('Truncated header element')
+    return data
+
+def _ebml_children(data):
+    # Yield (element_id, body) tuples from the body of a master element
+    f = io.BytesIO(data)
+    while f.tell() < len(data):
+        element_id = _read_vint(f, is_id=True)
+        yield element_id, _read_body(f, _read_size(f))
+
+def _uint(data):
+    return int.from_bytes(data, 'big')
+
+def _float(data):
+    if len(data) == 4:
+        return struct.unpack('>f', data)[0]
+    elif len(data) == 8:
+        return struct.unpack('>d', data)[0]
+    elif len(data) == 0:
+        return 0.0
+    else:
+        raise ValueError(f'Invalid float size: {len(data)}')
+
+
+# MP4
+
+_MP4_TOP_LEVEL_BOXES = (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide')
+
+
+def _read_mp4(f):
+    file_size = os.fstat(f.fileno()).st_size
+    for box_type, body_size in _mp4_top_level_boxes(f, file_size):
+        if box_type == b'moov':
+            return _parse_mp4_mvhd(_mp4_child(_read_body(f, body_size), b'mvhd'))
+        else:
+            f.seek(body_size, os.SEEK_CUR)
+    raise ValueError('No moov box found')
+
+def _mp4_top_level_boxes(f, file_size):
+    # Yield (box_type, body_size) tuples. The file position is at the start of
+    # the body and callers must move it to the end of the body.
+    while f.tell() + 8 <= file_size:
+        start = f.tell()
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+        elif size == 0:
+            size = file_size - start
+        body_size = size - (f.tell() - start)
+        if body_size < 0 or start + size > file_size:
+            raise ValueError(f'Invalid size of {box_type!r} box: {size}')
+        yield box_type, body_size
+
+def _mp4_children(data):
+    # Yield (box_type, body) tuples from the body of a container box
+    pos = 0
+    while pos + 8 <= len(data):
+        size, box_type = struct.unpack_from('>I4s', data, pos)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', data, pos + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = len(data) - pos
+        if size < header_size or pos + size > len(data):
+            raise ValueError(f'Invalid size of {box_type!r} box: {size}')
+        yield box_type, data[pos + header_size:pos + size]
+        pos += size
+
+def _mp4_child(data, box_type):
+    # Return body of first `box_type` box in container box body `data`
+    for child_type, child_data in _mp4_children(data):
+        if child_type == box_type:
+            return child_data
+    raise ValueError(f'No {box_type!r} box found')
+
+def _parse_mp4_mvhd(data):
+    if data[0] == 1:
+        timescale, duration = struct.unpack_from('>IQ', data, 20)
+        unknown_duration = 0xFFFFFFFFFFFFFFFF
+    else:
+        timescale, duration = struct.unpack_from('>II', data, 12)
+        unknown_duration = 0xFFFFFFFF
+    if timescale and duration and duration != unknown_duration:
+        return duration / timescale
@@ -8,7 +8,7 @@ import re
 import time
 
 from .. import __project_name__, constants, errors
-from . import LazyModule, os_family, types
+from . import LazyModule, memoize, os_family, types
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
@@ -36,7 +36,7 @@ def assert_dir_usable(path):
         raise errors.ContentError(f'{path}: Not executable')
 
 
-@functools.lru_cache(maxsize=None)
+@memoize(maxsize=64)
 def projectdir(content_path, base=None):
     """
     Return path to existing directory in which jobs put their files and cache
@@ -182,6 +182,40 @@ def mkdir(path):
         assert_dir_usable(path)
 
 
+def write_atomically(path, data):
+    """
+    Write `data` to `path` without exposing partially written files
+
+    `data` is written to a temporary file that replaces `path` when it is
+    complete, so concurrent processes see either the old or the new
+    content. Missing parent directories are created.
+
+    :param str path: Path to file
+    :param data: :class:`str` or :class:`bytes`
+
+    :raise ContentError: if writing fails
+    """
+    parent = dirname(path)
+    if parent:
+        mkdir(parent)
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        if isinstance(data, bytes):
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        else:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise errors.ContentError(f'{path}: {e.strerror or e}')
+
+
 def basename(path):
     """
     Return last segment in `path`
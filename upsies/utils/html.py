@@ -2,6 +2,8 @@
 HTML parsing
 """
 
+import functools
+import importlib.util
 import re
 
 from .. import errors
@@ -10,20 +12,56 @@ from . import LazyModule
 bs4 = LazyModule(module='bs4', namespace=globals())
 
 
-def parse(string):
+def parse(string, only=None, parser=None):
     """
     Return :class:`~.bs4.BeautifulSoup` instance
 
     :param string: HTML document
+    :param only: Only build the tree for matching tags; this is a
+        :class:`~.bs4.SoupStrainer` instance or anything its `name` argument
+        accepts (tag name, sequence of tag names, regular expression, etc)
+    :param parser: BeautifulSoup parser name or `None` to use the fastest
+        installed parser (see :func:`default_parser`)
 
     :raise ContentError: if `string` is invalid HTML
     """
+    if only is not None and not isinstance(only, bs4.SoupStrainer):
+        only = bs4.SoupStrainer(only)
     try:
-        return bs4.BeautifulSoup(str(string), features='html.parser')
+        return bs4.BeautifulSoup(
+            str(string),
+            features=parser or default_parser(),
+            parse_only=only,
+        )
     except Exception as e:
         raise errors.ContentError(f'Invalid HTML: {e}')
 
 
+@functools.lru_cache(maxsize=None)
+def default_parser():
+    """
+    Return ``"lxml"`` if :mod:`lxml` is installed, ``"html.parser"`` otherwise
+
+    lxml is several times faster than Python's built-in parser.
+    """
+    if importlib.util.find_spec('lxml') is not None:
+        return 'lxml'
+    else:
+        return 'html.parser'
+
+
+def parsed_size(string):
+    """
+    Return approximate memory usage in bytes of :func:`parse` return value
+
+    Parsed documents usually need 5 to 15 times more memory than the HTML
+    string.
+
+    :param string: HTML document
+    """
+    return len(str(string)) * 10
+
+
 def dump(html, filepath):
     """
     Write `html` to `filepath` for debugging
@@ -50,7 +88,8 @@ def purge_javascript(html):
 
     :param str html: HTML string
     """
-    soup = parse(html)
+    # lxml adds <html> and <body> tags
+    soup = parse(html, parser='html.parser')
     for script_tag in soup.find_all('script'):
         script_tag.decompose()
     return str(soup)
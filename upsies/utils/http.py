@@ -11,6 +11,7 @@ import json
 import os
 import pathlib
 import time
+import weakref
 
 import httpx
 
@@ -30,6 +31,20 @@ _default_headers = {
 # requests concurrently without bugging the server.
 _request_locks = collections.defaultdict(lambda: asyncio.Lock())
 
+max_connections_per_host = 4
+"""Maximum number of simultaneous requests to the same host"""
+
+# Map event loops to dictionaries that map host names to semaphores. Semaphores
+# must be created for the running event loop.
+_host_semaphores = weakref.WeakKeyDictionary()
+
+def _get_host_semaphore(host):
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(max_connections_per_host)
+    return semaphores[host]
+
 # Map domain names to dictionaries of session cookies
 _session_cookies = collections.defaultdict(lambda: {})
 
@@ -323,11 +338,12 @@ async def _request(
             # _log.debug('Request headers: %r', request.headers)
             # _log.debug('Request data: %r', await request.aread())
             try:
-                response = await client.send(
-                    request=request,
-                    auth=auth,
-                    follow_redirects=follow_redirects,
-                )
+                async with _get_host_semaphore(request.url.host):
+                    response = await client.send(
+                        request=request,
+                        auth=auth,
+                        follow_redirects=follow_redirects,
+                    )
                 try:
                     response.raise_for_status()
                 except httpx.HTTPStatusError:
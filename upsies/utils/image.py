@@ -20,14 +20,25 @@ def _ffmpeg_executable():
         return 'ffmpeg'
 
 
-def _make_screenshot_cmd(video_file, timestamp, screenshot_file):
+# Must be smaller than the duration of one frame
+_KEYFRAME_SEEK_OFFSET = 0.001
+
+def _make_screenshot_cmd(video_file, timestamp, screenshot_file, is_keyframe=False):
     # ffmpeg's "image2" image file muxer uses "%" for string formatting
     screenshot_file = screenshot_file.replace('%', '%%')
+    if is_keyframe:
+        # `timestamp` is the position of a keyframe, so we don't need to decode
+        # any frames after the keyframe ffmpeg seeks to. ffmpeg seeks to the
+        # last keyframe before the seek position, so we add a little bit to
+        # make sure we don't end up one GOP earlier because of rounding errors.
+        seek_args = ('-ss', str(round(timestamp + _KEYFRAME_SEEK_OFFSET, 6)), '-noaccurate_seek')
+    else:
+        seek_args = ('-ss', str(timestamp))
     return (
         _ffmpeg_executable(),
         '-y',
         '-loglevel', 'level+error',
-        '-ss', str(timestamp),
+        *seek_args,
         '-i', utils.video.make_ffmpeg_input(video_file),
         '-vframes', '1',
         # Use correct aspect ratio
@@ -36,7 +47,10 @@ def _make_screenshot_cmd(video_file, timestamp, screenshot_file):
         f'file:{screenshot_file}',
     )
 
-def screenshot(video_file, timestamp, screenshot_file, overwrite=False):
+SNAP_TO_KEYFRAMES_MODES = ('off', 'previous', 'nearest')
+"""Valid `snap_to_keyframes` arguments for :func:`screenshot`"""
+
+def screenshot(video_file, timestamp, screenshot_file, overwrite=False, snap_to_keyframes='off'):
     """
     Create single screenshot from video file
 
@@ -45,6 +59,12 @@ def screenshot(video_file, timestamp, screenshot_file, overwrite=False):
     :type timestamp: int or float or "[[H+:]MM:]SS"
     :param str screenshot_file: Path to screenshot file
     :param bool overwrite: Whether to overwrite `screenshot_file` if it exists
+    :param str snap_to_keyframes: ``off`` to seek to `timestamp` exactly,
+        ``previous`` or ``nearest`` to move `timestamp` to a keyframe (see
+        :func:`~.video.keyframes` and :func:`~.video.closest_keyframe`)
+
+        Seeking to a keyframe is much faster for videos with few keyframes
+        because no other frames must be decoded.
 
     .. note:: It is important to use the returned file path because it is passed
               through :func:`~.fs.sanitize_path` to make sure it can exist.
@@ -66,6 +86,9 @@ def screenshot(video_file, timestamp, screenshot_file, overwrite=False):
     elif not isinstance(timestamp, (int, float)):
         raise errors.ScreenshotError(f'Invalid timestamp: {timestamp!r}')
 
+    if snap_to_keyframes not in SNAP_TO_KEYFRAMES_MODES:
+        raise errors.ScreenshotError(f'Invalid snap_to_keyframes value: {snap_to_keyframes!r}')
+
     # Make `screenshot_file` compatible to the file system
     screenshot_file = utils.fs.sanitize_path(screenshot_file)
 
@@ -86,8 +109,25 @@ def screenshot(video_file, timestamp, screenshot_file, overwrite=False):
                 + utils.timestamp.pretty(timestamp)
             )
 
+    # Move timestamp to keyframe
+    is_keyframe = False
+    if snap_to_keyframes != 'off':
+        try:
+            keyframes = utils.video.keyframes(video_file)
+        except errors.ContentError as e:
+            # Snapping is an optimization; seek normally if it doesn't work
+            _log.debug('Not snapping to keyframe: %r', e)
+        else:
+            timestamp = utils.video.closest_keyframe(
+                keyframes,
+                utils.timestamp.parse(timestamp),
+                mode=snap_to_keyframes,
+            )
+            is_keyframe = True
+            _log.debug('Snapped to keyframe: %r', timestamp)
+
     # Make screenshot
-    cmd = _make_screenshot_cmd(video_file, timestamp, screenshot_file)
+    cmd = _make_screenshot_cmd(video_file, timestamp, screenshot_file, is_keyframe=is_keyframe)
     output = utils.subproc.run(cmd, ignore_errors=True, join_stderr=True)
     if not os.path.exists(screenshot_file):
         raise errors.ScreenshotError(
@@ -5,6 +5,8 @@ Base class for image uploaders
 import abc
 import collections
 import copy
+import functools
+import hashlib
 import os
 
 from ... import __project_name__, constants, errors
@@ -149,7 +151,7 @@ class ImageHostBase(abc.ABC):
 
     def _get_url_from_cache(self, image_path):
         cache_file = self._cache_file(image_path)
-        if os.path.exists(cache_file):
+        if cache_file and os.path.exists(cache_file):
             _log.debug('Already uploaded: %s', cache_file)
             try:
                 with open(cache_file, 'r') as f:
@@ -160,35 +162,31 @@ class ImageHostBase(abc.ABC):
 
     def _store_url_to_cache(self, image_path, url):
         cache_file = self._cache_file(image_path)
-        try:
-            fs.mkdir(fs.dirname(cache_file))
-            with open(cache_file, 'w') as f:
-                f.write(url)
-        except OSError as e:
-            msg = e.strerror if getattr(e, 'strerror', None) else e
-            raise RuntimeError(f'Unable to write cache {cache_file}: {msg}')
+        if cache_file:
+            try:
+                fs.mkdir(fs.dirname(cache_file))
+                with open(cache_file, 'w') as f:
+                    f.write(url)
+            except OSError as e:
+                msg = e.strerror if getattr(e, 'strerror', None) else e
+                raise RuntimeError(f'Unable to write cache {cache_file}: {msg}')
 
     def _cache_file(self, image_path):
-        # If image_path is in our cache_directory, the image's file name makes
-        # it unique. This is usually the case when we're uploading
-        # screenshots. If image is not in our cache_directory, use the absolute
-        # path as a unique identifier.
-        if fs.dirname(image_path) == self.cache_directory:
-            image_path = fs.basename(image_path)
-        else:
-            image_path = os.path.abspath(image_path)
-
-        # Make cache file even more unique, e.g. imgbox only has one thumbnail
-        # size per uploaded image, so if we want a different thumbnail size, we
-        # need to upload again.
-        cache_id = self._get_cache_id_as_string()
-        if cache_id:
-            image_path += f'.{cache_id}'
-
-        # Max file name length is usually 255 bytes
-        filename = fs.sanitize_filename(image_path[-200:]) + f'.{self.name}.url'
-
-        return os.path.join(self.cache_directory, filename)
+        # The cache file is identified by the image's content, so identical
+        # images are only uploaded once, no matter where they are stored.
+        # Return `None` if the image can't be read.
+        digest = _get_image_digest(image_path)
+        if digest:
+            # Make cache file even more unique, e.g. imgbox only has one
+            # thumbnail size per uploaded image, so if we want a different
+            # thumbnail size, we need to upload again.
+            cache_id = self._get_cache_id_as_string()
+            if cache_id:
+                digest += f'.{cache_id}'
+
+            # Max file name length is usually 255 bytes
+            filename = fs.sanitize_filename(digest[:200]) + f'.{self.name}.url'
+            return os.path.join(self.cache_directory, filename)
 
     def _get_cache_id_as_string(self):
         def as_str(obj):
@@ -208,10 +206,32 @@ class ImageHostBase(abc.ABC):
     @property
     def cache_id(self):
         """
-        Information that makes an upload unique, aside from the file path
+        Information that makes an upload unique, aside from the image content
 
-        If this returns `None`, the file path is unique enough. Otherwise, the
-        return value should be a string, dictionary, sequence or anything with a
-        readable and unique string representation.
+        Cached URLs are identified by the SHA256 digest of the image file and
+        :attr:`name`. If this returns `None`, that is unique enough. Otherwise,
+        the return value should be a string, dictionary, sequence or anything
+        with a readable and unique string representation, e.g. options that
+        change the uploaded image.
         """
         return None
+
+
+def _get_image_digest(image_path):
+    # Return SHA256 hex digest of the contents of `image_path` or `None` if it
+    # can't be read
+    try:
+        stat = os.stat(image_path)
+        return _get_file_digest(os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return None
+
+# Size and modification time are part of the cache key, so unchanged files are
+# only read once while modified files are read again
+@functools.lru_cache(maxsize=1024)
+def _get_file_digest(filepath, size, mtime):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
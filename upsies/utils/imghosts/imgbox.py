@@ -17,6 +17,12 @@ class ImgboxImageHost(ImageHostBase):
 
     name = 'imgbox'
 
+    @property
+    def cache_id(self):
+        # imgbox generates one thumbnail per upload, so we must upload again if
+        # the thumbnail width changes
+        return {'thumb_width': self.options['thumb_width']}
+
     async def _upload_image(self, image_path):
         gallery = pyimgbox.Gallery(
             thumb_width=self.options['thumb_width'],
@@ -11,16 +11,21 @@ string.
 """
 
 import collections
+import concurrent.futures
+import json
+import math
+import multiprocessing
 import os
 import re
+import sys
 import time
 
 import natsort
 import unidecode
 
-from .. import constants, errors
+from .. import __version__, constants, errors
 from ..utils import iso, scene, webdbs
-from . import LazyModule, cached_property, fs, video
+from . import LazyModule, LRUCache, cached_property, fs, semantic_hash, video
 from .types import ReleaseType
 
 import logging  # isort:skip
@@ -30,6 +35,69 @@ _log = logging.getLogger(__name__)
 logging.getLogger('rebulk').setLevel(logging.WARNING)
 
 _guessit = LazyModule(module='guessit.api', name='_guessit', namespace=globals())
+_guessit_package = LazyModule(module='guessit', name='_guessit_package', namespace=globals())
+
+
+cache_directory = None
+"""
+Where to store :mod:`guessit` results or `None` to keep them only in memory
+"""
+
+_guess_cache = LRUCache(maxsize=1024)
+
+def _run_guessit(path):
+    # Return guessit's guess for `path` as a new dictionary. guessit is slow, so
+    # guesses are cached in memory and, if `cache_directory` is set, on disk.
+    guess = _guess_cache.get(path)
+    if guess is None:
+        # guessit or upsies updates can change the guess
+        cache_key = semantic_hash((path, _guessit_package.__version__, __version__, constants.GUESSIT_OPTIONS))
+        guess = _read_guess_cache(cache_key)
+        if guess is None:
+            guess = {
+                name: _as_json_value(value)
+                for name, value in _guessit.default_api.guessit(path, options=constants.GUESSIT_OPTIONS).items()
+            }
+            _write_guess_cache(cache_key, guess)
+        _guess_cache[path] = guess
+
+    # Callers may change the guess
+    return {name: list(value) if isinstance(value, list) else value
+            for name, value in guess.items()}
+
+def _as_json_value(value):
+    # We only ever use str() of anything that isn't a string or number (e.g.
+    # babelfish.Country or datetime.date), so we can convert it right away
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    elif isinstance(value, list):
+        return [_as_json_value(v) for v in value]
+    else:
+        return str(value)
+
+def _guess_cache_file(cache_key):
+    if cache_directory:
+        return os.path.join(cache_directory, f'{cache_key}.guess')
+
+def _read_guess_cache(cache_key):
+    cache_file = _guess_cache_file(cache_key)
+    if cache_file:
+        try:
+            with open(cache_file, 'r') as f:
+                guess = json.load(f)
+        except (OSError, ValueError):
+            pass
+        else:
+            if isinstance(guess, dict):
+                return guess
+
+def _write_guess_cache(cache_key, guess):
+    cache_file = _guess_cache_file(cache_key)
+    if cache_file:
+        try:
+            fs.write_atomically(cache_file, json.dumps(guess))
+        except (TypeError, ValueError, errors.ContentError) as e:
+            _log.debug('Failed to write cache file %s: %r', cache_file, e)
 
 
 DELIM = r'[ \.-]'
@@ -788,6 +856,195 @@ class ReleaseName(collections.abc.Mapping):
         return sep.join(parts) + f'-{self.group}'
 
 
+# Fast path for well-formed scene/P2P release names like
+# "Title.Year.Resolution.Source.Audio.Video-GROUP" or "Title.S01E02...-GROUP".
+# Everything after the title and year/episode information must be matched by
+# the following slots in the given order. Each slot is optional and provides
+# alternative regular expressions and the values guessit would report for
+# them. If anything isn't matched, guessit is used.
+_fast_parser_slots = tuple(
+    (repeatable, tuple((re.compile(rf'(?:{regex})(?:\.|$)'), fields) for regex, fields in alternatives))
+    for repeatable, alternatives in (
+        (True, (
+            (r'Extended', {'edition': 'Extended'}),
+            (r'Uncut', {'edition': 'Uncut'}),
+            (r'Unrated', {'edition': 'Unrated'}),
+            (r'Remastered', {'edition': 'Remastered'}),
+            (r'Theatrical', {'edition': 'Theatrical'}),
+            (r'IMAX', {'edition': 'IMAX'}),
+        )),
+        (False, (
+            (r'PROPER|REPACK', {'other': 'Proper'}),
+        )),
+        (False, (
+            (r'(?:2160|1080|720|576|480)[pi]', lambda match: {'screen_size': match.group(0).rstrip('.')}),
+        )),
+        (False, (
+            # Streaming services are found by ReleaseInfo._streaming_service_regex,
+            # which needs a delimiter in front
+            (r'(?<=\.)(?:AMZN|NF|DSNP|HMAX|ATVP|HULU|PCOK|PMTP)(?=\.WEB-?(?:DL|Rip)(?:\.|$))', {}),
+        )),
+        (False, (
+            (r'Blu-?[Rr]ay|BLURAY', {'source': 'Blu-ray'}),
+            (r'BDRip', {'source': 'Blu-ray', 'other': 'Rip'}),
+            (r'WEB-?DL', {'source': 'Web'}),
+            (r'WEBRip', {'source': 'Web', 'other': 'Rip'}),
+            (r'HDTV', {'source': 'HDTV'}),
+            (r'DVDRip', {'source': 'DVD', 'other': 'Rip'}),
+        )),
+        (False, (
+            (r'REMUX', {'other': 'Remux'}),
+        )),
+        (True, (
+            # ReleaseInfo._hdr_regexes finds these
+            (r'HDR10\+?|HDR|DV', {}),
+        )),
+        (False, (
+            (r'DDP?(?:[257]\.[01])', lambda match: {
+                'audio_codec': 'Dolby Digital Plus' if 'P' in match.group(0) else 'Dolby Digital',
+                'audio_channels': match.group(0)[-4:-1],
+            }),
+            (r'AAC(?:[257]\.[01])?', lambda match: _fast_parser_channels(match, {'audio_codec': 'AAC'})),
+            (r'FLAC(?:[257]\.[01])?', lambda match: _fast_parser_channels(match, {'audio_codec': 'FLAC'})),
+            (r'DTS-HD\.MA\.[257]\.[01]', lambda match: {'audio_codec': 'DTS-HD', 'audio_channels': match.group(0)[-4:-1]}),
+            (r'DTS', {'audio_codec': 'DTS'}),
+            (r'TrueHD\.[257]\.[01]', lambda match: {'audio_codec': 'Dolby TrueHD', 'audio_channels': match.group(0)[-4:-1]}),
+        )),
+        (False, (
+            (r'Atmos', {'audio_codec': 'Dolby Atmos'}),
+        )),
+        (False, (
+            (r'H\.?264', {'video_codec': 'H.264'}),
+            (r'H\.?265', {'video_codec': 'H.265'}),
+            (r'[xX]264', {'video_codec': 'H.264'}),
+            (r'[xX]265', {'video_codec': 'H.265'}),
+        )),
+    )
+)
+
+_fast_parser_regex = re.compile(
+    r'^(?P<title>[A-Za-z]+(?:\.[A-Za-z]+)*)'
+    r'(?:\.(?P<year>(?:19|20)\d{2}))?'
+    r'(?:\.S(?P<season>\d{2})(?P<episodes>(?:E\d{2})*))?'
+    r'\.(?P<params>.+)'
+    r'-(?P<group>[A-Za-z0-9]+)$'
+)
+
+# Title words that guessit may interpret as something else
+_fast_parser_title_blacklist = frozenset((
+    'aka', 'and', 'audio', 'bluray', 'complete', 'cut', 'directors', 'dual',
+    'dubbed', 'edition', 'episode', 'extended', 'extras', 'final', 'hd', 'hybrid',
+    'imax', 'internal', 'limited', 'multi', 'part', 'proper', 'remastered',
+    'remux', 'repack', 'rip', 'sample', 'season', 'special', 'sub', 'subbed',
+    'theatrical', 'trailer', 'uncut', 'unrated', 'vol', 'volume', 'web',
+))
+
+_fast_parser_guessit_words = None
+
+def _get_fast_parser_guessit_words():
+    # Lower-case words from guessit's configuration that may be matched as
+    # something other than the title (e.g. "Life" for the streaming service
+    # Lifetime). Short words from regular expressions (e.g. "The" from "The-?CW")
+    # are ignored because they are too common in titles.
+    global _fast_parser_guessit_words
+    if _fast_parser_guessit_words is None:
+        words = set()
+
+        def collect(value):
+            if isinstance(value, str):
+                if value.startswith('re:'):
+                    words.update(w for w in re.findall(r'[a-z]{4,}', value[3:].lower()))
+                else:
+                    words.update(w for w in re.split(r'[\W_]+', value.lower()) if w)
+            elif isinstance(value, dict):
+                for key in ('string', 'regex'):
+                    for item in _as_list(value.get(key, ())):
+                        collect(item if key == 'string' else f're:{item}')
+                if not value.keys() & {'string', 'regex', 'value'}:
+                    # Keys with leading underscore are rule settings
+                    for key, item in value.items():
+                        if not key.startswith('_'):
+                            collect(item)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    collect(item)
+
+        advanced_config = _guessit_package.options.load_config({})['advanced_config']
+        for section in ('audio_codec', 'edition', 'other', 'source', 'streaming_service'):
+            collect(advanced_config.get(section, {}))
+        _fast_parser_guessit_words = frozenset(words)
+    return _fast_parser_guessit_words
+
+def _fast_parser_channels(match, fields):
+    channels = re.search(r'[257]\.[01]', match.group(0))
+    if channels:
+        fields['audio_channels'] = channels.group(0)
+    return fields
+
+def _fast_guess(path):
+    # Return guessit-compatible guess for well-formed release names or `None`
+    # if guessit must be used
+    parent, name = os.path.split(path)
+    if name.rpartition('.')[2] in constants.VIDEO_FILE_EXTENSIONS:
+        name = name.rpartition('.')[0]
+
+    # guessit also looks at parent directories
+    if _fast_parser_parent_regex.search(parent):
+        return None
+
+    match = _fast_parser_regex.search(name)
+    if not match or not (match.group('year') or match.group('season')):
+        return None
+
+    title_words = match.group('title').split('.')
+    guessit_words = _get_fast_parser_guessit_words()
+    if any(
+        word.casefold() in _fast_parser_title_blacklist
+        or word.casefold() in guessit_words
+        or len(word) < 3 and word.isupper()
+        for word in title_words
+    ):
+        return None
+
+    guess = {'title': ' '.join(title_words)}
+    if match.group('year'):
+        guess['year'] = int(match.group('year'))
+    if match.group('season'):
+        guess['season'] = int(match.group('season'))
+        episodes = [int(e) for e in match.group('episodes').split('E')[1:]]
+        if episodes:
+            guess['episode'] = episodes[0] if len(episodes) == 1 else episodes
+
+    params = match.group('params') + '.'
+    pos = 0
+    for repeatable, alternatives in _fast_parser_slots:
+        while pos < len(params):
+            for regex, fields in alternatives:
+                slot_match = regex.match(params, pos)
+                if slot_match:
+                    if callable(fields):
+                        fields = fields(slot_match)
+                    for key, value in fields.items():
+                        if key in guess:
+                            guess[key] = _as_list(guess[key]) + [value]
+                        else:
+                            guess[key] = value
+                    pos = slot_match.end()
+                    break
+            else:
+                break
+            if not repeatable:
+                break
+
+    if pos < len(params) or not ('screen_size' in guess or 'source' in guess):
+        return None
+
+    guess['release_group'] = match.group('group')
+    return guess
+
+_fast_parser_parent_regex = re.compile(r'\b(?:(?:19|20)\d{2}|(?i:S\d+(?:E\d+)*)|\d{3,4}[pi])\b')
+
+
 class ReleaseInfo(collections.abc.MutableMapping):
     """
     Parse information from release name or path
@@ -881,6 +1138,18 @@ class ReleaseInfo(collections.abc.MutableMapping):
         """`path` argument as :class:`str`"""
         return self._path
 
+    @property
+    def parser(self):
+        """
+        How :attr:`path` was parsed
+
+        ``"fast"`` for well-formed release names that are parsed with regular
+        expressions, ``"guessit"`` for everything else or ``"record"`` if this
+        instance was created by :meth:`ReleaseRecord.to_release_info`.
+        """
+        self._guess
+        return self._parser
+
     @cached_property
     def _guess(self):
         path = self._abspath
@@ -889,8 +1158,13 @@ class ReleaseInfo(collections.abc.MutableMapping):
         path = re.sub(rf'({DELIM})(?i:AC-?3)({DELIM})', r'\1AC3\2', path)
         path = re.sub(rf'({DELIM})(?i:E-?AC-?3)({DELIM})', r'\1EAC3\2', path)
 
-        # _log.debug('Running guessit on %r with %r', path, constants.GUESSIT_OPTIONS)
-        guess = dict(_guessit.default_api.guessit(path, options=constants.GUESSIT_OPTIONS))
+        guess = _fast_guess(path)
+        if guess is not None:
+            self._parser = 'fast'
+        else:
+            # _log.debug('Running guessit on %r with %r', path, constants.GUESSIT_OPTIONS)
+            guess = _run_guessit(path)
+            self._parser = 'guessit'
         # _log.debug('Original guess: %r', guess)
 
         # We try to do our own episode parsing to preserve order and support
@@ -1291,6 +1565,160 @@ class ReleaseInfo(collections.abc.MutableMapping):
             self._guess['has_commentary'] = bool(value)
 
 
+class ReleaseRecord(collections.abc.Mapping):
+    """
+    Immutable and compact version of :class:`ReleaseInfo`
+
+    This is useful for storing huge amounts of parsed release names, e.g. for
+    matching against a scene database or indexing a library.
+
+    Keys and values are the same as for :class:`ReleaseInfo` with the following
+    exceptions:
+
+      - ``edition`` is a :class:`tuple`
+      - ``episodes`` is a :class:`tuple` of ``(season, (episode, ...))`` tuples
+
+    Values are also available as attributes. Strings are interned, so repeated
+    values like group, source or codec are only stored once.
+
+    :param str path: Release name or path
+    :param fields: Values for all keys
+    """
+
+    _keys = tuple(name[5:] for name in dir(ReleaseInfo) if name.startswith('_get_'))
+
+    __slots__ = ('path',) + _keys
+
+    def __init__(self, path, **fields):
+        unknown_keys = fields.keys() - set(self._keys)
+        if unknown_keys:
+            raise TypeError(f'Unknown keys: {", ".join(sorted(unknown_keys))}')
+        missing_keys = set(self._keys) - fields.keys()
+        if missing_keys:
+            raise TypeError(f'Missing keys: {", ".join(sorted(missing_keys))}')
+
+        object.__setattr__(self, 'path', str(path))
+        for key, value in fields.items():
+            if key == 'edition':
+                value = tuple(sys.intern(e) for e in value)
+            elif key == 'episodes':
+                value = tuple(
+                    (sys.intern(season), tuple(sys.intern(e) for e in episodes))
+                    for season, episodes in dict(value).items()
+                )
+            elif isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(self, key, value)
+
+    @classmethod
+    def from_release_info(cls, info):
+        """Create instance from :class:`ReleaseInfo` instance `info`"""
+        return cls(info.path, **{key: info[key] for key in cls._keys})
+
+    def to_release_info(self):
+        """
+        Return new :class:`ReleaseInfo` instance
+
+        The release name is not parsed again.
+        """
+        info = ReleaseInfo(self.path)
+        info._guess = {'episodes': Episodes()}
+        info._parser = 'record'
+        for key in self._keys:
+            value = getattr(self, key)
+            if key == 'edition':
+                value = list(value)
+            elif key == 'episodes':
+                value = dict(value)
+            info[key] = value
+        return info
+
+    def __getitem__(self, key):
+        if key in self._keys:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __eq__(self, other):
+        if isinstance(other, type(self)):
+            return self._astuple() == other._astuple()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __reduce__(self):
+        # Immutability prevents the default pickling of __slots__
+        return (_make_release_record, (self.path, dict(self)))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.path!r})'
+
+    def _astuple(self):
+        return (self.path,) + tuple(getattr(self, key) for key in self._keys)
+
+def _make_release_record(path, fields):
+    return ReleaseRecord(path, **fields)
+
+
+def parse_many(paths, workers=None, chunksize=64):
+    """
+    Parse many release names or paths with multiple processes
+
+    This is much faster than creating a :class:`ReleaseInfo` for each path in a
+    loop, e.g. to check a whole library or a predb dump.
+
+    :param paths: Sequence of release names or paths
+    :param workers: Maximum number of worker processes or `None` to use one
+        process per CPU; if this is ``1`` or there are only a few `paths`, they
+        are parsed in the calling process
+    :param int chunksize: How many `paths` are sent to a worker process at once
+
+    :return: List of :class:`ReleaseRecord` instances in the same order as
+        `paths`
+    """
+    paths = [str(path) for path in paths]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, math.ceil(len(paths) / chunksize)))
+
+    if workers == 1:
+        return [_parse_one(path) for path in paths]
+
+    # Forking a process that may run an asyncio loop and threads is not safe
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_parse_many_init,
+        initargs=(cache_directory,),
+    ) as executor:
+        return list(executor.map(_parse_one, paths, chunksize=chunksize))
+
+def _parse_many_init(cache_dir):
+    # Worker processes don't inherit module attributes set at runtime
+    global cache_directory
+    cache_directory = cache_dir
+
+    # Import guessit and build its rules once per worker instead of when the
+    # first path is parsed
+    _guessit.default_api.guessit('The.Foo.2010.1080p.BluRay.x264-ASDF', options=constants.GUESSIT_OPTIONS)
+    _get_fast_parser_guessit_words()
+
+def _parse_one(path):
+    return ReleaseRecord.from_release_info(ReleaseInfo(path))
+
+
 class Episodes(dict):
     """
     :class:`dict` subclass that maps season numbers to lists of episode numbers
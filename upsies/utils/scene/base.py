@@ -39,6 +39,14 @@ class SceneDbApiBase(abc.ABC):
     def default_config(self):
         """Default user configuration as a dictionary"""
 
+    is_complete = True
+    """
+    Whether finding nothing means the release doesn't exist
+
+    If this is falsy and :meth:`search` finds nothing, other databases are
+    searched by :func:`~.find.search`.
+    """
+
     async def search(self, query, only_existing_releases=None):
         """
         Search for scene release
@@ -57,7 +65,9 @@ class SceneDbApiBase(abc.ABC):
         )
 
     @abc.abstractmethod
-    async def _search(self, keywords, group=None):
+    async def _search(self, keywords, group=None, is_enough=None):
+        # `is_enough` is a callable that gets the results found so far and
+        # returns whether more results are needed. It may be ignored.
         pass
 
     @abc.abstractmethod
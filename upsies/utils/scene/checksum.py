@@ -0,0 +1,220 @@
+"""
+Calculate CRC32 checksums of release files with multiple processes
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import multiprocessing
+import os
+import zlib
+
+from ... import errors
+from .. import LRUCache, fs, get_aioloop, semantic_hash
+
+import logging  # isort:skip
+_log = logging.getLogger(__name__)
+
+
+cache_directory = None
+"""
+Where to store checksums or `None` to keep them only in memory
+"""
+
+max_workers = None
+"""Maximum number of worker processes or `None` to use one process per CPU"""
+
+segment_size = 64 * 1048576
+"""
+Number of bytes that are read by a single worker process
+
+Files are split into segments that are processed in parallel. Smaller segments
+mean more frequent progress updates and more overhead.
+"""
+
+_read_size = 1048576
+
+_checksum_cache = LRUCache(maxsize=1024)
+_executor = None
+
+
+async def crc32(filepath, progress_callback=None):
+    """
+    Return CRC32 checksum of `filepath` as 8 uppercase hexadecimal digits
+
+    Segments of the file (see :attr:`segment_size`) are processed in parallel by
+    a pool of processes that is shared by all calls.
+
+    Checksums are cached by device, inode, size and modification time, so the
+    file is not read again if it is renamed or moved.
+
+    :param filepath: Path to file
+    :param progress_callback: Callable that gets `filepath`, the number of bytes
+        processed and the file size as positional arguments
+
+    :raise ContentError: if `filepath` can't be read
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError as e:
+        msg = e.strerror if e.strerror else str(e)
+        raise errors.ContentError(f'{filepath}: {msg}')
+
+    cache_key = semantic_hash((stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    checksum = _read_cache(cache_key)
+    if checksum is None:
+        checksum = await _calculate_crc32(filepath, stat.st_size, progress_callback)
+        _write_cache(cache_key, checksum)
+    else:
+        _log.debug('Using cached checksum: %s: %s', filepath, checksum)
+        if progress_callback:
+            progress_callback(filepath, stat.st_size, stat.st_size)
+    return checksum
+
+
+async def _calculate_crc32(filepath, size, progress_callback):
+    loop = get_aioloop()
+    executor = _get_executor()
+    futures = [
+        loop.run_in_executor(executor, _crc32_segment, str(filepath), offset, min(segment_size, size - offset))
+        for offset in range(0, size, segment_size)
+    ]
+
+    segments = []
+    bytes_done = 0
+    try:
+        for future in asyncio.as_completed(futures):
+            offset, length, checksum = await future
+            segments.append((offset, length, checksum))
+            bytes_done += length
+            if progress_callback:
+                progress_callback(filepath, bytes_done, size)
+    except OSError as e:
+        msg = e.strerror if e.strerror else str(e)
+        raise errors.ContentError(f'{filepath}: {msg}')
+    except concurrent.futures.process.BrokenProcessPool as e:
+        shutdown()
+        raise errors.ContentError(f'{filepath}: {e}')
+    finally:
+        for future in futures:
+            future.cancel()
+
+    checksum = 0
+    for _, length, segment_checksum in sorted(segments):
+        checksum = _crc32_combine(checksum, segment_checksum, length)
+    return f'{checksum:08X}'
+
+
+def shutdown():
+    """
+    Terminate worker processes
+
+    This is called automatically when the interpreter exits. Worker processes
+    are started again by the next :func:`crc32` call.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # Forking a process that may run an asyncio loop and threads is not safe
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+# The executor must be gone before the interpreter tears down the modules it
+# uses in its callbacks
+atexit.register(shutdown)
+
+
+def _crc32_segment(filepath, offset, length):
+    # Return `offset`, `length` and CRC32 of `length` bytes starting at `offset`
+    checksum = 0
+    buffer = bytearray(_read_size)
+    view = memoryview(buffer)
+    remaining = length
+    with open(filepath, 'rb', buffering=0) as f:
+        f.seek(offset)
+        while remaining > 0:
+            chunk_size = f.readinto(view[:min(remaining, _read_size)])
+            if not chunk_size:
+                raise OSError(f'File was truncated while reading: {filepath}')
+            checksum = zlib.crc32(view[:chunk_size], checksum)
+            remaining -= chunk_size
+    return offset, length, checksum
+
+
+def _crc32_combine(crc1, crc2, length2):
+    # Return CRC32 of the concatenation of two byte sequences from their CRC32s
+    # and the length of the second sequence (port of zlib's crc32_combine())
+    if length2 <= 0:
+        return crc1
+
+    odd = [0xEDB88320] + [1 << n for n in range(31)]
+    even = _gf2_matrix_square(odd)
+    odd = _gf2_matrix_square(even)
+    while True:
+        even = _gf2_matrix_square(odd)
+        if length2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+
+        odd = _gf2_matrix_square(even)
+        if length2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+
+    return crc1 ^ crc2
+
+def _gf2_matrix_times(matrix, vector):
+    result = 0
+    index = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[index]
+        vector >>= 1
+        index += 1
+    return result
+
+def _gf2_matrix_square(matrix):
+    return [_gf2_matrix_times(matrix, row) for row in matrix]
+
+
+def _cache_file(cache_key):
+    if cache_directory:
+        return os.path.join(cache_directory, f'{cache_key}.crc32')
+
+def _read_cache(cache_key):
+    checksum = _checksum_cache.get(cache_key)
+    if checksum is None:
+        cache_file = _cache_file(cache_key)
+        if cache_file:
+            try:
+                with open(cache_file, 'r') as f:
+                    checksum = f.read().strip()
+            except OSError:
+                pass
+            else:
+                if len(checksum) == 8:
+                    _checksum_cache[cache_key] = checksum
+                else:
+                    checksum = None
+    return checksum
+
+def _write_cache(cache_key, checksum):
+    _checksum_cache[cache_key] = checksum
+    cache_file = _cache_file(cache_key)
+    if cache_file:
+        try:
+            fs.write_atomically(cache_file, checksum)
+        except errors.ContentError as e:
+            _log.debug('Failed to write cache file %s: %r', cache_file, e)
@@ -3,6 +3,8 @@ Classes and functions that are not specific to
 :class:`~.base.SceneDbApiBase` subclasses
 """
 
+import asyncio
+import os
 import re
 
 from .. import release
@@ -39,6 +41,25 @@ def get_needed_keys(release_info):
     return tuple(needed_keys)
 
 
+def normalize_release_name(release):
+    """
+    Return `release` in a form that is suitable as a cache key
+
+    Surrounding whitespace and redundant or trailing path separators are
+    removed from release names and paths. Existing paths are made absolute so
+    the same relative path from different working directories doesn't produce
+    the same key. Anything that isn't a :class:`str` (e.g.
+    :class:`~.release.ReleaseInfo`) is returned unchanged.
+    """
+    if isinstance(release, str):
+        release = release.strip()
+        if release:
+            if os.path.exists(release):
+                return os.path.abspath(release)
+            return os.path.normpath(release)
+    return release
+
+
 def get_season_pack_name(release_name):
     """Remove episode information (e.g. "E03") from `release_name`"""
     # Remove episode(s) from release name to create season pack name
@@ -65,3 +86,38 @@ def get_season_pack_name(release_name):
         season_pack = re.sub(rf'\b{episode_title_regex}\W', '', season_pack)
 
     return season_pack
+
+
+async def request_pages(request_page, pages, is_done=None):
+    """
+    Request multiple pages of search results concurrently
+
+    How many requests are made simultaneously is limited by
+    :attr:`~.http.max_connections_per_host`.
+
+    :param request_page: Coroutine function that takes a page number
+    :param pages: Sequence of page numbers
+    :param is_done: Callable that takes a dictionary that maps page numbers to
+        return values of `request_page` for every finished page and returns
+        whether the remaining pages are not needed, or `None` to request all
+        `pages`
+
+    :raise RequestError: if any request fails
+
+    :return: Dictionary that maps page numbers to return values of
+        `request_page`, sorted by page number
+    """
+    tasks = {asyncio.ensure_future(request_page(page)): page for page in pages}
+    finished = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finished[tasks[task]] = task.result()
+            if is_done and is_done(dict(sorted(finished.items()))):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+    return dict(sorted(finished.items()))
@@ -2,11 +2,12 @@
 Search for scene release
 """
 
+import asyncio
 import collections
 import re
 
 from ... import constants, errors
-from .. import LazyModule, asyncmemoize, fs, release
+from .. import LazyModule, asyncmemoize, fs, get_aioloop, release
 from . import common, verify
 
 import logging  # isort:skip
@@ -14,27 +15,74 @@ _log = logging.getLogger(__name__)
 
 natsort = LazyModule(module='natsort', namespace=globals())
 
+hedge_delay = 1.0
+"""
+Seconds to wait for a response from a scene database before :func:`search`
+also queries the next database
+
+If this is `None`, databases are queried one after the other.
+"""
+
+max_concurrent_episode_searches = 4
+"""Maximum number of concurrent searches for the episodes of a season pack"""
+
 
-@asyncmemoize
-async def search(query, dbs=('predbovh', 'srrdb'), only_existing_releases=None):
+def _search_cache_key(query, *args, **kwargs):
+    # Scene databases are case-insensitive
+    if isinstance(query, SceneQuery):
+        query = (tuple(kw.casefold() for kw in query.keywords), (query.group or '').casefold(), query.episodes)
+    else:
+        query = common.normalize_release_name(query)
+    return (query, args, kwargs)
+
+
+@asyncmemoize(
+    key=_search_cache_key,
+    ttl=constants.SCENE_CACHE_TTL,
+    empty_ttl=constants.SCENE_EMPTY_CACHE_TTL,
+    persistent=True,
+)
+async def search(query, dbs=('localdb', 'predbovh', 'srrdb'), only_existing_releases=None, union=False):
     """
     Search scene databases
 
     Try to get search results from multiple :class:`~.base.SceneDbApiBase`
     instances and return the first response.
 
+    The first database in `dbs` is queried first. If it doesn't respond within
+    :attr:`hedge_delay` seconds or if its request fails, the next database is
+    queried as well, and so on. The first useful response wins and any other
+    pending requests are cancelled.
+
+    Databases that aren't :attr:`~.base.SceneDbApiBase.is_complete` (e.g. the
+    local database) are queried at the same time and their results are added
+    to the response. They never answer a query on their own unless there are
+    no other databases in `dbs`.
+
+    If `union` is truthy, all databases are queried concurrently and their
+    results are combined.
+
+    If the local database is in `dbs` and it exists, results from other
+    databases are added to it.
+
     Failed requests are ignored unless all requests fail, in which case they are
     combined into a single :class:`~.errors.RequestError`.
 
     If there are no results and `query` is a directory path that looks like a
     season pack, perform one search per video file in that directory or any
-    subdirectory. This is necessary to find mixed season packs.
+    subdirectory. This is necessary to find mixed season packs. Episodes are
+    searched concurrently (see :attr:`max_concurrent_episode_searches`).
 
     :param query: :class:`SceneQuery` object or :class:`str` to pass to
         :meth:`SceneQuery.from_string` or :class:`~.collections.abc.Mapping` to
         pass to :meth:`SceneQuery.from_release`
     :param dbs: Sequence of :attr:`~.base.SceneDbApiBase.name` values
     :param only_existing_releases: See :meth:`.SceneQuery.search`
+    :param bool union: Whether to combine results from all `dbs`
+
+    Results are cached for :attr:`~.constants.SCENE_CACHE_TTL` seconds, also
+    across sessions. Empty results are only cached for
+    :attr:`~.constants.SCENE_EMPTY_CACHE_TTL` seconds in memory.
 
     :return: Sequence of release names (:class:`str`)
 
@@ -47,40 +95,184 @@ async def search(query, dbs=('predbovh', 'srrdb'), only_existing_releases=None):
     elif isinstance(query, collections.abc.Mapping):
         query = SceneQuery.from_release(query)
 
-    results = await _multisearch(dbs, query, only_existing_releases)
+    results = await _multisearch(dbs, query, only_existing_releases, union=union)
     if results:
         return results
     elif path:
-        combined_results = []
-        for episode_query in _generate_episode_queries(path):
-            results = await _multisearch(dbs, episode_query, only_existing_releases)
-            combined_results.extend(results)
-        return combined_results
+        return await _search_episodes(dbs, path, only_existing_releases, union=union)
+
+
+async def _search_episodes(dbs, path, only_existing_releases, union=False):
+    # Search for each episode in season pack concurrently
+    episode_queries = []
+    for episode_query in _generate_episode_queries(path):
+        if episode_query not in episode_queries:
+            episode_queries.append(episode_query)
 
+    semaphore = asyncio.Semaphore(max_concurrent_episode_searches)
 
-async def _multisearch(dbs, query, only_existing_releases):
+    async def search_episode(episode_query):
+        async with semaphore:
+            return await _multisearch(dbs, episode_query, only_existing_releases, union=union)
+
+    tasks = [asyncio.ensure_future(search_episode(episode_query))
+             for episode_query in episode_queries]
+    try:
+        episode_results = await asyncio.gather(*tasks)
+    finally:
+        # Don't leave any searches running if one of them failed
+        for task in tasks:
+            task.cancel()
+
+    combined_results = []
+    for results in episode_results:
+        for result in results:
+            if result not in combined_results:
+                combined_results.append(result)
+    return combined_results
+
+
+async def _multisearch(dbs, query, only_existing_releases, union=False):
     # Send the same query to multiple DBs
     from . import scenedb
 
-    exceptions = []
-    for db_name in dbs:
-        db = scenedb(db_name)
+    db_names = tuple(dbs)
+    dbs = [scenedb(db_name) for db_name in db_names]
+    if union:
+        results = await _union_search(dbs, query, only_existing_releases)
+    else:
+        complete_dbs = [db for db in dbs if db.is_complete]
+        incomplete_dbs = [db for db in dbs if not db.is_complete]
+        if not complete_dbs:
+            results = await _union_search(incomplete_dbs, query, only_existing_releases)
+        elif not incomplete_dbs:
+            results = await _hedged_search(complete_dbs, query, only_existing_releases)
+        else:
+            results = await _supplemented_search(complete_dbs, incomplete_dbs, query, only_existing_releases)
+
+    if results and 'localdb' in db_names:
+        await get_aioloop().run_in_executor(None, _add_to_localdb, results)
+    _log.debug('Returning scene search results: %r', results)
+    return results
+
+
+async def _supplemented_search(complete_dbs, incomplete_dbs, query, only_existing_releases):
+    # Incomplete DBs (e.g. the local database) only know some releases, so their
+    # results can't replace a response from a complete DB, but they may know
+    # releases the complete DBs don't know about.
+    incomplete_task = asyncio.ensure_future(
+        _union_search(incomplete_dbs, query, only_existing_releases)
+    )
+    try:
+        results = await _hedged_search(complete_dbs, query, only_existing_releases)
         try:
-            results = await db.search(query, only_existing_releases=only_existing_releases)
+            incomplete_results = await incomplete_task
         except errors.RequestError as e:
-            _log.debug('Collecting scene search error: %r', e)
-            exceptions.append(e)
-        else:
-            _log.debug('Returning scene search results: %r', results)
-            return results
+            _log.debug('Ignoring error from incomplete database: %r', e)
+            incomplete_results = []
+    finally:
+        incomplete_task.cancel()
+
+    known = {release_name.casefold() for release_name in results}
+    return list(results) + [
+        release_name for release_name in incomplete_results
+        if release_name.casefold() not in known
+    ]
+
+
+async def _hedged_search(dbs, query, only_existing_releases):
+    # Query DBs in order, but don't wait for slow or failing DBs. Results from
+    # any DB are returned immediately. "No results" is only returned if every
+    # earlier DB failed, because an earlier DB may still find something.
+    dbs_iter = iter(enumerate(dbs))
+    pending = {}
+    exceptions = {}
+    empty = set()
+
+    def is_settled(index):
+        return all(earlier_index in exceptions for earlier_index in range(index))
+
+    def query_next_db():
+        for index, db in dbs_iter:
+            task = asyncio.ensure_future(db.search(query, only_existing_releases=only_existing_releases))
+            pending[task] = index
+            return
+
+    try:
+        query_next_db()
+        while pending:
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=hedge_delay,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                _log.debug('Scene search is slow, also querying next database')
+
+            # Prefer results from earlier DBs if multiple requests finished
+            for task in sorted(done, key=lambda task: pending[task]):
+                index = pending.pop(task)
+                try:
+                    results = task.result()
+                except errors.RequestError as e:
+                    _log.debug('Collecting scene search error: %r', e)
+                    exceptions[index] = e
+                else:
+                    if results:
+                        return results
+                    _log.debug('No results from database #%d', index)
+                    empty.add(index)
+
+                if empty and is_settled(min(empty)):
+                    return []
+
+            # Timeout, error or no results while an earlier DB is pending
+            query_next_db()
+    finally:
+        for task in pending:
+            task.cancel()
 
     if exceptions:
-        msg = 'All queries failed: ' + ', '.join(str(e) for e in exceptions)
+        msg = 'All queries failed: ' + ', '.join(str(exceptions[index]) for index in sorted(exceptions))
         raise errors.RequestError(msg)
     else:
         return []
 
 
+async def _union_search(dbs, query, only_existing_releases):
+    # Query all DBs concurrently and combine their results
+    async def search_db(db):
+        try:
+            return await db.search(query, only_existing_releases=only_existing_releases)
+        except errors.RequestError as e:
+            _log.debug('Collecting scene search error: %r', e)
+            return e
+
+    responses = await asyncio.gather(*(search_db(db) for db in dbs))
+    exceptions = [response for response in responses if isinstance(response, errors.RequestError)]
+    if exceptions and len(exceptions) == len(responses):
+        msg = 'All queries failed: ' + ', '.join(str(e) for e in exceptions)
+        raise errors.RequestError(msg)
+
+    combined_results = {}
+    for response in responses:
+        if not isinstance(response, errors.RequestError):
+            for release_name in response:
+                combined_results.setdefault(release_name.casefold(), release_name)
+    return natsort.natsorted(combined_results.values(), key=str.casefold)
+
+
+def _add_to_localdb(release_names):
+    # Mirror search results in the local database if it exists. This is
+    # blocking and should be run in an executor.
+    from . import scenedb
+
+    try:
+        scenedb('localdb').add(release_names)
+    except errors.RequestError as e:
+        _log.debug('Failed to add search results to local database: %r', e)
+
+
 def _generate_episode_queries(path):
     info = release.ReleaseInfo(path)
     if info['type'] is release.ReleaseType.season:
@@ -204,7 +396,10 @@ class SceneQuery:
         information more intuitively.
 
         :param search_coro_func: Coroutine function with the call signature
-            `(keywords, group)` that returns a sequence of release names
+            `(keywords, group, is_enough)` that returns a sequence of release
+            names; `is_enough` is a callable that gets a sequence of release
+            names and returns whether they contain every wanted episode, which
+            means no more results are needed (e.g. from other pages)
         :param bool only_existing_releases: If this is truthy (the default), the
             results contain all episodes for every season pack in
             :attr:`keywords`. Otherwise, fake season pack release names are
@@ -212,9 +407,31 @@ class SceneQuery:
         """
         if only_existing_releases is None:
             only_existing_releases = True
-        results = await search_coro_func(self.keywords, group=self.group)
+        results = await search_coro_func(self.keywords, group=self.group, is_enough=self._has_all_episodes)
         return self._handle_results(results, only_existing_releases)
 
+    def _has_all_episodes(self, results):
+        # Whether every wanted episode is in `results`. Season packs and
+        # queries without episodes need all results. Without a group, we need
+        # the releases from all groups, which may be on later pages.
+        if not self.group or not self.episodes or not all(self.episodes.values()):
+            return False
+
+        found = set()
+        for result in results:
+            for season, episodes in release.Episodes.from_string(result).items():
+                found.update((season, episode) for episode in episodes)
+
+        for season, episodes in self.episodes.items():
+            for episode in episodes:
+                if season:
+                    if (season, episode) not in found:
+                        return False
+                elif not any(episode == found_episode for _, found_episode in found):
+                    # Empty season means any season
+                    return False
+        return True
+
     def _handle_results(self, results, only_existing_releases):
         def sorted_and_deduped(results):
             return natsort.natsorted(set(results), key=str.casefold)
@@ -0,0 +1,199 @@
+import contextlib
+import os
+import re
+import sqlite3
+
+from ... import constants, errors
+from .. import get_aioloop
+from . import base
+
+import logging  # isort:skip
+_log = logging.getLogger(__name__)
+
+
+class LocaldbApi(base.SceneDbApiBase):
+    """
+    Local SQLite database with a full-text index of scene release names
+
+    The database is optional. It doesn't exist until release names are added by
+    :meth:`import_dump`, :meth:`add` or :meth:`refresh`. Release names found by
+    other databases are added automatically by :func:`~.find.search` if the
+    database exists.
+    """
+
+    name = 'localdb'
+    label = 'Local database'
+
+    default_config = {
+        'database': constants.SCENE_DATABASE_FILEPATH,
+    }
+
+    # Release names are never complete, so other databases must always be
+    # searched as well
+    is_complete = False
+
+    _schema = (
+        'CREATE TABLE IF NOT EXISTS releases (name TEXT PRIMARY KEY COLLATE NOCASE)',
+        'CREATE VIRTUAL TABLE IF NOT EXISTS releases_fts USING fts5('
+        'name, content="releases", content_rowid="rowid")',
+        'CREATE TRIGGER IF NOT EXISTS releases_insert AFTER INSERT ON releases BEGIN '
+        'INSERT INTO releases_fts(rowid, name) VALUES (new.rowid, new.name); END',
+        'CREATE TRIGGER IF NOT EXISTS releases_delete AFTER DELETE ON releases BEGIN '
+        "INSERT INTO releases_fts(releases_fts, rowid, name) VALUES ('delete', old.rowid, old.name); END",
+    )
+
+    @property
+    def database(self):
+        """Path to SQLite database file"""
+        return str(self.config['database'])
+
+    @property
+    def exists(self):
+        """Whether :attr:`database` exists"""
+        return os.path.exists(self.database)
+
+    @contextlib.contextmanager
+    def _connection(self, create=False):
+        if not create and not self.exists:
+            yield None
+        else:
+            try:
+                if create:
+                    dirpath = os.path.dirname(self.database)
+                    if dirpath:
+                        os.makedirs(dirpath, exist_ok=True)
+                connection = sqlite3.connect(self.database)
+                try:
+                    with connection:
+                        if create:
+                            for statement in self._schema:
+                                connection.execute(statement)
+                        yield connection
+                finally:
+                    connection.close()
+            except (OSError, sqlite3.Error) as e:
+                raise errors.RequestError(f'{self.label}: {self.database}: {e}')
+
+    async def _search(self, keywords, group, is_enough=None):
+        match = ' '.join(
+            '"' + kw.replace('"', '""') + '"'
+            for kw in keywords
+            if self._token_regex.search(kw)
+        )
+        if group:
+            group_suffix = f'-{group}'.casefold()
+            if not match:
+                match = '"' + group.replace('"', '""') + '"'
+
+        if not match:
+            # Don't return the whole database
+            return []
+
+        # SQLite blocks, but a new connection can be used in any thread
+        results = await get_aioloop().run_in_executor(None, self._select, match)
+        if group:
+            results = [name for name in results if name.casefold().endswith(group_suffix)]
+        _log.debug('%s search for %r: %r', self.label, match, results)
+        return results
+
+    _token_regex = re.compile(r'\w')
+
+    def _select(self, match):
+        with self._connection() as connection:
+            if connection is None:
+                return []
+            rows = connection.execute(
+                'SELECT name FROM releases_fts WHERE releases_fts MATCH ?',
+                (match,),
+            )
+            return [name for name, in rows]
+
+    async def release_files(self, release_name):
+        """Always return an empty :class:`dict`"""
+        return {}
+
+    def add(self, release_names, create=False):
+        """
+        Add release names to :attr:`database`
+
+        :param release_names: Sequence of release names
+        :param bool create: Whether to create :attr:`database` if it doesn't
+            exist; if this is falsy and :attr:`database` doesn't exist, do
+            nothing
+
+        :raise RequestError: if :attr:`database` can't be written
+
+        :return: Number of release names that didn't exist yet
+        """
+        with self._connection(create=create) as connection:
+            if connection is None:
+                return 0
+            added = connection.executemany(
+                'INSERT OR IGNORE INTO releases (name) VALUES (?)',
+                ((name,) for name in self._normalize_release_names(release_names)),
+            ).rowcount
+            _log.debug('Added %d release names to %s', added, self.database)
+            return added
+
+    @staticmethod
+    def _normalize_release_names(release_names):
+        for release_name in release_names:
+            release_name = str(release_name).strip()
+            if release_name:
+                yield release_name
+
+    _dump_line_regex = re.compile(r'^\s*([^\s,;]+)')
+
+    def import_dump(self, filepath):
+        """
+        Add release names from text file to :attr:`database`
+
+        :attr:`database` is created if it doesn't exist.
+
+        :param filepath: Path to file that contains one release name per line;
+            the release name must be the first field if the lines contain
+            commas, semicolons, tabs or spaces (e.g. CSV)
+
+        :raise RequestError: if `filepath` can't be read or :attr:`database`
+            can't be written
+
+        :return: Number of release names that didn't exist yet
+        """
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                return self.add(
+                    (match.group(1) for match in map(self._dump_line_regex.search, f) if match),
+                    create=True,
+                )
+        except OSError as e:
+            msg = e.strerror if e.strerror else str(e)
+            raise errors.RequestError(f'{filepath}: {msg}')
+
+    async def refresh(self, query, dbs=('predbovh', 'predbde', 'srrdb')):
+        """
+        Search online databases and add any results to :attr:`database`
+
+        :attr:`database` is created if it doesn't exist.
+
+        :param query: :class:`~.find.SceneQuery` instance
+        :param dbs: Sequence of :attr:`~.base.SceneDbApiBase.name` values
+
+        Failed requests are ignored unless all requests fail, in which case they
+        are combined into a single :class:`~.errors.RequestError`.
+
+        :return: Number of release names that didn't exist yet
+        """
+        from . import scenedb
+
+        release_names = []
+        exceptions = []
+        for db_name in dbs:
+            try:
+                release_names.extend(await scenedb(db_name).search(query))
+            except errors.RequestError as e:
+                exceptions.append(e)
+
+        if exceptions and len(exceptions) == len(dbs):
+            msg = 'All queries failed: ' + ', '.join(str(e) for e in exceptions)
+            raise errors.RequestError(msg)
+        return await get_aioloop().run_in_executor(None, lambda: self.add(release_names, create=True))
@@ -2,7 +2,7 @@ from base64 import b64decode
 
 from ... import errors
 from .. import http
-from . import base
+from . import base, common
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
@@ -17,10 +17,10 @@ class PredbdeApi(base.SceneDbApiBase):
     _url_base = b64decode('cHJlZGIuZGU=').decode('ascii')
     _search_url = f'https://{_url_base}/api/'
 
-    async def _search(self, keywords, group):
+    async def _search(self, keywords, group, is_enough=None):
         q = self._get_q(keywords, group)
         if q:
-            return await self._request_all_pages(q)
+            return await self._request_all_pages(q, is_enough=is_enough)
         else:
             return ()
 
@@ -36,18 +36,37 @@ class PredbdeApi(base.SceneDbApiBase):
 
     _max_pages = 1000
 
-    async def _request_all_pages(self, q):
+    async def _request_all_pages(self, q, is_enough=None):
+        # We don't know how many pages there are, so we request as many pages
+        # at once as the server allows and stop after the first page that isn't
+        # full
         combined_results = []
         page = 1
         while page < self._max_pages:
-            results, next_page = await self._request_page(q, page)
-            combined_results.extend(results)
-
-            if next_page < 0:
-                # Negative next page means there are no more pages
+            pages = range(page, min(page + http.max_connections_per_host, self._max_pages))
+
+            def is_done(finished):
+                return bool(is_enough and is_enough(combined_results + [
+                    result
+                    for results, _ in finished.values()
+                    for result in results
+                ]))
+
+            finished = await common.request_pages(
+                lambda page: self._request_page(q, page),
+                pages,
+                is_done=is_done,
+            )
+            for results, next_page in finished.values():
+                combined_results.extend(results)
+                if next_page < 0:
+                    # Negative next page means there are no more pages
+                    return combined_results
+
+            if is_done({}):
                 break
             else:
-                page += 1
+                page = pages[-1] + 1
 
         return combined_results
 
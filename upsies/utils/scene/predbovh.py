@@ -1,8 +1,9 @@
+import math
 from base64 import b64decode
 
 from ... import errors
 from .. import http
-from . import base
+from . import base, common
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
@@ -17,9 +18,9 @@ class PredbovhApi(base.SceneDbApiBase):
     _url_base = b64decode('cHJlZGIub3Zo').decode('ascii')
     _search_url = f'https://{_url_base}/api/v1/'
 
-    async def _search(self, keywords, group):
+    async def _search(self, keywords, group, is_enough=None):
         q = self._get_q(keywords, group)
-        return await self._request_all_pages(q)
+        return await self._request_all_pages(q, is_enough=is_enough)
 
     def _get_q(self, keywords, group):
         if group:
@@ -28,24 +29,52 @@ class PredbovhApi(base.SceneDbApiBase):
         kws = (str(kw).lower().strip() for kw in keywords)
         return ' '.join(kw for kw in kws if kw)
 
-    async def _request_all_pages(self, q):
-        combined_results = []
+    # We can request 30 pages per minute before we get an error
+    _max_pages = 30
 
-        # We can request 30 pages per minute before we get an error
-        for page in range(1, 31):
-            results, next_page = await self._request_page(q, page)
-            combined_results.extend(results)
+    async def _request_all_pages(self, q, is_enough=None):
+        # The first response usually tells us how many pages there are, so we
+        # can request the other pages concurrently
+        first_results, page_count = await self._request_page(q, 1)
+        if page_count is None:
+            return await self._request_pages_sequentially(q, first_results, is_enough=is_enough)
+        page_count = min(page_count, self._max_pages)
 
-            # Negative next page means last page
-            if next_page < 0:
+        if page_count <= 1 or (is_enough and is_enough(list(first_results))):
+            return list(first_results)
+
+        async def request_page(page):
+            results, _ = await self._request_page(q, page)
+            return results
+
+        def combine(pages):
+            return [result for results in pages.values() for result in results]
+
+        def is_done(pages):
+            return bool(is_enough and is_enough(combine({1: first_results, **pages})))
+
+        pages = await common.request_pages(request_page, range(2, page_count + 1), is_done=is_done)
+        return combine({1: first_results, **pages})
+
+    async def _request_pages_sequentially(self, q, first_results, is_enough=None):
+        # Request one page after the other until we get a page that isn't full
+        results = list(first_results)
+        page = 1
+        page_count = None
+        while (page_count is None or page < page_count) and page < self._max_pages:
+            if is_enough and is_enough(results):
                 break
+            page += 1
+            page_results, page_count = await self._request_page(q, page)
+            results.extend(page_results)
+        return results
 
-        return combined_results
+    _results_per_page = 100
 
     async def _request_page(self, q, page):
         params = {
             'q': q,
-            'count': 100,
+            'count': self._results_per_page,
             'page': page,
         }
         _log.debug('%s search: %r, %r', self.label, self._search_url, params)
@@ -58,13 +87,17 @@ class PredbovhApi(base.SceneDbApiBase):
             # Extract release names
             results = tuple(result['name'] for result in response['data']['rows'])
 
-            # Is there another page of results?
-            if len(results) >= response['data']['reqCount']:
-                next_page = page + 1
+            # How many pages are there? `None` means we don't know, but there
+            # is at least one more page.
+            total = response['data'].get('total', None)
+            if isinstance(total, int):
+                page_count = max(1, math.ceil(total / self._results_per_page))
+            elif len(results) >= response['data']['reqCount']:
+                page_count = None
             else:
-                next_page = -1
+                page_count = page
 
-            return results, next_page
+            return results, page_count
 
     async def release_files(self, release_name):
         """Always return an empty :class:`dict`"""
@@ -20,7 +20,7 @@ class SrrdbApi(base.SceneDbApiBase):
 
     _keyword_separators_regex = re.compile(r'[,]')
 
-    async def _search(self, keywords, group):
+    async def _search(self, keywords, group, is_enough=None):
         if group:
             keywords = list(keywords)
             keywords.append(f'group:{group}')
@@ -3,14 +3,13 @@ Check if scene release was altered
 """
 
 import asyncio
-import collections
 import difflib
 import os
 import re
 
 from ... import constants, errors, utils
 from ..types import ReleaseType, SceneCheckResult
-from . import common, find, srrdb
+from . import checksum, common, find, srrdb
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
@@ -60,11 +59,14 @@ _nogroup_regexs = (
 )
 
 
-@utils.asyncmemoize
+@utils.asyncmemoize(key=common.normalize_release_name, ttl=constants.SCENE_CACHE_TTL, persistent=True)
 async def is_scene_release(release):
     """
     Check if `release` is a scene release or not
 
+    Results are cached for :attr:`~.constants.SCENE_CACHE_TTL` seconds, also
+    across sessions.
+
     :param release: Release name, path to release or
         :class:`~.release.ReleaseInfo` instance
 
@@ -117,6 +119,10 @@ async def is_mixed_scene_release(directory):
     """
     Whether `directory` is a season pack with scene releases from different
     groups
+
+    Files are searched concurrently (see
+    :attr:`~.find.max_concurrent_episode_searches`), and any pending searches
+    are cancelled as soon as two different groups are found.
     """
     if not os.path.isdir(directory):
         return False
@@ -125,28 +131,51 @@ async def is_mixed_scene_release(directory):
     if release_info['type'] is not ReleaseType.season:
         return False
 
-    groups_found = set()
+    # Ignore files without release group and files that would produce the same
+    # query as a previous file (e.g. samples)
+    filepaths = []
+    queries = []
     for filepath in utils.fs.file_list(directory):
-        # Ignore files without release group
         filepath_info = utils.release.ReleaseInfo(filepath)
         if filepath_info['group']:
+            query = find.SceneQuery.from_release(filepath_info)
+            if query not in queries:
+                queries.append(query)
+                filepaths.append(filepath)
 
-            # Find relevant scene release(s)
-            results = await find.search(filepath)
-            for result in results:
+    semaphore = asyncio.Semaphore(find.max_concurrent_episode_searches)
 
-                # Collect group names
-                result_info = utils.release.ReleaseInfo(result)
-                if result_info['group']:
-                    groups_found.add(result_info['group'])
+    async def get_groups(filepath):
+        # Find relevant scene release(s) and return their groups
+        async with semaphore:
+            results = await find.search(filepath)
+        return {
+            result_info['group']
+            for result_info in (utils.release.ReleaseInfo(result) for result in results)
+            if result_info['group']
+        }
 
-                # If there are 2 or more different groups, we know enough
-                if len(groups_found) >= 2:
-                    return True
+    tasks = [asyncio.ensure_future(get_groups(filepath)) for filepath in filepaths]
+    groups_found = set()
+    try:
+        for task in asyncio.as_completed(tasks):
+            groups_found.update(await task)
+            # If there are 2 or more different groups, we know enough
+            if len(groups_found) >= 2:
+                return True
+    finally:
+        for task in tasks:
+            task.cancel()
 
     return False
 
 
+@utils.asyncmemoize(
+    key=common.normalize_release_name,
+    ttl=constants.SCENE_CACHE_TTL,
+    empty_ttl=constants.SCENE_EMPTY_CACHE_TTL,
+    persistent=True,
+)
 async def release_files(release_name):
     """
     Map release file names to file information
@@ -154,6 +183,10 @@ async def release_files(release_name):
     This function uses :func:`~.find.search` for searching and
     :class:`~.srrdb.SrrdbApi` to get the file information.
 
+    Results are cached for :attr:`~.constants.SCENE_CACHE_TTL` seconds, also
+    across sessions. Empty results are only cached for
+    :attr:`~.constants.SCENE_EMPTY_CACHE_TTL` seconds in memory.
+
     :param str release_name: Exact name of the release
     """
     files = await _srrdb.release_files(release_name)
@@ -328,26 +361,11 @@ async def verify_release_files(content_path, release_name):
 
     fileinfos = await release_files(release_name)
 
-    def get_release_filesize(filename):
-        return fileinfos.get(filename, {}).get('size', None)
-
     # Map file paths to expected file sizes
-    if os.path.isdir(content_path):
-        exp_filesizes = {filepath: get_release_filesize(utils.fs.basename(filepath))
-                         for filepath in utils.fs.file_list(content_path)}
-    else:
-        if len(fileinfos) == 1:
-            filename = tuple(fileinfos)[0]
-            exp_filesize = get_release_filesize(filename)
-            exp_filesizes = {
-                # Title.2015.720p.BluRay.x264-FOO.mkv
-                content_path: exp_filesize,
-                # Title.2015.720p.BluRay.x264-FOO/foo-title.mkv
-                os.path.join(utils.fs.strip_extension(content_path), filename): exp_filesize,
-            }
-        else:
-            filename = utils.fs.basename(content_path)
-            exp_filesizes = {content_path: get_release_filesize(filename)}
+    exp_filesizes = {
+        filepath: fileinfo.get('size', None)
+        for filepath, fileinfo in _map_release_files(content_path, fileinfos).items()
+    }
 
     # Compare expected file sizes to actual file sizes
     _log.debug('File sizes: %r', exp_filesizes)
@@ -376,7 +394,80 @@ async def verify_release_files(content_path, release_name):
     return tuple(e for e in exceptions if e)
 
 
-async def verify_release(content_path, release_name=None):
+def _map_release_files(content_path, fileinfos):
+    # Map local file paths to file information from release_files() (or empty
+    # dictionaries for unknown files)
+    def get_fileinfo(filename):
+        return fileinfos.get(filename, {})
+
+    if os.path.isdir(content_path):
+        return {filepath: get_fileinfo(utils.fs.basename(filepath))
+                for filepath in utils.fs.file_list(content_path)}
+    elif len(fileinfos) == 1:
+        filename = tuple(fileinfos)[0]
+        fileinfo = get_fileinfo(filename)
+        return {
+            # Title.2015.720p.BluRay.x264-FOO.mkv
+            content_path: fileinfo,
+            # Title.2015.720p.BluRay.x264-FOO/foo-title.mkv
+            os.path.join(utils.fs.strip_extension(content_path), filename): fileinfo,
+        }
+    else:
+        filename = utils.fs.basename(content_path)
+        return {content_path: get_fileinfo(filename)}
+
+
+async def verify_release_checksums(content_path, release_name, progress_callback=None):
+    """
+    Check if files released by scene have the correct CRC32 checksum
+
+    This reads every file completely (see :func:`~.checksum.crc32`), so it
+    should only be done after :func:`verify_release_files` found no issues.
+
+    :param content_path: Path to release file or directory
+    :param release_name: Known exact release name, e.g. from :func:`search`
+        results
+    :param progress_callback: See :func:`~.checksum.crc32`
+
+    Files that don't exist or that we don't have a checksum for are ignored.
+
+    The return value is a sequence of :class:`~.errors.SceneError` exceptions:
+
+        * :class:`~.errors.SceneFileChecksumError` if a file has the wrong
+          checksum
+        * :class:`~.errors.SceneError` if a file can't be read
+    """
+    fileinfos = await release_files(release_name)
+    exp_checksums = {
+        filepath: fileinfo['crc']
+        for filepath, fileinfo in _map_release_files(content_path, fileinfos).items()
+        if fileinfo.get('crc') and os.path.isfile(filepath)
+    }
+    _log.debug('Checksums: %r', exp_checksums)
+
+    async def verify_checksum(filepath, exp_checksum):
+        filename = utils.fs.basename(filepath)
+        try:
+            actual_checksum = await checksum.crc32(filepath, progress_callback=progress_callback)
+        except errors.ContentError as e:
+            return errors.SceneError(e)
+        _log.debug('Checking checksum: %s: %r ?= %r', filename, actual_checksum, exp_checksum)
+        if actual_checksum.casefold() != exp_checksum.casefold():
+            return errors.SceneFileChecksumError(
+                filename=filename,
+                original_checksum=exp_checksum.upper(),
+                existing_checksum=actual_checksum,
+            )
+
+    # Files are processed in parallel by checksum.crc32()
+    exceptions = await asyncio.gather(*(
+        verify_checksum(filepath, exp_checksum)
+        for filepath, exp_checksum in exp_checksums.items()
+    ))
+    return tuple(e for e in exceptions if e)
+
+
+async def verify_release(content_path, release_name=None, deep=False, progress_callback=None):
     """
     Find matching scene releases and apply :func:`verify_release_name` and
     :func:`verify_release_files`
@@ -384,14 +475,18 @@ async def verify_release(content_path, release_name=None):
     :param content_path: Path to release file or directory
     :param release_name: Known exact release name or `None` to :func:`search`
         for `content_path`
+    :param bool deep: Whether to also apply :func:`verify_release_checksums`
+        if the release name and file sizes are correct
+    :param progress_callback: See :func:`verify_release_checksums`
 
     :return: :class:`~.types.SceneCheckResult` enum from
         :func:`is_scene_release` and sequence of :class:`~.errors.SceneError`
-        exceptions from :func:`verify_release_name` and
-        :func:`verify_release_files`
+        exceptions from :func:`verify_release_name`,
+        :func:`verify_release_files` and :func:`verify_release_checksums`
     """
+    kwargs = {'deep': deep, 'progress_callback': progress_callback}
     if release_name:
-        return await _verify_release(content_path, release_name)
+        return await _verify_release(content_path, release_name, **kwargs)
 
     # Find possible `release_name` values. For season packs that were released
     # as single episodes, this will get us a sequence of episode release names.
@@ -401,43 +496,44 @@ async def verify_release(content_path, release_name=None):
 
     # Maybe `content_path` was released by scene as it is (as file or directory)
     for existing_release_name in existing_release_names:
-        is_scene_release, exceptions = await _verify_release(content_path, existing_release_name)
+        is_scene_release, exceptions = await _verify_release(content_path, existing_release_name, **kwargs)
         if is_scene_release and not exceptions:
             return SceneCheckResult.true, ()
 
     # Maybe `content_path` is a directory (season pack) and scene released
     # single files (episodes).
-    return await _verify_release_per_file(content_path)
+    return await _verify_release_per_file(content_path, **kwargs)
+
 
+max_concurrent_file_verifications = 8
+"""
+Maximum number of files in a season pack that are verified simultaneously
+
+Requests to each server are limited further by
+:attr:`~.http.max_connections_per_host`.
+"""
 
-async def _verify_release_per_file(content_path):
+async def _verify_release_per_file(content_path, deep=False, progress_callback=None):
     _log.debug('Verifying each file beneath %r', content_path)
-    is_scene_releases = []
-    combined_exceptions = collections.defaultdict(lambda: [])
     filepaths = utils.fs.file_list(content_path, extensions=constants.VIDEO_FILE_EXTENSIONS)
-    for filepath in filepaths:
-        existing_release_names = await find.search(filepath)
-        _log.debug('Search results for %r: %r', filepath, existing_release_names)
+    semaphore = asyncio.Semaphore(max_concurrent_file_verifications)
 
-        # If there are no search results, default to "not a scene release"
-        is_scene_release = SceneCheckResult.false
+    async def verify_file(filepath):
+        async with semaphore:
+            return await _verify_file(filepath, deep=deep, progress_callback=progress_callback)
+
+    tasks = [asyncio.ensure_future(verify_file(filepath))
+             for filepath in filepaths]
+    try:
+        # Results are in the same order as `filepaths`
+        results = await asyncio.gather(*tasks)
+    finally:
+        # Don't leave any verifications running if one of them failed
+        for task in tasks:
+            task.cancel()
 
-        # Match each existing_release_name against filepath
-        for existing_release_name in existing_release_names:
-            is_scene_release, exceptions = await _verify_release(filepath, existing_release_name)
-            _log.debug('Verified %r against %r: %r, %r',
-                       filepath, existing_release_name, is_scene_release, exceptions)
-            if is_scene_release and not exceptions:
-                # Match found, don't check other existing_release_names
-                break
-            elif is_scene_release:
-                # Remember exceptions per file (makes debugging easier)
-                combined_exceptions[filepath].extend(exceptions)
-
-        # Remember the SceneCheckResult when the for loop ended. True if we
-        # found a scene release at any point, other it's the value of the last
-        # existing_release_name.
-        is_scene_releases.append(is_scene_release)
+    is_scene_releases = [is_scene_release for is_scene_release, _ in results]
+    combined_exceptions = [exceptions for _, exceptions in results]
 
     # Collapse `is_scene_releases` into a single value
     if is_scene_releases and all(isr is SceneCheckResult.true for isr in is_scene_releases):
@@ -451,11 +547,40 @@ async def _verify_release_per_file(content_path):
         is_scene_release = SceneCheckResult.unknown
 
     return is_scene_release, tuple(exception
-                                   for exceptions in combined_exceptions.values()
+                                   for exceptions in combined_exceptions
                                    for exception in exceptions)
 
 
-async def _verify_release(content_path, release_name):
+async def _verify_file(filepath, deep=False, progress_callback=None):
+    existing_release_names = await find.search(filepath)
+    _log.debug('Search results for %r: %r', filepath, existing_release_names)
+
+    # If there are no search results, default to "not a scene release"
+    is_scene_release = SceneCheckResult.false
+    file_exceptions = []
+
+    # Match each existing_release_name against filepath
+    for existing_release_name in existing_release_names:
+        is_scene_release, exceptions = await _verify_release(
+            filepath, existing_release_name,
+            deep=deep, progress_callback=progress_callback,
+        )
+        _log.debug('Verified %r against %r: %r, %r',
+                   filepath, existing_release_name, is_scene_release, exceptions)
+        if is_scene_release and not exceptions:
+            # Match found, don't check other existing_release_names
+            break
+        elif is_scene_release:
+            # Remember exceptions per file (makes debugging easier)
+            file_exceptions.extend(exceptions)
+
+    # Return the SceneCheckResult when the for loop ended. True if we found a
+    # scene release at any point, other it's the value of the last
+    # existing_release_name.
+    return is_scene_release, file_exceptions
+
+
+async def _verify_release(content_path, release_name, deep=False, progress_callback=None):
     _log.debug('Verifying %r against release: %r', content_path, release_name)
 
     # Stop other checks if this is not a scene release
@@ -474,4 +599,12 @@ async def _verify_release(content_path, release_name):
 
     # verify_release_files() can produce multiple exceptions, so it returns them
     exceptions.extend(await verify_release_files(content_path, release_name))
+
+    # Don't read all files if we already know something is wrong
+    if deep and all(isinstance(e, errors.SceneMissingInfoError) for e in exceptions):
+        exceptions.extend(await verify_release_checksums(
+            content_path, release_name,
+            progress_callback=progress_callback,
+        ))
+
     return is_scene, tuple(exceptions)
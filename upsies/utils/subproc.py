@@ -2,10 +2,12 @@
 Execute external commands
 """
 
+import asyncio
 import os
+import weakref
 
 from .. import errors
-from ..utils import LazyModule
+from ..utils import LazyModule, LRUCache
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
@@ -13,7 +15,21 @@ _log = logging.getLogger(__name__)
 subprocess = LazyModule(module='subprocess', namespace=globals())
 shlex = LazyModule(module='shlex', namespace=globals())
 
-_command_output_cache = {}
+# Output of commands that are executed with `cache=True`
+_command_output_cache = LRUCache(maxsize=256, ttl=3600)
+
+max_concurrent_processes = 4
+"""Maximum number of processes started by :func:`run_async` at the same time"""
+
+# Semaphores must be created for the running event loop
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore():
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(max_concurrent_processes)
+    return _semaphores[loop]
 
 
 def run(argv, ignore_errors=False, join_stderr=False, cache=False):
@@ -34,8 +50,9 @@ def run(argv, ignore_errors=False, join_stderr=False, cache=False):
     :rtype: str
     """
     argv = tuple(str(arg) for arg in argv)
-    if cache and argv in _command_output_cache:
-        stdout, stderr = _command_output_cache[argv]
+    cached = _command_output_cache.get(argv) if cache else None
+    if cached:
+        stdout, stderr = cached
     else:
         fh_stdout = subprocess.PIPE
         if join_stderr:
@@ -61,3 +78,81 @@ def run(argv, ignore_errors=False, join_stderr=False, cache=False):
     if stderr and not ignore_errors:
         raise errors.ProcessError(stderr)
     return stdout
+
+
+async def run_async(argv, ignore_errors=False, join_stderr=False, cache=False, timeout=None):
+    """
+    Execute command in subprocess without blocking the event loop
+
+    Arguments and return value are the same as for :func:`run`. The output
+    cache is also shared with :func:`run`.
+
+    No more than :attr:`max_concurrent_processes` commands are executed at the
+    same time. If the returned coroutine is cancelled, the process is killed.
+
+    :param timeout: Maximum number of seconds the command may run or `None`
+
+    :raise DependencyError: if the command fails to execute
+    :raise ProcessError: if stdout is not empty and `ignore_errors` is `False`
+        or if the command takes longer than `timeout` seconds
+
+    :return: Output from process
+    :rtype: str
+    """
+    argv = tuple(str(arg) for arg in argv)
+    cached = _command_output_cache.get(argv) if cache else None
+    if cached:
+        stdout, stderr = cached
+    else:
+        async with _get_semaphore():
+            # Another coroutine may have run the same command while we waited
+            cached = _command_output_cache.get(argv) if cache else None
+            if cached:
+                stdout, stderr = cached
+            else:
+                stdout, stderr = await _communicate(argv, join_stderr, timeout)
+                if cache:
+                    _command_output_cache[argv] = (stdout, stderr)
+    if stderr and not ignore_errors:
+        raise errors.ProcessError(stderr)
+    return stdout
+
+
+async def _communicate(argv, join_stderr, timeout):
+    fh_stdout = asyncio.subprocess.PIPE
+    if join_stderr:
+        fh_stderr = asyncio.subprocess.STDOUT
+    else:
+        fh_stderr = asyncio.subprocess.PIPE
+    try:
+        _log.debug('Running: %s', ' '.join(shlex.quote(arg) for arg in argv))
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=fh_stdout,
+            stderr=fh_stderr,
+            stdin=asyncio.subprocess.PIPE,
+        )
+    except OSError:
+        raise errors.DependencyError(f'Missing dependency: {os.path.basename(argv[0])}')
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise errors.ProcessError(f'Timeout after {timeout} seconds: {os.path.basename(argv[0])}')
+    except asyncio.CancelledError:
+        await _kill(proc)
+        raise
+    else:
+        return (
+            stdout.decode('utf-8', errors='replace') if stdout is not None else None,
+            stderr.decode('utf-8', errors='replace') if stderr is not None else None,
+        )
+
+
+async def _kill(proc):
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+    await proc.wait()
@@ -2,14 +2,19 @@
 Video metadata
 """
 
+import asyncio
+import bisect
 import collections
+import concurrent.futures
 import functools
 import json
 import os
 import re
+import shutil
 
 from .. import constants, errors
-from . import closest_number, fs, os_family, release, subproc
+from . import (LRUCache, closest_number, container, fs, memoize, os_family,
+               release, semantic_hash, subproc)
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
@@ -24,17 +29,147 @@ else:
     _ffprobe_executable = 'ffprobe'
 
 
+cache_directory = None
+"""
+Where to store cached video information
+
+If this is set to a falsy value, default to
+:attr:`~.constants.DEFAULT_CACHE_DIRECTORY`.
+"""
+
+def _get_cache_directory():
+    return cache_directory or constants.DEFAULT_CACHE_DIRECTORY
+
+
+def _file_id(path):
+    # Return string that changes if `path` is modified, replaced or moved.
+    # Directories (e.g. Blu-ray images) return `None` because their stat
+    # doesn't change if a file inside them is replaced. Raise OSError if `path`
+    # can't be accessed.
+    stat = os.stat(path)
+    if not os.path.isdir(path):
+        return semantic_hash((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, stat.st_ino))
+
+@functools.lru_cache(maxsize=None)
+def _executable_id(executable):
+    # Return string that changes if `executable` is upgraded or `None` if it
+    # can't be found. We don't run `executable` to get its version because
+    # avoiding subprocesses is the whole point.
+    executable_path = shutil.which(executable)
+    if executable_path:
+        try:
+            return _file_id(os.path.realpath(executable_path))
+        except OSError:
+            pass
+
+def _probe_cache_file(video_file_path):
+    try:
+        file_id = _file_id(video_file_path)
+    except OSError:
+        file_id = None
+    if file_id:
+        filename = fs.sanitize_filename(f'{fs.basename(video_file_path)[-150:]}.{file_id[:16]}.probe')
+        return os.path.join(_get_cache_directory(), filename)
+
+# Parsed probe cache files. Cache file names change when the video file is
+# modified (see _probe_cache_file()), so we only read each one once.
+_probe_caches = LRUCache(maxsize=256)
+
+def _read_probe_cache_file(cache_file):
+    cache = _probe_caches.get(cache_file)
+    if cache is None:
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        _probe_caches[cache_file] = cache
+    return cache
+
+def _read_probe_cache(video_file_path, executable, key):
+    """
+    Return cached output of `executable` for `video_file_path` or `None`
+
+    :param video_file_path: Path to video file
+    :param executable: Name of the program that created the output
+    :param key: Unique name for the output
+    """
+    cache_file = _probe_cache_file(video_file_path)
+    executable_id = _executable_id(executable)
+    if cache_file and executable_id:
+        cache = _read_probe_cache_file(cache_file)
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get('executable_id') == executable_id:
+            _log.debug('Using cached %s %s: %s', executable, key, video_file_path)
+            return entry.get('value')
+
+def _write_probe_cache(video_file_path, executable, key, value):
+    """
+    Store output of `executable` for `video_file_path`
+
+    Any errors are ignored. See :func:`_read_probe_cache`.
+    """
+    cache_file = _probe_cache_file(video_file_path)
+    executable_id = _executable_id(executable)
+    if cache_file and executable_id:
+        cache = dict(_read_probe_cache_file(cache_file))
+        cache[key] = {'executable_id': executable_id, 'value': value}
+        if _write_json_cache_file(cache_file, cache):
+            _probe_caches[cache_file] = cache
+
+def _write_json_cache_file(cache_file, obj):
+    # Write `obj` as JSON to `cache_file`, ignore any errors and return whether
+    # it worked
+    try:
+        fs.write_atomically(cache_file, json.dumps(obj))
+    except (TypeError, ValueError, errors.ContentError) as e:
+        _log.debug('Failed to write cache file %s: %r', cache_file, e)
+        return False
+    else:
+        return True
+
+
 def _run_mediainfo(video_file_path, *args):
     fs.assert_file_readable(video_file_path)
     cmd = (_mediainfo_executable, video_file_path) + args
 
-    # Translate DependencyError to ContentError so callers have to expect less
-    # exceptions. Do not catch ProcessError because things like wrong mediainfo
-    # arguments are bugs.
-    try:
-        return subproc.run(cmd, cache=True)
-    except errors.DependencyError as e:
-        raise errors.ContentError(e)
+    cache_key = ' '.join(args) or 'text'
+    output = _read_probe_cache(video_file_path, _mediainfo_executable, cache_key)
+    if output is None:
+        # Translate DependencyError to ContentError so callers have to expect
+        # less exceptions. Do not catch ProcessError because things like wrong
+        # mediainfo arguments are bugs.
+        try:
+            output = subproc.run(cmd, cache=True)
+        except errors.DependencyError as e:
+            raise errors.ContentError(e)
+        else:
+            _write_probe_cache(video_file_path, _mediainfo_executable, cache_key, output)
+    return output
+
+
+_probe_timeout = 300
+"""Maximum number of seconds a non-blocking ``mediainfo`` call may take"""
+
+async def _run_mediainfo_async(video_file_path, *args):
+    # Same as _run_mediainfo() but without blocking the event loop. The output
+    # is stored in the same caches so that _run_mediainfo() doesn't execute
+    # mediainfo again.
+    fs.assert_file_readable(video_file_path)
+    cmd = (_mediainfo_executable, video_file_path) + args
+
+    cache_key = ' '.join(args) or 'text'
+    output = _read_probe_cache(video_file_path, _mediainfo_executable, cache_key)
+    if output is None:
+        try:
+            output = await subproc.run_async(cmd, cache=True, timeout=_probe_timeout)
+        except errors.DependencyError as e:
+            raise errors.ContentError(e)
+        else:
+            _write_probe_cache(video_file_path, _mediainfo_executable, cache_key, output)
+    return output
 
 
 def mediainfo(path):
@@ -72,12 +207,28 @@ def duration(path, default=NO_DEFAULT_VALUE):
     return _duration(first_video(path))
 
 def _duration(video_file_path):
+    # Reading the duration from the container header is much faster than
+    # executing anything, but it only works for Matroska and MP4.
+    duration = container.duration(video_file_path)
+    if duration:
+        _log.debug('Duration from container header: %s: %r', video_file_path, duration)
+        return duration
+
+    # `mediainfo --Output=JSON` is needed for almost everything else anyway (see
+    # _tracks()), so we only run ffprobe if mediainfo doesn't know the duration.
     try:
-        return _duration_from_ffprobe(video_file_path)
-    except (RuntimeError, errors.DependencyError, errors.ProcessError):
         return _duration_from_mediainfo(video_file_path)
+    except (RuntimeError, errors.ContentError) as e:
+        try:
+            return _duration_from_ffprobe(video_file_path)
+        except (RuntimeError, errors.DependencyError, errors.ProcessError):
+            raise e
 
 def _duration_from_ffprobe(video_file_path):
+    duration = _read_probe_cache(video_file_path, _ffprobe_executable, 'duration')
+    if duration is not None:
+        return duration
+
     cmd = (
         _ffprobe_executable,
         '-v', 'error', '-show_entries', 'format=duration',
@@ -86,9 +237,12 @@ def _duration_from_ffprobe(video_file_path):
     )
     length = subproc.run(cmd, ignore_errors=True)
     try:
-        return float(length.strip())
+        duration = float(length.strip())
     except ValueError:
         raise RuntimeError(f'Unexpected output from {cmd}: {length!r}')
+    else:
+        _write_probe_cache(video_file_path, _ffprobe_executable, 'duration', duration)
+        return duration
 
 def _duration_from_mediainfo(video_file_path):
     tracks = _tracks(video_file_path)
@@ -98,6 +252,107 @@ def _duration_from_mediainfo(video_file_path):
         raise RuntimeError(f'Unexpected tracks: {tracks!r}')
 
 
+def keyframes(path):
+    """
+    Return sorted tuple of keyframe positions of the default video stream in
+    seconds relative to the start of the video
+
+    Finding keyframes requires reading the whole video file, so the result is
+    cached in :attr:`cache_directory` and only re-created if the size or
+    modification time of the video file changes. Keyframes of Blu-ray images
+    are not cached.
+
+    :param str path: Path to video file or directory. :func:`first_video` is
+        applied.
+
+    :raise ContentError: if anything goes wrong
+    """
+    video_file_path = first_video(path)
+    cache_file = _keyframes_cache_file(video_file_path)
+    if cache_file:
+        try:
+            with open(cache_file, 'r') as f:
+                return tuple(json.load(f))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    keyframes = _keyframes_from_ffprobe(video_file_path)
+    if cache_file:
+        _write_json_cache_file(cache_file, keyframes)
+    return keyframes
+
+def _keyframes_cache_file(video_file_path):
+    try:
+        file_id = _file_id(video_file_path)
+    except OSError as e:
+        msg = e.strerror if e.strerror else str(e)
+        raise errors.ContentError(f'{video_file_path}: {msg}')
+    if not file_id:
+        return None
+    filename = fs.sanitize_filename(f'{fs.basename(video_file_path)[-150:]}.{file_id[:16]}.keyframes')
+    return os.path.join(_get_cache_directory(), filename)
+
+def _keyframes_from_ffprobe(video_file_path):
+    cmd = (
+        _ffprobe_executable,
+        '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'format=start_time:packet=pts_time,flags',
+        '-of', 'csv=print_section=1',
+        make_ffmpeg_input(video_file_path),
+    )
+    try:
+        output = subproc.run(cmd, ignore_errors=True)
+    except errors.DependencyError as e:
+        raise errors.ContentError(e)
+
+    start_time = 0.0
+    keyframes = []
+    for line in output.splitlines():
+        fields = line.strip().split(',')
+        try:
+            if fields[0] == 'format':
+                start_time = float(fields[1])
+            elif fields[0] == 'packet' and 'K' in fields[2]:
+                keyframes.append(float(fields[1]))
+        except (IndexError, ValueError):
+            # "N/A" timestamp or unexpected line
+            pass
+
+    if not keyframes:
+        raise errors.ContentError(f'{video_file_path}: Unable to find keyframes')
+    else:
+        # ffprobe reports microseconds, so we round away any floating point
+        # errors from subtracting `start_time`
+        return tuple(sorted(max(0.0, round(kf - start_time, 6)) for kf in keyframes))
+
+
+def closest_keyframe(keyframes, seconds, mode='nearest'):
+    """
+    Snap `seconds` to a keyframe
+
+    :param keyframes: Sorted sequence of keyframe positions in seconds (see
+        :func:`keyframes`)
+    :param seconds: Desired position in seconds
+    :param str mode: ``nearest`` to pick the closest keyframe, ``previous`` to
+        pick the closest keyframe at or before `seconds`
+
+    :raise ValueError: if `mode` is invalid
+
+    :return: Keyframe position in seconds or `seconds` if `keyframes` is empty
+    """
+    if not keyframes:
+        return seconds
+    index = bisect.bisect_right(keyframes, seconds)
+    previous = keyframes[max(0, index - 1)]
+    if mode == 'previous':
+        return previous
+    elif mode == 'nearest':
+        following = keyframes[min(len(keyframes) - 1, index)]
+        return min(previous, following, key=lambda kf: abs(kf - seconds))
+    else:
+        raise ValueError(f'Invalid mode: {mode!r}')
+
+
 def tracks(path, default=NO_DEFAULT_VALUE):
     """
     ``mediainfo --Output=JSON`` as dictionary that maps each track's ``@type``
@@ -114,7 +369,11 @@ def tracks(path, default=NO_DEFAULT_VALUE):
         return default
     return _tracks(first_video(path))
 
-@functools.lru_cache(maxsize=None)
+# This is the only place where video files are probed with mediainfo for
+# metadata. All other functions (duration, width, hdr_format, audio_format,
+# etc) get their information from the return value, so each file is only probed
+# once per process (and once ever thanks to the probe cache).
+@memoize(maxsize=256, stat_args=(0,))
 def _tracks(video_file_path):
     stdout = _run_mediainfo(video_file_path, '--Output=JSON')
     tracks = {}
@@ -610,7 +869,7 @@ def video_format(path, default=NO_DEFAULT_VALUE):
     return video_format
 
 
-@functools.lru_cache(maxsize=None)
+@memoize(maxsize=256, stat_args=(0,))
 def first_video(path):
     """
     Find first video file (e.g. first episode from season)
@@ -677,7 +936,9 @@ def first_video(path):
         return first_file
 
 
-@functools.lru_cache(maxsize=None)
+_max_concurrent_duration_probes = 4
+
+@memoize(maxsize=256, stat_args=(0,))
 def filter_similar_duration(video_file_paths):
     """
     Filter `video_file_paths` for comparable video duration
@@ -686,9 +947,11 @@ def filter_similar_duration(video_file_paths):
 
     This is useful to exclude samples or short .VOBs from DVD images.
 
-    .. note:: Because this function is decorated with
-       :func:`functools.lru_cache`, `video_file_paths` should be a tuple (or any
-       other hashable sequence).
+    Durations are probed concurrently with up to
+    :attr:`_max_concurrent_duration_probes` subprocesses.
+
+    .. note:: Because this function is decorated with :func:`~.utils.memoize`,
+       `video_file_paths` should be a tuple (or any other hashable sequence).
 
     :params video_file_paths: Hashable sequence of video file paths
 
@@ -708,7 +971,10 @@ def filter_similar_duration(video_file_paths):
             except RuntimeError:
                 return None
 
-        durations = {fp: maybe_duration(fp) for fp in video_file_paths}
+        max_workers = min(len(paths), _max_concurrent_duration_probes)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            durations = dict(zip(paths, executor.map(maybe_duration, paths)))
+
         durations = {fp: duration for fp, duration in durations.items() if duration}
         if durations:
             avg = sum(durations.values()) / len(durations)
@@ -718,6 +984,40 @@ def filter_similar_duration(video_file_paths):
         return tuple(fp for fp,l in durations.items()
                      if l >= min_duration)
 
+def _make_async(func):
+    # Return coroutine function that probes the video file with mediainfo
+    # without blocking the event loop before passing `path` to `func`, which
+    # then gets the probe results from cache.
+    async def accessor(path, default=NO_DEFAULT_VALUE):
+        if default is not NO_DEFAULT_VALUE and not os.path.exists(path):
+            return default
+        loop = asyncio.get_running_loop()
+        # first_video() may have to probe durations to find the main feature
+        video_file_path = await loop.run_in_executor(None, first_video, path)
+        await _run_mediainfo_async(video_file_path, '--Output=JSON')
+        return func(path, default=default)
+
+    accessor.__name__ = accessor.__qualname__ = f'{func.__name__}_async'
+    accessor.__doc__ = (
+        f'Asynchronous version of :func:`{func.__name__}`\n\n'
+        '    ``mediainfo`` is executed without blocking the event loop.\n'
+    )
+    return accessor
+
+tracks_async = _make_async(tracks)
+duration_async = _make_async(duration)
+width_async = _make_async(width)
+height_async = _make_async(height)
+resolution_async = _make_async(resolution)
+frame_rate_async = _make_async(frame_rate)
+bit_depth_async = _make_async(bit_depth)
+hdr_format_async = _make_async(hdr_format)
+has_dual_audio_async = _make_async(has_dual_audio)
+has_commentary_async = _make_async(has_commentary)
+audio_format_async = _make_async(audio_format)
+audio_channels_async = _make_async(audio_channels)
+video_format_async = _make_async(video_format)
+
 
 def make_ffmpeg_input(path):
     """
@@ -3,7 +3,7 @@ API for querying services like IMDb
 """
 
 from .. import CaseInsensitiveString, subclasses, submodules
-from . import imdb, tmdb, tvmaze
+from . import idmap, imdb, store, tmdb, tvmaze
 from .base import WebDbApiBase
 from .common import Person, Query, SearchResult
 
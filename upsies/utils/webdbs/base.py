@@ -7,6 +7,7 @@ import asyncio
 import copy
 
 from .. import iso
+from . import store
 from .common import Query
 
 
@@ -69,10 +70,30 @@ class WebDbApiBase(abc.ABC):
         :return: List of :class:`~.common.SearchResult` instances
         """
 
+    def refine_search_results(self, query, previous_query, previous_results):
+        """
+        Get search results for `query` from the results of an earlier search
+
+        This avoids requests when the user makes a query more specific.
+
+        :param query: :class:`~.common.Query` instance
+        :param previous_query: :class:`~.common.Query` instance of an earlier
+            search
+        :param previous_results: Return value of :meth:`search` for
+            `previous_query`
+
+        :return: The same as :meth:`search` or `None` if `previous_results` may
+            not contain every result for `query` (e.g. because the number of
+            results is limited); the default implementation always returns
+            `None`
+        """
+        return None
+
     @abc.abstractmethod
     async def cast(self, id):
         """Return list of cast names"""
 
+    @store.stored
     async def countries(self, id):
         """Return list of country names"""
         countries = await self._countries(id)
@@ -112,6 +133,7 @@ class WebDbApiBase(abc.ABC):
     async def rating_max(self):
         """Maximum :meth:`rating` value"""
 
+    @store.stored
     async def runtimes(self, id):
         """
         Return mapping of runtimes
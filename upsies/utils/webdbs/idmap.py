@@ -0,0 +1,178 @@
+"""
+Persistent mapping of IDs of the same movie or series in different web databases
+
+IDs are learned from any response that contains cross-references (e.g.
+TVmaze reports IMDb IDs) and looked up before making extra requests.
+
+The mapping is stored as CSV with a header row that contains database names
+(e.g. ``imdb,tmdb,tvmaze``) and one row per movie or series. Empty fields mean
+the ID is unknown. The same format is used by :func:`import_csv` and
+:func:`export_csv`.
+"""
+
+import csv
+import io
+
+from ... import errors
+from .. import fs
+
+import logging  # isort:skip
+_log = logging.getLogger(__name__)
+
+
+filepath = None
+"""
+Path to CSV file that stores the mapping or `None` to keep it only in memory
+"""
+
+# Maps (db, id) to {db: id, ...}; all IDs of the same movie or series share the
+# same dictionary
+_ids = None
+
+
+def get(db, id, other_db):
+    """
+    Return ID in `other_db` of the movie or series with `id` in `db` or `None`
+
+    :param str db: :attr:`~.WebDbApiBase.name` of the database `id` is from
+    :param id: Known ID
+    :param str other_db: :attr:`~.WebDbApiBase.name` of the database we want
+        the ID from
+    """
+    if id:
+        return _get_ids().get((db, str(id)), {}).get(other_db)
+
+
+def add(**ids):
+    """
+    Remember that all `ids` belong to the same movie or series
+
+    Keyword arguments are database names and IDs
+    (e.g. ``add(tvmaze='123', imdb='tt456')``). Empty IDs are ignored. Nothing
+    happens unless at least two IDs are given.
+
+    :return: Whether any new ID was learned
+    """
+    return bool(add_many((ids,)))
+
+
+def add_many(ids):
+    """
+    Remember multiple movies or series at once
+
+    This is like calling :func:`add` for each item in `ids`, but the mapping is
+    written only once.
+
+    :param ids: Sequence of :class:`dict` that map database names to IDs
+
+    :return: Number of items in `ids` that contained new IDs
+    """
+    count = sum(_add(item) for item in ids)
+    if count:
+        _write()
+    return count
+
+
+def import_csv(path):
+    """
+    Add IDs from CSV file (see module documentation for the format)
+
+    :raise ContentError: if `path` can't be read or is not valid
+
+    :return: Number of rows that contained new IDs
+    """
+    try:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            count = sum(_add(row) for row in _read_rows(f))
+    except OSError as e:
+        msg = e.strerror if e.strerror else str(e)
+        raise errors.ContentError(f'{path}: {msg}')
+    except (csv.Error, ValueError) as e:
+        raise errors.ContentError(f'{path}: Invalid CSV: {e}')
+    if count:
+        _write()
+    return count
+
+
+def export_csv(path):
+    """
+    Write all known IDs to CSV file (see module documentation for the format)
+
+    :raise ContentError: if `path` can't be written
+    """
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            _write_rows(f)
+    except OSError as e:
+        msg = e.strerror if e.strerror else str(e)
+        raise errors.ContentError(f'{path}: {msg}')
+
+
+def _get_ids():
+    global _ids
+    if _ids is None:
+        _ids = {}
+        if filepath:
+            try:
+                with open(filepath, 'r', newline='', encoding='utf-8') as f:
+                    for row in _read_rows(f):
+                        _add(row)
+            except FileNotFoundError:
+                pass
+            except (OSError, csv.Error, ValueError) as e:
+                _log.debug('Ignoring invalid ID map: %s: %r', filepath, e)
+    return _ids
+
+
+def _add(ids):
+    ids = {db: str(id) for db, id in ids.items() if db and id}
+    if len(ids) < 2:
+        return False
+
+    all_ids = _get_ids()
+    merged = {}
+    for db, id in ids.items():
+        merged.update(all_ids.get((db, id), {}))
+    # New IDs replace old ones, e.g. if a database merged duplicates
+    merged.update(ids)
+
+    is_new = any(all_ids.get((db, id)) != merged for db, id in merged.items())
+    if is_new:
+        for db, id in merged.items():
+            old = all_ids.get((db, id))
+            if old is not None:
+                # Forget IDs that were replaced
+                for old_db, old_id in old.items():
+                    if merged.get(old_db) != old_id:
+                        all_ids.pop((old_db, old_id), None)
+            all_ids[(db, id)] = merged
+    return is_new
+
+
+def _read_rows(f):
+    reader = csv.DictReader(f)
+    if reader.fieldnames is None:
+        return
+    elif len(reader.fieldnames) < 2:
+        raise ValueError(f'Expected at least two columns: {",".join(reader.fieldnames)}')
+    for row in reader:
+        yield {db.strip(): (id or '').strip() for db, id in row.items() if db}
+
+
+def _write_rows(f):
+    entries = {id(ids): ids for ids in _get_ids().values()}.values()
+    dbs = sorted({db for ids in entries for db in ids})
+    writer = csv.DictWriter(f, fieldnames=dbs)
+    writer.writeheader()
+    for ids in sorted(entries, key=lambda ids: [ids.get(db, '') for db in dbs]):
+        writer.writerow(ids)
+
+
+def _write():
+    if filepath:
+        f = io.StringIO(newline='')
+        _write_rows(f)
+        try:
+            fs.write_atomically(filepath, f.getvalue())
+        except errors.ContentError as e:
+            _log.debug('Failed to write %s: %r', filepath, e)
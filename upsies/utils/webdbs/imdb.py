@@ -10,13 +10,20 @@ import unidecode
 
 from ... import utils
 from ..types import ReleaseType
-from . import common
+from . import common, store
 from .base import WebDbApiBase
 
 import logging  # isort:skip
 _log = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _search_results_strainer():
+    # Don't build the tree for anything but the search results, e.g. navigation
+    # and ads (this is also used as a cache key, so it must be a singleton)
+    return utils.html.bs4.SoupStrainer('div', class_='lister-item-content')
+
+
 class ImdbApi(WebDbApiBase):
     """API for imdb.com"""
 
@@ -26,19 +33,23 @@ class ImdbApi(WebDbApiBase):
     default_config = {}
 
     _url_base = 'https://www.imdb.com'
-    _soup_cache = {}
-
-    async def _get_soup(self, path, params={}):
-        cache_id = (path, tuple(sorted(params.items())))
-        if cache_id in self._soup_cache:
-            return self._soup_cache[cache_id]
+    # Parsed pages are big, so only keep a few around; evicted pages are
+    # re-parsed from the HTTP cache
+    _soup_cache = utils.LRUCache(maxsize=32, maxbytes=64 * 1048576)
+
+    async def _get_soup(self, path, params={}, only=None):
+        cache_id = (path, tuple(sorted(params.items())), only)
+        soup = self._soup_cache.get(cache_id)
+        if soup is not None:
+            return soup
         text = await utils.http.get(
             url=f'{self._url_base}/{path}',
             params=params,
             cache=True,
         )
-        self._soup_cache[cache_id] = utils.html.parse(text)
-        return self._soup_cache[cache_id]
+        soup = utils.html.parse(text, only=only)
+        self._soup_cache.set(cache_id, soup, nbytes=utils.html.parsed_size(text))
+        return soup
 
     _title_types = {
         ReleaseType.movie: 'feature,tv_movie,documentary,short,video,tv_short',
@@ -93,7 +104,7 @@ class ImdbApi(WebDbApiBase):
             if query.year is not None:
                 params['release_date'] = f'{query.year}-01-01,{query.year}-12-31'
 
-            soup = await self._get_soup(path, params=params)
+            soup = await self._get_soup(path, params=params, only=_search_results_strainer())
             items = soup.find_all('div', class_='lister-item-content')
             results = [_ImdbSearchResult(soup=item, imdb_api=self)
                        for item in items]
@@ -112,6 +123,7 @@ class ImdbApi(WebDbApiBase):
                 persons.append(common.Person(name, url))
         return tuple(persons)
 
+    @store.stored
     async def cast(self, id):
         cast = []
         if id:
@@ -137,6 +149,7 @@ class ImdbApi(WebDbApiBase):
 
     _creators_label_regex = re.compile('^Creators?:?$')
 
+    @store.stored
     async def creators(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -153,6 +166,7 @@ class ImdbApi(WebDbApiBase):
 
     _directors_label_regex = re.compile('^Directors?:?$')
 
+    @store.stored
     async def directors(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -167,6 +181,7 @@ class ImdbApi(WebDbApiBase):
                     return self._get_persons(tag)
         return ()
 
+    @store.stored
     async def genres(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -181,6 +196,7 @@ class ImdbApi(WebDbApiBase):
             return tuple(genres)
         return ()
 
+    @store.stored
     async def poster_url(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -206,6 +222,7 @@ class ImdbApi(WebDbApiBase):
     rating_min = 0.0
     rating_max = 10.0
 
+    @store.stored
     async def rating(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -249,6 +266,7 @@ class ImdbApi(WebDbApiBase):
 
         return runtimes
 
+    @store.stored
     async def summary(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -276,6 +294,7 @@ class ImdbApi(WebDbApiBase):
 
         return ''
 
+    @store.stored
     async def title_english(self, id, allow_empty=True):
         if id:
             akas = await self._get_akas(id)
@@ -299,6 +318,7 @@ class ImdbApi(WebDbApiBase):
                         #     _log.debug('  Similar to original title %r == %r', original_title, english_title)
         return ''
 
+    @store.stored
     async def title_original(self, id):
         if id:
             akas = await self._get_akas(id)
@@ -386,6 +406,7 @@ class ImdbApi(WebDbApiBase):
 
         return akas
 
+    @store.stored
     async def type(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -428,6 +449,7 @@ class ImdbApi(WebDbApiBase):
             return f'{self._url_base.rstrip("/")}/title/{id}'
         return ''
 
+    @store.stored
     async def year(self, id):
         if id:
             soup = await self._get_soup(f'title/{id}/')
@@ -0,0 +1,202 @@
+"""
+Persistent storage of normalized information from web databases
+"""
+
+import atexit
+import enum
+import functools
+import inspect
+import json
+import os
+import time
+import urllib.parse
+
+from ... import __version__, constants, errors
+from .. import fs
+from ..types import ReleaseType, SceneCheckResult
+from .common import Person
+
+import logging  # isort:skip
+_log = logging.getLogger(__name__)
+
+
+cache_directory = None
+"""
+Where to store information or `None` to disable storage
+"""
+
+ttl = constants.WEBDB_CACHE_TTL
+"""Number of seconds after which stored information expires"""
+
+# Maps (db, id) to {field: (expiration time, value)} (decoded values)
+_records = {}
+
+# (db, id) keys of records that were changed but not written yet
+_unwritten = set()
+
+
+def stored(method):
+    """
+    Decorator for :class:`~.WebDbApiBase` coroutine methods that take an `id`
+    argument
+
+    Return values are stored with :func:`put` under the DB's
+    :attr:`~.WebDbApiBase.name` and `id`. Any other arguments are part of the
+    key. Exceptions are not stored.
+
+    Return values must be made of JSON types, :class:`tuple`, :class:`Person`,
+    :class:`~.types.ReleaseType` and :class:`~.types.SceneCheckResult`.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        id = arguments.arguments['id']
+        if not id or not cache_directory:
+            return await method(self, *args, **kwargs)
+
+        options = ', '.join(
+            f'{name}={value!r}'
+            for name, value in arguments.arguments.items()
+            if name not in ('self', 'id')
+        )
+        field = f'{method.__name__}({options})'
+        value = get(self.name, id, field, default=_MISSING)
+        if value is _MISSING:
+            value = await method(self, *args, **kwargs)
+            put(self.name, id, field, value)
+        return value
+
+    return wrapper
+
+_MISSING = object()
+
+
+def get(db, id, field, default=None):
+    """
+    Return stored value or `default` if it doesn't exist or is expired
+
+    :param str db: :attr:`~.WebDbApiBase.name`
+    :param id: ID in `db`
+    :param str field: Name of the information
+    """
+    expires, value = _get_record(db, id).get(field, (0, default))
+    if expires < time.time():
+        return default
+    return value
+
+
+def put(db, id, field, value):
+    """
+    Store `value`
+
+    `value` is written to :attr:`cache_directory` by :func:`flush`.
+
+    See :func:`get` for the arguments.
+    """
+    record = _get_record(db, id)
+    record[field] = (time.time() + ttl, value)
+    _unwritten.add((db, str(id)))
+
+
+def flush():
+    """Write any records changed by :func:`put` to :attr:`cache_directory`"""
+    while _unwritten:
+        db, id = _unwritten.pop()
+        _write_record(db, id, _records.get((db, id), {}))
+
+# Don't lose information if the UI doesn't call application_shutdown()
+atexit.register(flush)
+
+
+def _get_record(db, id):
+    key = (db, str(id))
+    if key not in _records:
+        _records[key] = _read_record(db, id)
+    return _records[key]
+
+
+def _record_file(db, id):
+    filename = urllib.parse.quote(f'{db}.{id}', safe='') + '.json'
+    return os.path.join(cache_directory, filename)
+
+
+def _read_record(db, id):
+    record = {}
+    if cache_directory:
+        try:
+            with open(_record_file(db, id), 'r') as f:
+                data = json.load(f)
+            # Information may be normalized differently by other versions
+            if data['__version__'] != __version__:
+                _log.debug('Ignoring record from version %s: %s: %s', data['__version__'], db, id)
+            else:
+                for field, entry in data['fields'].items():
+                    record[field] = (float(entry['expires']), _decode(entry['value']))
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            record.clear()
+            if not isinstance(e, FileNotFoundError):
+                _log.debug('Ignoring invalid record: %s: %s: %r', db, id, e)
+    return record
+
+
+def _write_record(db, id, record):
+    if cache_directory:
+        now = time.time()
+        filepath = _record_file(db, id)
+        fields = {}
+        for field, (expires, value) in record.items():
+            if expires >= now:
+                try:
+                    fields[field] = {'expires': expires, 'value': _encode(value)}
+                except (TypeError, ValueError) as e:
+                    _log.debug('Not storing %s: %s: %s: %r', db, id, field, e)
+        try:
+            fs.write_atomically(filepath, json.dumps({'__version__': __version__, 'fields': fields}))
+        except (TypeError, ValueError, errors.ContentError) as e:
+            _log.debug('Failed to write %s: %r', filepath, e)
+
+
+# Enums that may be stored, mapped to their names in stored records
+_enum_types = {
+    cls.__name__: cls
+    for cls in (ReleaseType, SceneCheckResult)
+}
+
+
+def _encode(value):
+    # Turn `value` into something that can be decoded by _decode() after a JSON
+    # round trip
+    if isinstance(value, Person):
+        return {'__person__': str(value), 'url': value.url}
+    elif isinstance(value, enum.Enum):
+        if _enum_types.get(type(value).__name__) is not type(value):
+            raise TypeError(f'Unsupported enum: {type(value).__qualname__}: {value!r}')
+        return {'__enum__': type(value).__name__, 'value': value.value}
+    elif isinstance(value, tuple):
+        return {'__tuple__': [_encode(item) for item in value]}
+    elif isinstance(value, list):
+        return [_encode(item) for item in value]
+    elif isinstance(value, dict):
+        return {'__dict__': [[_encode(k), _encode(v)] for k, v in value.items()]}
+    elif value is None or isinstance(value, (str, int, float)):
+        return value
+    else:
+        raise TypeError(f'Unsupported type: {type(value).__name__}: {value!r}')
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    elif isinstance(value, dict):
+        if '__person__' in value:
+            return Person(value['__person__'], url=value['url'])
+        elif '__enum__' in value:
+            return _enum_types[value['__enum__']](value['value'])
+        elif '__tuple__' in value:
+            return tuple(_decode(item) for item in value['__tuple__'])
+        elif '__dict__' in value:
+            return {_decode(k): _decode(v) for k, v in value['__dict__']}
+    return value
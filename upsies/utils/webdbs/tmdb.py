@@ -5,9 +5,9 @@ API for themoviedb.org
 import functools
 import re
 
-from .. import html, http
+from .. import LRUCache, html, http
 from ..types import ReleaseType
-from . import common
+from . import common, store
 from .base import WebDbApiBase
 
 import logging  # isort:skip
@@ -23,20 +23,24 @@ class TmdbApi(WebDbApiBase):
     default_config = {}
 
     _url_base = 'http://themoviedb.org'
-    _soup_cache = {}
+    # Parsed pages are big, so only keep a few around; evicted pages are
+    # re-parsed from the HTTP cache
+    _soup_cache = LRUCache(maxsize=32, maxbytes=64 * 1048576)
 
     async def _get_soup(self, path, params={}):
         cache_id = (path, tuple(sorted(params.items())))
-        if cache_id in self._soup_cache:
-            return self._soup_cache[cache_id]
+        soup = self._soup_cache.get(cache_id)
+        if soup is not None:
+            return soup
         text = await http.get(
             url=f'{self._url_base}/{path.lstrip("/")}',
             params=params,
             cache=True,
             user_agent='Mozilla/5.0 (compatible; MSIE 8.0; Windows NT 6.3; Win64; x64)',
         )
-        self._soup_cache[cache_id] = html.parse(text)
-        return self._soup_cache[cache_id]
+        soup = html.parse(text)
+        self._soup_cache.set(cache_id, soup, nbytes=html.parsed_size(text))
+        return soup
 
     async def search(self, query):
         _log.debug('Searching TMDb for %s', query)
@@ -107,6 +111,7 @@ class TmdbApi(WebDbApiBase):
                 persons.append(common.Person(name, url))
         return tuple(persons)
 
+    @store.stored
     async def cast(self, id):
         cast = []
         if id:
@@ -119,6 +124,7 @@ class TmdbApi(WebDbApiBase):
     async def _countries(self, id):
         raise NotImplementedError('Country lookup is not implemented for TMDb')
 
+    @store.stored
     async def creators(self, id):
         creators = []
         if id:
@@ -129,6 +135,7 @@ class TmdbApi(WebDbApiBase):
                     creators.extend(self._get_persons(profile))
         return tuple(creators)
 
+    @store.stored
     async def directors(self, id):
         directors = []
         if id:
@@ -139,6 +146,7 @@ class TmdbApi(WebDbApiBase):
                     directors.extend(self._get_persons(profile))
         return tuple(directors)
 
+    @store.stored
     async def genres(self, id):
         genres = ()
         if id:
@@ -149,6 +157,7 @@ class TmdbApi(WebDbApiBase):
                           if k != ',')
         return tuple(genres)
 
+    @store.stored
     async def poster_url(self, id):
         if id:
             soup = await self._get_soup(id)
@@ -163,6 +172,7 @@ class TmdbApi(WebDbApiBase):
     rating_min = 0.0
     rating_max = 100.0
 
+    @store.stored
     async def rating(self, id):
         if id:
             soup = await self._get_soup(id)
@@ -197,6 +207,7 @@ class TmdbApi(WebDbApiBase):
         'No overview found.',
     )
 
+    @store.stored
     async def summary(self, id):
         if id:
             soup = await self._get_soup(id)
@@ -206,6 +217,7 @@ class TmdbApi(WebDbApiBase):
             return overview
         return ''
 
+    @store.stored
     async def title_english(self, id):
         if id:
             soup = await self._get_soup(id)
@@ -216,6 +228,7 @@ class TmdbApi(WebDbApiBase):
                     return title_parts[0]
         return ''
 
+    @store.stored
     async def title_original(self, id):
         if id:
             soup = await self._get_soup(id)
@@ -231,6 +244,7 @@ class TmdbApi(WebDbApiBase):
                         return strings[1]
         return await self.title_english(id)
 
+    @store.stored
     async def type(self, id):
         if id:
             soup = await self._get_soup(id)
@@ -247,6 +261,7 @@ class TmdbApi(WebDbApiBase):
             return f'{self._url_base.rstrip("/")}/{id.strip("/")}'
         return ''
 
+    @store.stored
     async def year(self, id):
         if id:
             soup = await self._get_soup(id)
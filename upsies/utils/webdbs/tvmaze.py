@@ -9,7 +9,7 @@ import json
 from ... import errors, utils
 from .. import html, http
 from ..types import ReleaseType
-from . import common
+from . import common, idmap, store
 from .base import WebDbApiBase
 from .imdb import ImdbApi
 
@@ -57,6 +57,7 @@ class TvmazeApi(WebDbApiBase):
             except (ValueError, TypeError, AssertionError):
                 raise errors.RequestError(f'Unexpected search response: {results_str}')
             else:
+                _remember_ids(*(item['show'] for item in items))
                 results = [_TvmazeSearchResult(show=item['show'], tvmaze_api=self)
                            for item in items]
                 # The API doesn't allow us to search for a specific year
@@ -68,6 +69,25 @@ class TvmazeApi(WebDbApiBase):
                     return results_in_year
                 return results
 
+    def refine_search_results(self, query, previous_query, previous_results):
+        """
+        Filter `previous_results` by year if `query` only adds a year to
+        `previous_query`
+
+        This works because the year is filtered locally anyway.
+        """
+        if (
+            query.year
+            and not query.id
+            and not previous_query.id
+            and not previous_query.year
+            and query.title_normalized == previous_query.title_normalized
+            and query.type is previous_query.type
+        ):
+            return [result for result in previous_results
+                    if str(result.year) == query.year]
+        return None
+
     async def _get_json(self, url):
         response = await http.get(url, cache=True)
         try:
@@ -80,8 +100,11 @@ class TvmazeApi(WebDbApiBase):
 
     async def _get_show(self, id):
         url = f'{self._url_base}/shows/{id}?embed[]=cast&embed[]=crew'
-        return await self._get_json(url)
+        show = await self._get_json(url)
+        _remember_ids(show)
+        return show
 
+    @store.stored
     async def cast(self, id):
         if id:
             show = await self._get_show(id)
@@ -98,6 +121,7 @@ class TvmazeApi(WebDbApiBase):
             return _get_countries(show)
         return ()
 
+    @store.stored
     async def creators(self, id):
         if id:
             show = await self._get_show(id)
@@ -115,12 +139,14 @@ class TvmazeApi(WebDbApiBase):
     async def directors(self, id):
         return ()
 
+    @store.stored
     async def genres(self, id):
         if id:
             show = await self._get_show(id)
             return _get_genres(show)
         return ()
 
+    @store.stored
     async def poster_url(self, id, season=None):
         """
         Return URL of poster image or `None`
@@ -144,6 +170,7 @@ class TvmazeApi(WebDbApiBase):
     rating_min = 0.0
     rating_max = 10.0
 
+    @store.stored
     async def rating(self, id):
         if id:
             show = await self._get_show(id)
@@ -159,12 +186,14 @@ class TvmazeApi(WebDbApiBase):
                 runtimes['default'] = round(int(runtime))
         return runtimes
 
+    @store.stored
     async def summary(self, id):
         if id:
             show = await self._get_show(id)
             return _get_summary(show)
         return ''
 
+    @store.stored
     async def title_english(self, id):
         if id:
             imdb_id = await self.imdb_id(id)
@@ -172,6 +201,7 @@ class TvmazeApi(WebDbApiBase):
                 return await self._imdb.title_english(imdb_id)
         return ''
 
+    @store.stored
     async def title_original(self, id):
         if id:
             imdb_id = await self.imdb_id(id)
@@ -179,6 +209,7 @@ class TvmazeApi(WebDbApiBase):
                 return await self._imdb.title_original(imdb_id)
         return ''
 
+    @store.stored
     async def type(self, id):
         # TVmaze does not support movies and we can't distinguish between season
         # and episode by ID.
@@ -190,21 +221,27 @@ class TvmazeApi(WebDbApiBase):
             return show.get('url', '')
         return ''
 
+    @store.stored
     async def year(self, id):
         if id:
             show = await self._get_show(id)
             return _get_year(show)
         return ''
 
+    @store.stored
     async def imdb_id(self, id):
         """Return IMDb ID for TVmaze ID `id` or `None`"""
         if id:
+            imdb_id = idmap.get(self.name, id, ImdbApi.name)
+            if imdb_id:
+                return imdb_id
             show = await self._get_show(id)
             imdb_id = show.get('externals', {}).get('imdb')
             if imdb_id:
                 return imdb_id
         return ''
 
+    @store.stored
     async def episode(self, id, season, episode):
         """
         Get episode information
@@ -236,6 +273,7 @@ class TvmazeApi(WebDbApiBase):
             'url': episode.get('url', ''),
         }
 
+    @store.stored
     async def status(self, id):
         """Return something like "Running", "Ended" or empty string"""
         if id:
@@ -262,6 +300,16 @@ class _TvmazeSearchResult(common.SearchResult):
         )
 
 
+def _remember_ids(*shows):
+    idmap.add_many(
+        {
+            'tvmaze': show.get('id'),
+            'imdb': (show.get('externals') or {}).get('imdb'),
+        }
+        for show in shows
+        if isinstance(show, dict)
+    )
+
 def _get_summary(show):
     summary = show.get('summary', None)
     if summary: